@@ -0,0 +1,102 @@
+"""
+Benchmark aggregate_sentiment_by_ticker_and_date on classified headlines.
+
+Compares the int64 (ticker, day) key implementation against the previous
+named-aggregation groupby that built the temporal labels as Python strings
+for every row and re-sorted the result. Both must agree before timing.
+
+Usage:
+    python -m scripts.bench_aggregate_sentiment [--rows 10000000] [--tickers 3000] [--days 2520] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.sentiment_classification import aggregate_sentiment_by_ticker_and_date
+
+
+def legacy_aggregate(df: pd.DataFrame, date_col: str = 'clean_date',
+                     ticker_col: str = 'Ticker') -> pd.DataFrame:
+    """Previous implementation, kept here as the benchmark baseline"""
+    agg_df = df.groupby([ticker_col, date_col]).agg(
+        vader_mean=('vader_compound', 'mean'),
+        vader_median=('vader_compound', 'median'),
+        textblob_mean=('textblob_polarity', 'mean'),
+        total_articles=('vader_compound', 'count'),
+        positive_articles=('is_positive', 'sum'),
+        negative_articles=('is_negative', 'sum'),
+        neutral_articles=('is_neutral', 'sum')
+    ).reset_index()
+
+    agg_df['positive_pct'] = agg_df['positive_articles'] / agg_df['total_articles'] * 100
+    agg_df['negative_pct'] = agg_df['negative_articles'] / agg_df['total_articles'] * 100
+    agg_df['neutral_pct'] = agg_df['neutral_articles'] / agg_df['total_articles'] * 100
+
+    agg_df['day_of_week'] = agg_df[date_col].dt.day_name()
+    agg_df['week_number'] = agg_df[date_col].dt.isocalendar().week
+    agg_df['month'] = agg_df[date_col].dt.month_name()
+    return agg_df.sort_values([ticker_col, date_col])
+
+
+def make_headlines(rows: int, tickers: int, days: int) -> pd.DataFrame:
+    """Classified headlines as produced by classify_sentiment (scores rounded like VADER)"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days)
+    compound = np.round(rng.uniform(-1, 1, rows), 4)
+    sentiment = np.select([compound > 0.05, compound < -0.05], ['positive', 'negative'], 'neutral')
+    return pd.DataFrame({
+        'Ticker': np.array([f"T{i:04d}" for i in range(tickers)], dtype=object)[rng.integers(0, tickers, rows)],
+        'clean_date': dates[rng.integers(0, days, rows)],
+        'vader_compound': compound,
+        'vader_sentiment': sentiment,
+        'textblob_polarity': np.round(rng.uniform(-1, 1, rows), 3),
+        'is_positive': (sentiment == 'positive').astype(int),
+        'is_negative': (sentiment == 'negative').astype(int),
+        'is_neutral': (sentiment == 'neutral').astype(int),
+    })
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--tickers', type=int, default=3000)
+    parser.add_argument('--days', type=int, default=2520)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    headlines = make_headlines(args.rows, args.tickers, args.days)
+
+    expected = legacy_aggregate(headlines).reset_index(drop=True)
+    actual = aggregate_sentiment_by_ticker_and_date(headlines)
+    # The new labels are categoricals; compare them as strings
+    for col in ('day_of_week', 'month'):
+        actual[col] = actual[col].astype(object)
+    pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-12)
+    groups = len(expected)
+    del expected, actual
+
+    print(f"{args.rows} headlines, {groups} ticker-days, best of {args.repeat} runs")
+    results = {}
+    for name, func in (('legacy groupby + string labels', lambda: legacy_aggregate(headlines)),
+                       ('int64 keys + categorical labels',
+                        lambda: aggregate_sentiment_by_ticker_and_date(headlines))):
+        results[name] = best_of(func, args.repeat)
+        print(f"  {name:<32} {results[name]:8.2f} s")
+
+    baseline, optimized = results.values()
+    print(f"  speed-up: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
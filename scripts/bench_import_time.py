@@ -0,0 +1,63 @@
+"""
+Cold-start import benchmark for the src package.
+
+Each scenario runs in a fresh interpreter, so nothing is cached in
+sys.modules between runs. The loader-only case is what a batch job that
+just needs DataLoader pays, against plain ``import pandas`` as the floor and
+everything the eager ``import src`` used to load as the baseline. The
+heavy third-party modules each scenario ends up loading are listed too.
+
+Usage:
+    python -m scripts.bench_import_time [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ('talib', 'nltk', 'textblob', 'matplotlib', 'seaborn', 'scipy')
+
+SCENARIOS = {
+    'import pandas (floor)': "import pandas",
+    'from src import DataLoader': "from src import DataLoader",
+    'from src import SentimentAggregator': "from src import SentimentAggregator",
+    'every public name': "import src\nfor name in src.__all__: getattr(src, name)",
+    # What ``import src`` loaded before: every module plus the NLTK, TextBlob
+    # and plotting imports that are now deferred to first use
+    'previous eager import src': ("import src\nfor name in src.__all__: getattr(src, name)\n"
+                                  "import nltk.sentiment, textblob, matplotlib.pyplot, seaborn"),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed,
+                  'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code: str) -> dict:
+    """Time ``code`` in a new interpreter and report the heavy modules it loaded"""
+    probe = PROBE.format(code=code, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', probe], capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Cold import time, best of {args.repeat} fresh interpreters")
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        best = min(run['seconds'] for run in runs)
+        loaded = ', '.join(runs[0]['loaded']) or 'none'
+        print(f"  {name:<36} {best * 1e3:8.1f} ms   heavy modules: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark planned indicator execution against calculate_all_indicators.
+
+For several history lengths the calculate_all_indicators column set is
+computed once through the eager TA-Lib path and once through
+calculate_selected_indicators, which runs the registry plan (DX, ADX and
+ADXR derived from the DIs once the history is long enough for that to pay
+off, direct TA-Lib calls otherwise). Columns are checked against each other before timing;
+the planned path must not be slower. The array-level cost of the plan is
+also shown next to one direct TA-Lib call per indicator.
+
+Usage:
+    python -m scripts.bench_indicator_plan [--lengths 252 2520 7560 20000] [--repeat 20]
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.features.indicator_registry import IndicatorPlan, execute_plan
+from src.features.ta_analysis import TechnicalAnalyzer
+
+
+def make_bars(length: int) -> pd.DataFrame:
+    """Daily OHLCV bars ending today"""
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=length)
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    spread = close * rng.uniform(0.002, 0.02, length)
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.3, length) * spread,
+        'High': close + spread, 'Low': close - spread, 'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, length).astype(float),
+    }, index=dates)
+
+
+def best_of(funcs, repeat: int) -> list:
+    """Best time of each function, run interleaved so drift hits them alike"""
+    timings = [[] for _ in funcs]
+    for _ in range(repeat):
+        for func, times in zip(funcs, timings):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return [min(times) for times in timings]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[252, 2520, 7560, 20000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    analyzer = TechnicalAnalyzer()
+    plan = analyzer._full_plan()
+    requests = plan.columns()
+    # Same indicators with every one a direct TA-Lib call
+    direct = IndicatorPlan(plan.requested, [(node, 'compute') for node in plan.requested])
+    print(f"{len(requests)} indicator columns, {plan.talib_calls} TA-Lib calls on long histories, "
+          f"best of {args.repeat} runs")
+
+    slower = []
+    for length in args.lengths:
+        bars = make_bars(length)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = analyzer.calculate_all_indicators(bars.copy())
+            actual = analyzer.calculate_selected_indicators(bars.copy(), requests)
+        pd.testing.assert_frame_equal(expected, actual[expected.columns],
+                                      check_exact=False, rtol=1e-9, atol=1e-9)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            eager, planned = best_of(
+                [lambda: analyzer.calculate_all_indicators(bars.copy()),
+                 lambda: analyzer.calculate_selected_indicators(bars.copy(), requests)],
+                args.repeat)
+        print(f"  {length:>6} bars   calculate_all_indicators {eager * 1e3:7.2f} ms   "
+              f"planned {planned * 1e3:7.2f} ms   ({eager / planned:.2f}x)")
+        if planned > eager:
+            slower.append(length)
+
+        inputs = analyzer._input_arrays(bars)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            talib_only, plan_only = best_of([lambda: execute_plan(direct, inputs),
+                                             lambda: execute_plan(plan, inputs)], args.repeat)
+        print(f"  {'':>6}        arrays only: direct TA-Lib {talib_only * 1e3:7.2f} ms   "
+              f"planned {plan_only * 1e3:7.2f} ms")
+
+    if slower:
+        raise SystemExit(f"planned path slower than calculate_all_indicators at {slower} bars")
+
+
+if __name__ == "__main__":
+    main()
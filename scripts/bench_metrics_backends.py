@@ -0,0 +1,81 @@
+"""
+Benchmark FinancialMetrics backends on identical inputs.
+
+Every installed backend (pynance, numpy, numba) scores the same synthetic
+returns, first through the per-ticker calculate_risk_metrics path used by
+analyze_multiple_stocks and then through calculate_risk_metrics_matrix.
+Results are checked against the NumPy backend before timings are printed.
+
+Usage:
+    python -m scripts.bench_metrics_backends [--tickers 500] [--days 2520] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.financial_metrics import FinancialMetrics
+from src.features.metrics_backends import available_backends
+
+
+def make_returns(tickers: int, days: int) -> pd.DataFrame:
+    """Daily returns with a few missing days, one column per ticker"""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0004, 0.02, size=(days, tickers))
+    returns[rng.random(returns.shape) < 0.01] = np.nan
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days)
+    return pd.DataFrame(returns, index=dates, columns=[f"T{i:04d}" for i in range(tickers)])
+
+
+def per_ticker(metrics: FinancialMetrics, returns: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    """calculate_risk_metrics called once per ticker"""
+    rows = {}
+    for ticker in returns.columns:
+        frame = pd.DataFrame({'Daily_Return': returns[ticker], 'Close': prices[ticker]})
+        rows[ticker] = metrics.calculate_risk_metrics(frame)
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--days', type=int, default=2520)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    returns = make_returns(args.tickers, args.days)
+    prices = 100 * (1 + returns.fillna(0)).cumprod()
+
+    backends = available_backends()
+    reference = FinancialMetrics(backend='numpy').calculate_risk_metrics_matrix(returns, prices)
+    print(f"{args.tickers} tickers x {args.days} days, best of {args.repeat} runs")
+    print(f"  backends available: {', '.join(backends)}")
+
+    for name in backends:
+        metrics = FinancialMetrics(backend=name)
+        # First call outside the timings so one-off compilation is excluded
+        matrix = metrics.calculate_risk_metrics_matrix(returns, prices)
+        looped = per_ticker(metrics, returns, prices)
+
+        for label, result in (('matrix', matrix), ('per-ticker', looped)):
+            diff = (result[reference.columns] - reference).abs().max().max()
+            if not diff < 1e-8:
+                print(f"  warning: {name} {label} differs from numpy by {diff:.3g}")
+
+        loop_time = best_of(lambda: per_ticker(metrics, returns, prices), args.repeat)
+        matrix_time = best_of(lambda: metrics.calculate_risk_metrics_matrix(returns, prices), args.repeat)
+        print(f"  {name:<8} per-ticker {loop_time * 1e3:9.1f} ms   matrix {matrix_time * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark dashboard rendering: interactive pyplot figures vs batch mode.
+
+Renders the four-panel technical dashboard for synthetic daily bars, once
+through the regular pyplot path (full-resolution lines, one Rectangle per
+bar, tight_layout) and repeatedly through TechnicalVisualizer(batch=True),
+which writes PNGs straight from the Agg canvas. Peak RSS is reported after
+the batch loop to show that figures are released.
+
+Usage:
+    python -m scripts.bench_render_dashboards [--years 30] [--dashboards 20] [--out /tmp/dashboards]
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.ta_analysis import TechnicalAnalyzer
+from src.features.visualization import TechnicalVisualizer
+
+GROUPS = ['trend', 'momentum', 'volume', 'volatility']
+
+
+def make_bars(years: int) -> pd.DataFrame:
+    """Daily OHLCV bars ending today"""
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=years * 252)
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, len(dates)).astype(float),
+    }, index=dates)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--dashboards', type=int, default=20)
+    parser.add_argument('--out', default=None, help="Output directory (default: a temporary one)")
+    args = parser.parse_args()
+
+    out = args.out or tempfile.mkdtemp(prefix='dashboards_')
+    df = TechnicalAnalyzer().calculate_all_indicators(make_bars(args.years))
+    print(f"{len(df)} bars x {df.shape[1]} columns per dashboard, writing to {out}")
+
+    interactive = TechnicalVisualizer()
+    start = time.perf_counter()
+    interactive.save_indicators(df, 'SYN', os.path.join(out, 'interactive.png'), GROUPS)
+    interactive_time = time.perf_counter() - start
+    print(f"  interactive (pyplot)    {interactive_time:8.2f} s per dashboard")
+
+    batch = TechnicalVisualizer(batch=True)
+    # Font and glyph caches fill up over the first few figures
+    for _ in range(3):
+        batch.save_indicators(df, 'SYN', os.path.join(out, 'warmup.png'), GROUPS)
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    for i in range(args.dashboards):
+        batch.save_indicators(df, f'SYN{i}', os.path.join(out, f'SYN{i}.png'), GROUPS)
+    batch_time = (time.perf_counter() - start) / args.dashboards
+    print(f"  batch (Agg, downsampled) {batch_time:7.2f} s per dashboard")
+    print(f"  speed-up: {interactive_time / batch_time:.1f}x; "
+          f"peak RSS grew {peak_rss_mb() - rss_before:.1f} MB over {args.dashboards} dashboards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark and pandas parity check for calculate_rolling_correlation.
+
+Builds a shuffled multi-ticker panel with missing sentiment and stretches of
+constant sentiment and returns (e.g. no-news days scored 0.0), then compares
+the running-sum implementation against ``x.rolling(window).corr(y)`` applied
+per ticker. Constant windows must come out NaN exactly as pandas reports
+them, not as rounding noise.
+
+Usage:
+    python -m scripts.bench_rolling_correlation [--tickers 400] [--rows 5000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.calculate_correlations import calculate_rolling_correlation
+
+
+def make_panel(tickers: int, rows: int, flat_len: int = 80) -> pd.DataFrame:
+    """Shuffled panel with NaNs and constant stretches in both columns"""
+    rng = np.random.default_rng(0)
+    x = rng.normal(100.0, 50.0, (tickers, rows))
+    y = rng.normal(0.0, 0.02, (tickers, rows))
+    for t in range(tickers):
+        for start in rng.integers(0, rows - flat_len, 3):
+            x[t, start:start + flat_len] = 0.0
+        start = rng.integers(0, rows - flat_len)
+        y[t, start:start + flat_len] = 0.01
+    x[rng.random(x.shape) < 0.05] = np.nan
+    panel = pd.DataFrame({
+        'Ticker': np.repeat([f'T{i:04d}' for i in range(tickers)], rows),
+        'vader_mean': x.ravel(),
+        'Daily_Return': y.ravel(),
+    })
+    return panel.sample(frac=1.0, random_state=1)
+
+
+def pandas_rolling(panel: pd.DataFrame, window: int, min_periods: int) -> pd.Series:
+    """Per-ticker pandas rolling correlation, aligned with the panel's index"""
+    parts = [
+        group['vader_mean'].rolling(window, min_periods=min_periods).corr(group['Daily_Return'])
+        for _, group in panel.groupby('Ticker')
+    ]
+    return pd.concat(parts).reindex(panel.index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=400)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--min-periods', type=int, default=20)
+    args = parser.parse_args()
+
+    panel = make_panel(args.tickers, args.rows)
+    windows = (60, 252)
+
+    start = time.perf_counter()
+    actual = calculate_rolling_correlation(panel, window=windows, min_periods=args.min_periods)
+    fast = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = {w: pandas_rolling(panel, w, args.min_periods) for w in windows}
+    slow = time.perf_counter() - start
+
+    print(f"{len(panel)} rows, {args.tickers} tickers, windows {windows}")
+    for w in windows:
+        got = actual[f'Rolling_Corr_{w}']
+        want = expected[w]
+        mismatched = int((got.isna() != want.isna()).sum())
+        error = float(np.nanmax(np.abs(got - want)))
+        print(f"  window {w:<4} NaN mismatches {mismatched}, max abs error {error:.2e}")
+        if mismatched or error > 1e-8:
+            raise SystemExit(f"Rolling_Corr_{w} disagrees with pandas")
+
+    print(f"  pandas per ticker              {slow * 1e3:8.1f} ms")
+    print(f"  calculate_rolling_correlation {fast * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
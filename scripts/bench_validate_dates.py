@@ -0,0 +1,122 @@
+"""
+Micro-benchmark for DataLoader._validate_frame on 30 years of daily bars.
+
+Compares the single-pass NumPy validation used by the load path against the
+previous chain of _validate_dates (which round-tripped clean_date through
+Python ``date`` objects), _validate_volume, _handle_missing_values and
+_clean_data. The bars include an invalid and a future date so the row
+filtering is exercised.
+
+Usage:
+    python -m scripts.bench_validate_dates [--years 30] [--repeat 20]
+"""
+import argparse
+import timeit
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.utils.yfinance_data_utils import DataLoader
+
+
+def legacy_validate(loader: DataLoader, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Previous validation chain, kept here as the benchmark baseline"""
+    loader._validate_columns(df, ticker)
+    df = loader._convert_dtypes(df)
+
+    # _validate_dates
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df['clean_date'] = df['Date']
+    invalid_dates = df['clean_date'].isna()
+    if invalid_dates.any():
+        warnings.warn(f"Removed {invalid_dates.sum()} rows with invalid dates.")
+        df = df[~invalid_dates]
+    df['clean_date'] = df['clean_date'].dt.date
+    current_date = datetime.now().date()
+    future_dates = df['clean_date'] > current_date
+    if future_dates.any():
+        warnings.warn(f"Removed {future_dates.sum()} rows with future dates.")
+        df = df[~future_dates]
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['clean_date'] = pd.to_datetime(df['clean_date'])
+
+    # _validate_volume
+    if (df['Volume'] < 0).any():
+        raise ValueError(f"Negative volume found for {ticker}")
+    if (df['Volume'] == 0).any():
+        warnings.warn(f"Zero volume entries found for {ticker}")
+
+    # _handle_missing_values
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df[col] = df[col].ffill()
+    df['Volume'] = df['Volume'].fillna(0)
+
+    # _clean_data
+    df = df.drop_duplicates()
+    df = df.sort_values('Date')
+    df = df.set_index('Date')
+    inconsistent = (
+        (df['High'] < df['Low']) |
+        (df['High'] < df['Open']) |
+        (df['High'] < df['Close']) |
+        (df['Low'] > df['Open']) |
+        (df['Low'] > df['Close'])
+    ).sum()
+    if inconsistent > 0:
+        warnings.warn(f"{inconsistent} inconsistent price bars found for {ticker}")
+    return df
+
+
+def make_bars(years: int) -> pd.DataFrame:
+    """Daily business-day bars ending today, as read from CSV (string dates)"""
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=years * 252)
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    date_strings = list(dates.strftime('%Y-%m-%d'))
+    date_strings += ['not a date', (pd.Timestamp.now() + pd.Timedelta(days=7)).strftime('%Y-%m-%d')]
+    close = np.r_[close, close[-2:]]
+    return pd.DataFrame({
+        'Date': date_strings,
+        'Open': close, 'High': close, 'Low': close, 'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, len(close)),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    bars = make_bars(args.years)
+    loader = DataLoader()
+
+    # Both versions must agree before timing them
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = legacy_validate(loader, bars.copy(), 'SYN')
+    actual, report = loader._validate_frame(bars.copy(), 'SYN')
+    pd.testing.assert_frame_equal(expected, actual)
+    assert report.invalid_dates == 1 and report.future_dates == 1, report
+
+    timings = {
+        'legacy validation chain': lambda: legacy_validate(loader, bars.copy(), 'SYN'),
+        '_validate_frame': lambda: loader._validate_frame(bars.copy(), 'SYN'),
+    }
+
+    print(f"{len(bars)} daily bars, best of {args.repeat} runs")
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, func in timings.items():
+            results[name] = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"  {name:<30} {results[name] * 1e3:8.2f} ms")
+
+    baseline, optimized = results.values()
+    print(f"  speed-up: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
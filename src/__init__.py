@@ -1,22 +1,65 @@
-from .utils.finantial_news_data_loader import (
-load_csv_finantial_news_data,clean_news_dates, filter_news_by_ticker
-)
-from .utils.yfinance_data_utils import(
-    DataLoader
-)
+"""
+Public API of the stock news / price analysis package.
 
+Names are imported on first access (PEP 562 module ``__getattr__``), so
+``from src import DataLoader`` does not pull in TA-Lib, NLTK, TextBlob,
+matplotlib or seaborn; each module is loaded when one of its names is used.
+"""
+from importlib import import_module as _import_module
 
-from .features.ta_analysis import TechnicalAnalyzer
-from .features.visualization import TechnicalVisualizer
-from .features.financial_metrics import FinancialMetrics
-from .analysis_pipeline import  TechnicalAnalysisPipeline
+# Public name -> module (relative to this package) that defines it
+_LAZY_ATTRS = {
+    'load_csv_finantial_news_data': '.utils.finantial_news_data_loader',
+    'clean_news_dates': '.utils.finantial_news_data_loader',
+    'filter_news_by_ticker': '.utils.finantial_news_data_loader',
+    'stream_csv_finantial_news_data': '.utils.finantial_news_data_loader',
+    'stream_clean_news_dates': '.utils.finantial_news_data_loader',
+    'stream_filter_news_by_ticker': '.utils.finantial_news_data_loader',
+    'concat_news_chunks': '.utils.finantial_news_data_loader',
+    'DataLoader': '.utils.yfinance_data_utils',
 
-from .features.sentiment_classification import classify_sentiment
-from .features.sentiment_classification import aggregate_sentiment_by_ticker_and_date
-from .features.calculate_correlations import calculate_lagged_correlation
-from .features.calculate_correlations import calculate_correlation
+    'TechnicalAnalyzer': '.features.ta_analysis',
+    'TechnicalVisualizer': '.features.visualization',
+    'FinancialMetrics': '.features.financial_metrics',
+    'TechnicalAnalysisPipeline': '.analysis_pipeline',
+
+    'classify_sentiment': '.features.sentiment_classification',
+    'aggregate_sentiment_by_ticker_and_date': '.features.sentiment_classification',
+    'SentimentCache': '.features.sentiment_cache',
+    'SentimentAggregator': '.features.sentiment_aggregator',
+    'calculate_lagged_correlation': '.features.calculate_correlations',
+    'calculate_correlation': '.features.calculate_correlations',
+    'calculate_correlation_matrix': '.features.calculate_correlations',
+    'calculate_correlation_by_ticker': '.features.calculate_correlations',
+    'calculate_rolling_correlation': '.features.calculate_correlations',
+    'calculate_correlation_significance': '.features.calculate_correlations',
+    'align_news_to_sessions': '.features.news_alignment',
+    'build_price_panel': '.features.news_alignment',
+    'merge_sentiment_with_returns': '.features.news_alignment',
+    'build_sentiment_return_panel': '.features.news_alignment',
+}
 
 __all__ = ['load_csv_finantial_news_data','DataLoader', 'TechnicalAnalyzer','FinancialMetrics',
            'TechnicalVisualizer', 'TechnicalAnalysisPipeline','classify_sentiment',
            'clean_news_dates','filter_news_by_ticker','aggregate_sentiment_by_ticker_and_date',
-           'calculate_correlation', 'calculate_lagged_correlation']
\ No newline at end of file
+           'calculate_correlation', 'calculate_lagged_correlation', 'calculate_correlation_matrix',
+           'calculate_correlation_by_ticker', 'calculate_rolling_correlation',
+           'calculate_correlation_significance',
+           'align_news_to_sessions', 'build_price_panel', 'merge_sentiment_with_returns',
+           'build_sentiment_return_panel',
+           'stream_csv_finantial_news_data','stream_clean_news_dates',
+           'stream_filter_news_by_ticker','concat_news_chunks','SentimentCache','SentimentAggregator']
+
+
+def __getattr__(name: str):
+    """Import the module defining ``name`` and cache the attribute on the package"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
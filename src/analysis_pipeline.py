@@ -1,10 +1,124 @@
-from typing import Dict, List, Optional
+import os
+import re
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import pandas as pd
 from src import TechnicalAnalyzer
 from src import FinancialMetrics
 from src import TechnicalVisualizer
 
 
+@dataclass
+class AnalysisError:
+    """Why one ticker failed in analyze_multiple_stocks"""
+    ticker: str
+    error_type: str
+    message: str
+    traceback: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+class AnalysisBatchResult(dict):
+    """
+    {ticker: analysis} mapping returned by analyze_multiple_stocks (and
+    {ticker: file paths} from export_dashboards)
+
+    Failed tickers map to None, as before. Their details are recorded in
+    ``errors`` as {ticker: AnalysisError}. ``timings`` holds the wall-clock
+    seconds spent on every ticker, measured where it ran.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors: Dict[str, AnalysisError] = {}
+        self.timings: Dict[str, float] = {}
+
+
+# Pipeline owned by each pool worker, created once by _init_pipeline_worker
+_worker_pipeline: Optional['TechnicalAnalysisPipeline'] = None
+
+
+def _init_pipeline_worker() -> None:
+    """Process pool initializer: build the worker's pipeline once"""
+    global _worker_pipeline
+    _worker_pipeline = TechnicalAnalysisPipeline()
+
+
+def _analyze_in_worker(task: Tuple[str, pd.DataFrame]) -> Tuple[str, Optional[Dict],
+                                                                 Optional[AnalysisError], float]:
+    """Compute one ticker's indicators and metrics with the worker's pipeline"""
+    ticker, df = task
+    return _worker_pipeline._analyze_isolated(df, ticker, [], render=False)
+
+
+StockData = Union[Mapping[str, pd.DataFrame], Iterable[Tuple[str, pd.DataFrame]]]
+ExportOutcome = Tuple[str, Optional[List[str]], Optional[AnalysisError], float]
+
+
+def _export_in_worker(task: Tuple[str, str, pd.DataFrame, str, List[str], Tuple[str, ...], int]) -> ExportOutcome:
+    """Compute one ticker's indicators and write its dashboard with the worker's pipeline"""
+    ticker, stem, df, output_dir, indicator_groups, formats, dpi = task
+    return _worker_pipeline._export_isolated(df, ticker, stem, output_dir, indicator_groups,
+                                             formats, dpi)
+
+
+def _bounded_map(executor: ProcessPoolExecutor, func: Callable, tasks: Iterable,
+                 max_in_flight: int) -> Iterator:
+    """
+    executor.map with at most ``max_in_flight`` tasks submitted at once.
+
+    Results are yielded in completion order. Tasks are pulled from the
+    iterable only when a slot frees up, so a lazy source of DataFrames is
+    never read ahead of the workers.
+    """
+    pending = set()
+    for task in tasks:
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(executor.submit(func, task))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def _file_stem(ticker: str) -> str:
+    """Ticker as a safe file name (e.g. BRK/B -> BRK_B)"""
+    return re.sub(r'[^\w.-]', '_', str(ticker))
+
+
+def _unique_stems(items: Iterable[Tuple[str, pd.DataFrame]]) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+    """
+    (ticker, file stem, DataFrame) triples with stems unique within the batch.
+
+    A ticker whose stem is already taken (BRK/B after BRK_B) gets its
+    position in the batch appended, e.g. BRK_B_7, so parallel workers never
+    write the same file. Stems are compared case-insensitively for
+    case-insensitive file systems. Results are keyed by ticker, so a repeated
+    ticker raises ValueError before it is dispatched.
+    """
+    seen = set()
+    used = set()
+    for index, (ticker, df) in enumerate(items):
+        if ticker in seen:
+            raise ValueError(f"Ticker {ticker!r} appears more than once")
+        seen.add(ticker)
+        stem = _file_stem(ticker)
+        if stem.lower() in used:
+            stem = f"{stem}_{index}"
+            while stem.lower() in used:
+                stem += '_'
+        used.add(stem.lower())
+        yield ticker, stem, df
+
+
 class TechnicalAnalysisPipeline:
     """Complete technical analysis pipeline with all indicators"""
 
@@ -13,54 +127,117 @@ class TechnicalAnalysisPipeline:
         self.viz = TechnicalVisualizer()
         self.fin = FinancialMetrics()
 
+    def _analyze(self, df: pd.DataFrame, ticker: str, indicator_groups: List[str],
+                 render: bool = True) -> Dict:
+        """Indicators, metrics and (optionally) the figure for one stock; raises on failure"""
+        # Calculate all technical indicators
+        df = self.ta.calculate_all_indicators(df)
+
+        # Calculate financial metrics
+        df, metrics = self.fin.calculate_all_metrics(df)
+
+        # Create visualization
+        fig = self.viz.plot_indicators(df, ticker, indicator_groups) if render else None
+
+        return {
+            'data': df,
+            'metrics': metrics,
+            'figure': fig
+        }
+
+    def _analyze_isolated(self, df: pd.DataFrame, ticker: str, indicator_groups: List[str],
+                          render: bool) -> Tuple[str, Optional[Dict], Optional[AnalysisError], float]:
+        """Run _analyze, turning any exception into an AnalysisError record"""
+        start = time.perf_counter()
+        try:
+            result, error = self._analyze(df, ticker, indicator_groups, render), None
+        except Exception as e:
+            result = None
+            error = AnalysisError(ticker, type(e).__name__, str(e), traceback.format_exc())
+        return ticker, result, error, time.perf_counter() - start
+
     def analyze_stock(self, df: pd.DataFrame, ticker: str,
-                      indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility']) -> Dict:
+                      indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility'],
+                      render: bool = True) -> Dict:
         """
         Complete technical analysis for a single stock
         Args:
             df: DataFrame with OHLCV datafin
             ticker: Stock ticker symbol
             indicator_groups: Which indicator groups to include
+            render: Build the figure; False skips matplotlib entirely
         Returns:
             Dictionary containing:
             - data: DataFrame with all indicators
             - metrics: Financial metrics
-            - figure: Visualization figure
+            - figure: Visualization figure (None when render is False)
         """
         try:
-            # Calculate all technical indicators
-            df = self.ta.calculate_all_indicators(df)
-
-            # Calculate financial metrics
-            df, metrics = self.fin.calculate_all_metrics(df)
-
-            # Create visualization
-            fig = self.viz.plot_indicators(df, ticker, indicator_groups)
-
-            return {
-                'data': df,
-                'metrics': metrics,
-                'figure': fig
-            }
+            return self._analyze(df, ticker, indicator_groups, render)
         except Exception as e:
             print(f"Error analyzing {ticker}: {str(e)}")
             return None
 
     def analyze_multiple_stocks(self, stock_data: Dict[str, pd.DataFrame],
-                                indicator_groups: List[str] = ['trend', 'momentum']) -> Dict:
+                                indicator_groups: List[str] = ['trend', 'momentum'],
+                                workers: Optional[int] = None,
+                                render: bool = True,
+                                chunksize: Optional[int] = None) -> AnalysisBatchResult:
         """
         Analyze multiple stocks with comparative metrics
         Args:
             stock_data: Dictionary of {ticker: DataFrame}
             indicator_groups: Which indicator groups to include in visualization
+            workers: Process count for computing indicators and metrics in
+                parallel; None or 1 runs serially, values below 1 use every CPU
+            render: Build per-ticker figures and the correlation heatmap.
+                With workers, figures are drawn in this process from the
+                returned data; use render=False (or export_dashboards to
+                write images instead) for large batch runs.
+            chunksize: Tickers sent to a worker per task (defaults to about
+                four tasks per worker)
         Returns:
-            Dictionary containing analysis results for each stock plus correlation matrix
+            AnalysisBatchResult with the analysis for each stock (None for
+            failures) plus the correlation figure when rendering; per-ticker
+            errors and timings are in its ``errors`` and ``timings``
         """
-        results = {}
+        results = AnalysisBatchResult()
+        if workers is not None and workers < 1:
+            workers = os.cpu_count() or 1
+
+        if workers is not None and workers > 1 and len(stock_data) > 1:
+            if chunksize is None:
+                chunksize = max(1, len(stock_data) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_pipeline_worker) as executor:
+                outcomes = list(executor.map(_analyze_in_worker, stock_data.items(),
+                                             chunksize=chunksize))
+        else:
+            outcomes = []
+            for ticker, df in stock_data.items():
+                print(f"Analyzing {ticker}...")
+                outcomes.append(self._analyze_isolated(df, ticker, indicator_groups, render))
 
-        for ticker, df in stock_data.items():
-            print(f"Analyzing {ticker}...")
-            results[ticker] = self.analyze_stock(df, ticker, indicator_groups)
+        for ticker, result, error, elapsed in outcomes:
+            results[ticker] = result
+            results.timings[ticker] = elapsed
+            if error is not None:
+                results.errors[ticker] = error
+                print(f"Error analyzing {ticker}: {error.message}")
+            elif render and result['figure'] is None:
+                start = time.perf_counter()
+                try:
+                    result['figure'] = self.viz.plot_indicators(result['data'], ticker,
+                                                                indicator_groups)
+                except Exception as e:
+                    results[ticker] = None
+                    results.errors[ticker] = AnalysisError(ticker, type(e).__name__, str(e),
+                                                           traceback.format_exc())
+                    print(f"Error analyzing {ticker}: {e}")
+                results.timings[ticker] += time.perf_counter() - start
+
+        if not render:
+            return results
 
         # Add correlation matrix if we have multiple stocks
         valid_data = {t: r['data'] for t, r in results.items() if r is not None}
@@ -74,6 +251,95 @@ class TechnicalAnalysisPipeline:
 
         return results
 
+    def _export_isolated(self, df: pd.DataFrame, ticker: str, stem: str, output_dir: str,
+                         indicator_groups: List[str], formats: Sequence[str],
+                         dpi: int) -> ExportOutcome:
+        """Indicators plus one headless dashboard per format; errors become AnalysisError records"""
+        start = time.perf_counter()
+        try:
+            df = self.ta.calculate_all_indicators(df)
+            viz = TechnicalVisualizer(batch=True, dpi=dpi)
+            fig = viz.plot_indicators(df, ticker, indicator_groups)
+            try:
+                paths = []
+                for fmt in formats:
+                    path = os.path.join(output_dir, f"{stem}.{fmt}")
+                    fig.savefig(path, dpi=dpi, format=fmt)
+                    paths.append(path)
+            finally:
+                viz.close(fig)
+            error = None
+        except Exception as e:
+            paths = None
+            error = AnalysisError(ticker, type(e).__name__, str(e), traceback.format_exc())
+        return ticker, paths, error, time.perf_counter() - start
+
+    def export_dashboards(self, stock_data: StockData, output_dir: str,
+                          indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility'],
+                          formats: Sequence[str] = ('png',),
+                          workers: Optional[int] = None,
+                          max_in_flight: Optional[int] = None,
+                          dpi: int = 100) -> AnalysisBatchResult:
+        """
+        Render every ticker's dashboard to disk and return only the file paths
+
+        Unlike analyze_multiple_stocks, no DataFrame or figure is kept: each
+        worker computes the indicators, draws the dashboard headlessly
+        (TechnicalVisualizer batch mode), writes it and releases it. At most
+        ``max_in_flight`` tickers are queued at a time, so peak memory does
+        not grow with the size of the universe.
+        Args:
+            stock_data: {ticker: DataFrame} or any iterable of (ticker,
+                DataFrame) pairs, e.g. a generator loading one file at a
+                time. Tickers must be unique: a repeat raises ValueError when
+                it is reached, after earlier tickers may have been written
+            output_dir: Directory for the images (created if missing); files
+                are named <ticker>.<format>, with the ticker's position in
+                the batch appended when two tickers map to the same name
+                (BRK/B and BRK_B)
+            indicator_groups: Which indicator groups to include
+            formats: Image formats to write per ticker, e.g. ('png', 'svg')
+            workers: Process count; None or 1 renders serially, values below
+                1 use every CPU
+            max_in_flight: Tickers queued or rendering at once (defaults to
+                twice the workers)
+            dpi: Image resolution
+        Returns:
+            AnalysisBatchResult of {ticker: [paths]} (None for failures), with
+            per-ticker ``errors`` and ``timings``
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        formats = tuple(formats)
+        items = _unique_stems(stock_data.items() if isinstance(stock_data, Mapping) else stock_data)
+
+        if workers is not None and workers < 1:
+            workers = os.cpu_count() or 1
+
+        if workers is not None and workers > 1:
+            if max_in_flight is None:
+                max_in_flight = workers * 2
+            tasks = ((ticker, stem, df, output_dir, indicator_groups, formats, dpi)
+                     for ticker, stem, df in items)
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_pipeline_worker) as executor:
+                outcomes = _bounded_map(executor, _export_in_worker, tasks, max(1, max_in_flight))
+                return self._collect_exports(outcomes)
+
+        outcomes = (self._export_isolated(df, ticker, stem, output_dir, indicator_groups, formats, dpi)
+                    for ticker, stem, df in items)
+        return self._collect_exports(outcomes)
+
+    @staticmethod
+    def _collect_exports(outcomes: Iterable[ExportOutcome]) -> AnalysisBatchResult:
+        results = AnalysisBatchResult()
+        for ticker, paths, error, elapsed in outcomes:
+            results[ticker] = paths
+            results.timings[ticker] = elapsed
+            if error is not None:
+                results.errors[ticker] = error
+                print(f"Error exporting {ticker}: {error.message}")
+        return results
+
     def analyze_custom_indicators(self, df: pd.DataFrame, ticker: str,
                                   indicator_list: List[str]) -> Dict:
         """
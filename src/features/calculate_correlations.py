@@ -1,4 +1,706 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 import pandas as pd
+from scipy import stats
+
+SENTIMENT_METRICS = [
+    'vader_mean',
+    'vader_median',
+    'textblob_mean',
+    'positive_pct',
+    'negative_pct'
+]
+
+CORRELATION_METHODS = ('pearson', 'spearman')
+
+
+def _group_bounds(codes: np.ndarray) -> np.ndarray:
+    """Start offsets of each run of equal codes plus the end offset"""
+    return np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]))
+
+
+def _panel_order(merged_data: pd.DataFrame, ticker_col: Optional[str],
+                 date_col: Optional[str]) -> Tuple[np.ndarray, np.ndarray, pd.Index, bool]:
+    """
+    Row order that groups a panel by ticker (and date, when given).
+
+    Returns:
+        Tuple of (row order, ticker codes in that order, ticker labels,
+        whether the frame is grouped). Rows without a ticker are dropped
+        with a warning; without a ticker column the frame is one group.
+    """
+    grouped = ticker_col is not None and ticker_col in merged_data.columns
+    if grouped:
+        codes, tickers = pd.factorize(merged_data[ticker_col], sort=True)
+        keep = codes >= 0
+        if not keep.all():
+            warnings.warn(f"Ignored {(~keep).sum()} rows without a {ticker_col}.")
+    else:
+        codes = np.zeros(len(merged_data), dtype=np.int64)
+        tickers = pd.Index([None])
+        keep = np.ones(len(merged_data), dtype=bool)
+
+    rows = np.flatnonzero(keep)
+    if date_col is not None:
+        dates = np.asarray(merged_data[date_col])[rows]
+        order = rows[np.lexsort((dates, codes[rows]))]
+    else:
+        order = rows[np.argsort(codes[rows], kind='stable')]
+    return order, codes[order], tickers, grouped
+
+
+def _resolve_metrics(merged_data: pd.DataFrame, metrics: Optional[Iterable[str]]) -> List[str]:
+    """Requested sentiment columns, or the SENTIMENT_METRICS that are present"""
+    if metrics is None:
+        return [m for m in SENTIMENT_METRICS if m in merged_data.columns]
+    metrics = list(metrics)
+    missing = [m for m in metrics if m not in merged_data.columns]
+    if missing:
+        raise ValueError(f"Sentiment columns not found: {missing}")
+    return metrics
+
+
+def _lag_matrix(values: np.ndarray, bounds: np.ndarray, lags: Sequence[int]) -> np.ndarray:
+    """
+    Shift a group-sorted series by every lag at once.
+
+    Column ``j`` holds ``values[i + lags[j]]`` when that row belongs to the
+    same group as row ``i`` and NaN otherwise, i.e. ``shift(-lag)`` applied
+    within each group.
+    """
+    n = len(values)
+    lengths = np.diff(bounds)
+    starts = np.repeat(bounds[:-1], lengths)
+    stops = np.repeat(bounds[1:], lengths)
+
+    lagged = np.full((n, len(lags)), np.nan)
+    rows = np.arange(n)
+    for j, lag in enumerate(lags):
+        source = rows + lag
+        inside = (source >= starts) & (source < stops)
+        lagged[inside, j] = values[source[inside]]
+    return lagged
+
+
+def _grouped_order(values: np.ndarray, group_ids: np.ndarray) -> np.ndarray:
+    """Non-NaN rows sorted by (group, value)"""
+    rows = np.flatnonzero(~np.isnan(values))
+    return rows[np.lexsort((values[rows], group_ids[rows]))]
+
+
+def _ranks_from_order(order: np.ndarray, values: np.ndarray,
+                      group_ids: np.ndarray, n: int) -> np.ndarray:
+    """
+    Average ranks (1-based, ties averaged) within each group.
+
+    ``order`` lists the rows to rank already sorted by (group, value), so
+    this is a linear scan; rows not in ``order`` stay NaN. Matches
+    ``Series.rank`` applied per group after ``dropna``.
+    """
+    ranks = np.full(n, np.nan)
+    if not len(order):
+        return ranks
+
+    sorted_values = values[order]
+    sorted_groups = group_ids[order]
+    positions = np.arange(len(order))
+    new_group = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    new_block = new_group | np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+
+    group_first = np.maximum.accumulate(np.where(new_group, positions, 0))
+    block_first = np.flatnonzero(new_block)
+    block_last = np.r_[block_first[1:], len(order)] - 1
+    average = (block_first + block_last) / 2.0
+
+    ranks[order] = average[np.cumsum(new_block) - 1] - group_first + 1
+    return ranks
+
+
+def _grouped_pearson(x: np.ndarray, y: np.ndarray,
+                     bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete Pearson correlation of matching columns per group.
+
+    Args:
+        x: (rows, k) array, NaN marks missing observations
+        y: (rows, k) array aligned with ``x``
+        bounds: Group offsets from _group_bounds (rows sorted by group)
+
+    Returns:
+        Tuple of (correlations, observation counts), each shaped (groups, k).
+        Groups with fewer than two pairs or a constant side give NaN.
+    """
+    starts = bounds[:-1]
+    lengths = np.diff(bounds)
+    valid = ~(np.isnan(x) | np.isnan(y))
+
+    counts = np.add.reduceat(valid, starts, axis=0).astype(np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.add.reduceat(np.where(valid, x, 0.0), starts, axis=0) / counts
+        mean_y = np.add.reduceat(np.where(valid, y, 0.0), starts, axis=0) / counts
+
+        # Center before multiplying so large levels don't swamp the covariance
+        dx = np.where(valid, x - np.repeat(mean_x, lengths, axis=0), 0.0)
+        dy = np.where(valid, y - np.repeat(mean_y, lengths, axis=0), 0.0)
+        sxy = np.add.reduceat(dx * dy, starts, axis=0)
+        sxx = np.add.reduceat(dx * dx, starts, axis=0)
+        syy = np.add.reduceat(dy * dy, starts, axis=0)
+
+        corr = sxy / np.sqrt(sxx * syy)
+
+    # Centering a constant side leaves rounding noise rather than an exact
+    # zero; use the same relative tolerance as calculate_rolling_correlation
+    scale_x = np.add.reduceat(np.where(valid, x * x, 0.0), starts, axis=0)
+    scale_y = np.add.reduceat(np.where(valid, y * y, 0.0), starts, axis=0)
+    flat = (sxx <= 1e-12 * scale_x) | (syy <= 1e-12 * scale_y)
+    degenerate = (counts < 2) | flat
+    corr = np.where(degenerate, np.nan, np.clip(corr, -1.0, 1.0))
+    return corr, counts
+
+
+def calculate_correlation_matrix(merged_data: pd.DataFrame,
+                                 metrics: Optional[Iterable[str]] = None,
+                                 max_lag: int = 3,
+                                 lags: Optional[Sequence[int]] = None,
+                                 methods: Sequence[str] = CORRELATION_METHODS,
+                                 return_col: str = 'Daily_Return',
+                                 ticker_col: Optional[str] = 'Ticker',
+                                 date_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Correlate every sentiment metric with lagged returns, per ticker, in one pass.
+
+    Rows are sorted by ticker once and the lagged returns are built as a
+    single (rows x lags) matrix, so no frame is copied per lag or per metric.
+    For each lag all metrics and tickers are reduced together with
+    ``np.add.reduceat``; missing values are dropped pairwise, as
+    ``Series.corr`` does. Spearman correlations are Pearson correlations of
+    within-ticker average ranks; each series is sorted only once and the
+    per-lag rankings reuse that order.
+
+    Args:
+        merged_data: Sentiment/return data, one row per ticker per trading day
+        metrics: Sentiment columns to correlate (defaults to SENTIMENT_METRICS
+            that are present)
+        max_lag: Correlate sentiment with returns 0..max_lag rows later
+        lags: Explicit lags, overriding max_lag (negative lags look back)
+        methods: Any of 'pearson' and 'spearman'
+        return_col: Return column
+        ticker_col: Ticker column; None (or a missing column) treats the frame
+            as a single series
+        date_col: Optional column to order rows by within each ticker;
+            otherwise the existing row order is used
+
+    Returns:
+        Long-format DataFrame with one row per ticker/metric/lag/method and
+        columns Metric, Lag_Days, Method, Correlation, Absolute_Correlation
+        and N (pairs used), prefixed by the ticker column when grouping.
+    """
+    if return_col not in merged_data.columns:
+        raise ValueError(f"Return column '{return_col}' not found")
+
+    metrics = _resolve_metrics(merged_data, metrics)
+    lags = list(range(0, max_lag + 1)) if lags is None else [int(lag) for lag in lags]
+    methods = [method.lower() for method in methods]
+    unknown = [method for method in methods if method not in CORRELATION_METHODS]
+    if unknown:
+        raise ValueError(f"Unsupported correlation methods: {unknown}")
+
+    order, codes, tickers, grouped = _panel_order(merged_data, ticker_col, date_col)
+    columns = ['Metric', 'Lag_Days', 'Method', 'Correlation', 'Absolute_Correlation', 'N']
+    if grouped:
+        columns = [ticker_col] + columns
+    if not len(order) or not metrics or not lags or not methods:
+        return pd.DataFrame(columns=columns)
+
+    bounds = _group_bounds(codes)
+    present = codes[bounds[:-1]]
+
+    x = merged_data[metrics].to_numpy(dtype=float)[order]
+    y = merged_data[return_col].to_numpy(dtype=float)[order]
+    lagged = _lag_matrix(y, bounds, lags)
+
+    shape = (len(present), len(metrics), len(lags), len(methods))
+    corr = np.full(shape, np.nan)
+    counts = np.zeros(shape, dtype=np.int64)
+
+    if 'spearman' in methods:
+        # Sort each series once; masking a sorted order keeps it sorted, so
+        # per-lag ranks over the pairwise-complete rows are linear scans
+        group_ids = np.repeat(np.arange(len(present)), np.diff(bounds))
+        x_orders = [_grouped_order(x[:, m], group_ids) for m in range(len(metrics))]
+        y_order = _grouped_order(y, group_ids)
+
+    for j, lag in enumerate(lags):
+        valid = ~np.isnan(x) & ~np.isnan(lagged[:, [j]])
+        x_pairs = np.where(valid, x, np.nan)
+        y_pairs = np.where(valid, lagged[:, [j]], np.nan)
+
+        for k, method in enumerate(methods):
+            if method == 'spearman':
+                # Row i of the lagged column reads y[i + lag]
+                shifted = y_order - lag
+                inside = (shifted >= 0) & (shifted < len(y))
+                shifted, source = shifted[inside], y_order[inside]
+                shifted = shifted[group_ids[shifted] == group_ids[source]]
+
+                x_ranks = np.empty_like(x)
+                y_ranks = np.empty_like(x)
+                for m in range(len(metrics)):
+                    rows = x_orders[m][valid[x_orders[m], m]]
+                    x_ranks[:, m] = _ranks_from_order(rows, x[:, m], group_ids, len(x))
+                    rows = shifted[valid[shifted, m]]
+                    y_ranks[:, m] = _ranks_from_order(rows, lagged[:, j], group_ids, len(x))
+                c, n = _grouped_pearson(x_ranks, y_ranks, bounds)
+            else:
+                c, n = _grouped_pearson(x_pairs, y_pairs, bounds)
+            corr[:, :, j, k] = c
+            counts[:, :, j, k] = n
+
+    n_groups, n_metrics, n_lags, n_methods = shape
+    result = pd.DataFrame({
+        'Metric': np.tile(np.repeat(metrics, n_lags * n_methods), n_groups),
+        'Lag_Days': np.tile(np.repeat(lags, n_methods), n_groups * n_metrics),
+        'Method': np.tile(methods, n_groups * n_metrics * n_lags),
+        'Correlation': corr.ravel(),
+        'Absolute_Correlation': np.abs(corr.ravel()),
+        'N': counts.ravel(),
+    })
+    if grouped:
+        result.insert(0, ticker_col, np.repeat(np.asarray(tickers)[present],
+                                                n_metrics * n_lags * n_methods))
+    return result
+
+
+def _strength_labels(absolute_correlation: pd.Series) -> np.ndarray:
+    """Strong/Moderate/Weak labels for absolute correlations"""
+    values = absolute_correlation.to_numpy()
+    return np.select([values > 0.5, values > 0.3], ['Strong', 'Moderate'], default='Weak')
+
+
+def _correlation_p_values(corr: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Two-sided p-values for correlations against zero.
+
+    Uses the t statistic ``r * sqrt((n - 2) / (1 - r**2))`` with n - 2
+    degrees of freedom, the test behind ``scipy.stats.pearsonr`` and
+    ``scipy.stats.spearmanr``. Fewer than three pairs give NaN.
+    """
+    corr = np.asarray(corr, dtype=float)
+    dof = np.asarray(counts, dtype=float) - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_stat = corr * np.sqrt(dof / ((1.0 - corr) * (1.0 + corr)))
+        p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+    p_values = np.where(np.abs(corr) == 1.0, 0.0, p_values)
+    return np.where((dof > 0) & ~np.isnan(corr), p_values, np.nan)
+
+
+def calculate_correlation_by_ticker(merged_data: pd.DataFrame,
+                                    metrics: Optional[Iterable[str]] = None,
+                                    method: str = 'pearson',
+                                    lag: int = 0,
+                                    return_col: str = 'Daily_Return',
+                                    ticker_col: str = 'Ticker',
+                                    date_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Correlate sentiment metrics with returns for every ticker of a merged panel.
+
+    Replaces filtering the panel down to one ticker and calling
+    calculate_correlation on it: the panel is sorted once and all tickers are
+    reduced together by calculate_correlation_matrix.
+
+    Args:
+        merged_data: Long panel with ticker, sentiment metric and return columns
+        metrics: Sentiment columns (defaults to SENTIMENT_METRICS that are present)
+        method: 'pearson' or 'spearman'
+        lag: Correlate sentiment with returns this many rows later
+        return_col: Return column
+        ticker_col: Ticker column
+        date_col: Optional column to order rows by within each ticker
+
+    Returns:
+        DataFrame with one row per ticker and metric: Correlation,
+        Absolute_Correlation, Strength, N (pairs used) and P_Value
+    """
+    if ticker_col not in merged_data.columns:
+        raise ValueError(f"Ticker column '{ticker_col}' not found")
+
+    matrix = calculate_correlation_matrix(merged_data, metrics=metrics, lags=[lag],
+                                          methods=[method], return_col=return_col,
+                                          ticker_col=ticker_col, date_col=date_col)
+
+    results = matrix[[ticker_col, 'Metric', 'Correlation', 'Absolute_Correlation', 'N']].copy()
+    results['Strength'] = _strength_labels(results['Absolute_Correlation'])
+    results['P_Value'] = _correlation_p_values(results['Correlation'], results['N'])
+    return results[[ticker_col, 'Metric', 'Correlation', 'Absolute_Correlation',
+                    'Strength', 'N', 'P_Value']]
+
+
+def _window_sums(values: np.ndarray, bounds: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing window sums of each column, restarted at every group boundary.
+
+    One cumulative sum per column, then each window is the difference of two
+    prefix sums, so the cost does not depend on the window length.
+    """
+    n = len(values)
+    prefix = np.zeros((n + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=prefix[1:])
+
+    rows = np.arange(n)
+    group_starts = np.repeat(bounds[:-1], np.diff(bounds))
+    window_starts = np.maximum(rows + 1 - window, group_starts)
+    return prefix[rows + 1] - prefix[window_starts]
+
+
+def _last_changes(values: np.ndarray, valid: np.ndarray,
+                  bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Where each column last changed value, and where the next valid row is.
+
+    Comparisons run between consecutive valid rows of a group, so a trailing
+    window holds a constant column exactly when the column's last change at
+    the window end is no later than the first valid row inside the window.
+    Unlike the differenced float sums this carries no rounding noise.
+
+    Returns:
+        Tuple of (row of the latest change at or before each row, per
+        column; first valid row at or after each row)
+    """
+    n = len(values)
+    rows = np.arange(n)
+    group_starts = np.repeat(bounds[:-1], np.diff(bounds))
+
+    last_valid = np.maximum.accumulate(np.where(valid, rows, -1))
+    prev = np.concatenate(([-1], last_valid[:-1]))
+    has_prev = valid & (prev >= group_starts)
+    changed = np.zeros(values.shape, dtype=bool)
+    changed[has_prev] = values[has_prev] != values[prev[has_prev]]
+
+    last_change = np.maximum.accumulate(np.where(changed, rows[:, None], -1), axis=0)
+    next_valid = np.minimum.accumulate(np.where(valid, rows, n)[::-1])[::-1]
+    return last_change, next_valid
+
+
+def calculate_rolling_correlation(merged_data: pd.DataFrame,
+                                  window: Union[int, Sequence[int]] = 60,
+                                  metric: str = 'vader_mean',
+                                  return_col: str = 'Daily_Return',
+                                  ticker_col: Optional[str] = 'Ticker',
+                                  date_col: Optional[str] = None,
+                                  min_periods: Optional[int] = None) -> pd.DataFrame:
+    """
+    Rolling correlation between a sentiment metric and returns, per ticker.
+
+    Built from running sums of x, y, x^2, y^2 and xy over the rows where both
+    values are present, so each window is O(1) to update and a whole panel
+    costs O(n) whatever the window length. Values are centered on their
+    ticker mean first to keep the differenced sums accurate. Results match
+    ``x.rolling(window, min_periods).corr(y)`` applied per ticker.
+
+    Args:
+        merged_data: Sentiment/return data, one row per ticker per trading day
+        window: Window length in rows, or several lengths (e.g. (60, 252))
+        metric: Sentiment column
+        return_col: Return column
+        ticker_col: Ticker column; None (or a missing column) treats the frame
+            as a single series
+        date_col: Optional column to order rows by within each ticker;
+            otherwise the existing row order is used
+        min_periods: Minimum complete pairs in a window (defaults to the
+            window length)
+
+    Returns:
+        DataFrame aligned with merged_data's index holding
+        Rolling_Corr_<window> and Rolling_N_<window> (pairs in the window)
+        for each window
+    """
+    for col in (metric, return_col):
+        if col not in merged_data.columns:
+            raise ValueError(f"Column '{col}' not found")
+
+    windows = [window] if isinstance(window, (int, np.integer)) else list(window)
+    if any(w < 1 for w in windows):
+        raise ValueError("Window lengths must be positive")
+
+    if ticker_col is not None and ticker_col in merged_data.columns:
+        codes, _ = pd.factorize(merged_data[ticker_col], sort=True)
+    else:
+        codes = np.zeros(len(merged_data), dtype=np.int64)
+
+    if date_col is not None:
+        order = np.lexsort((np.asarray(merged_data[date_col]), codes))
+    else:
+        order = np.argsort(codes, kind='stable')
+    bounds = _group_bounds(codes[order])
+
+    x = merged_data[metric].to_numpy(dtype=float)[order]
+    y = merged_data[return_col].to_numpy(dtype=float)[order]
+    valid = ~(np.isnan(x) | np.isnan(y)) & (codes[order] >= 0)
+
+    result = pd.DataFrame(index=merged_data.index)
+    if not len(order):
+        for w in windows:
+            result[f'Rolling_Corr_{w}'] = np.nan
+            result[f'Rolling_N_{w}'] = 0
+        return result
+
+    lengths = np.diff(bounds)
+    starts = bounds[:-1]
+    counts = np.add.reduceat(valid, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.add.reduceat(np.where(valid, x, 0.0), starts) / counts
+        mean_y = np.add.reduceat(np.where(valid, y, 0.0), starts) / counts
+    dx = np.where(valid, x - np.repeat(mean_x, lengths), 0.0)
+    dy = np.where(valid, y - np.repeat(mean_y, lengths), 0.0)
+    moments = np.column_stack([valid.astype(float), dx, dy, dx * dx, dy * dy, dx * dy])
+
+    last_change, next_valid = _last_changes(np.column_stack([x, y]), valid, bounds)
+    rows = np.arange(len(order))
+    group_starts = np.repeat(starts, lengths)
+
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    for w in windows:
+        n, sx, sy, sxx, syy, sxy = _window_sums(moments, bounds, w).T
+        n = np.rint(n).astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            corr = (sxy - sx * sy / n) / np.sqrt(var_x * var_y)
+
+        # Differenced sums leave rounding noise where a window is constant,
+        # so flat windows are found from exact value changes instead
+        first = next_valid[np.maximum(rows + 1 - w, group_starts)]
+        flat = (last_change <= first[:, None]).any(axis=1)
+        required = w if min_periods is None else min_periods
+        corr = np.where((n < max(required, 2)) | flat, np.nan, np.clip(corr, -1.0, 1.0))
+
+        result[f'Rolling_Corr_{w}'] = corr[inverse]
+        result[f'Rolling_N_{w}'] = n[inverse]
+    return result
+
+
+def _block_sums(values: np.ndarray, block_size: int) -> np.ndarray:
+    """Sums of every run of ``block_size`` consecutive rows (one per start row)"""
+    prefix = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix[block_size:] - prefix[:-block_size]
+
+
+def _resample_ticker(task: tuple) -> np.ndarray:
+    """
+    Permutation p-values and block-bootstrap intervals for one ticker.
+
+    Metrics whose complete pairs fall on the same rows for a lag (the usual
+    case, since the sentiment columns share their missing days) are tested
+    together: each permutation of the returns is one index row, and a batch
+    of permutations is one gather plus one matrix product against all of
+    those metrics. One buffer of permutations of the ticker's rows serves
+    every pair set; keeping the entries below ``n`` of a uniform permutation
+    leaves a uniform permutation of ``range(n)``.
+
+    Bootstrap resamples draw block start rows. Per-block sums of x, y, x^2,
+    y^2 and xy are precomputed, so a resample's correlation needs one gather
+    of ``n / block_size`` block rows instead of ``n`` observations.
+
+    Args:
+        task: (x, lagged, n_resamples, block_size, confidence, seed,
+            batch_size) where x is (rows, metrics) and lagged is (rows, lags)
+
+    Returns:
+        Array shaped (metrics, lags, 5) of correlation, pairs, permutation
+        p-value, lower and upper bootstrap bound
+    """
+    x, lagged, n_resamples, block_size, confidence, seed, batch_size = task
+    rng = np.random.default_rng(seed)
+    out = np.full((x.shape[1], lagged.shape[1], 5), np.nan)
+    out[:, :, 1] = 0
+
+    pair_sets = []
+    for j in range(lagged.shape[1]):
+        valid = ~np.isnan(x) & ~np.isnan(lagged[:, [j]])
+        shared = {}
+        for m in range(x.shape[1]):
+            shared.setdefault(valid[:, m].tobytes(), []).append(m)
+
+        for cols in shared.values():
+            rows = np.flatnonzero(valid[:, cols[0]])
+            n = len(rows)
+            out[cols, j, 1] = n
+            if n < 3:
+                continue
+
+            xs = x[np.ix_(rows, cols)]
+            ys = lagged[rows, j]
+            xs = xs - xs.mean(axis=0)
+            ys = ys - ys.mean()
+            norm_x = np.sqrt((xs * xs).sum(axis=0))
+            norm_y = np.sqrt(ys @ ys)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                unit_x = xs / norm_x
+                corr = np.clip(ys @ unit_x / norm_y, -1.0, 1.0)
+            out[cols, j, 0] = corr
+
+            length = min(block_size, n)
+            moments = np.column_stack([ys, ys * ys, xs, xs * xs, xs * ys[:, None]])
+            pair_sets.append({
+                'lag': j, 'cols': cols, 'n': n, 'ys': ys / norm_y, 'unit_x': unit_x,
+                'corr': corr, 'length': length, 'blocks': -(-n // length),
+                'block_sums': _block_sums(moments, length),
+                'exceed': np.zeros(len(cols), dtype=np.int64),
+                'boot': np.empty((n_resamples, len(cols))),
+            })
+
+    if not pair_sets:
+        return out
+
+    buffer = np.tile(np.arange(len(x), dtype=np.int64), (min(batch_size, n_resamples), 1))
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        permutations = buffer[:size]
+        rng.permuted(permutations, axis=1, out=permutations)
+
+        restricted = {}
+        for pairs in pair_sets:
+            n = pairs['n']
+            if n == len(x):
+                index = permutations
+            else:
+                if n not in restricted:
+                    restricted[n] = permutations[permutations < n].reshape(size, n)
+                index = restricted[n]
+
+            permuted_corr = pairs['ys'][index] @ pairs['unit_x']
+            pairs['exceed'] += (np.abs(permuted_corr) >= np.abs(pairs['corr']) - 1e-12).sum(axis=0)
+
+            k = len(pairs['cols'])
+            starts = rng.integers(0, n - pairs['length'] + 1, size=(size, pairs['blocks']))
+            sums = pairs['block_sums'][starts].sum(axis=1)
+            total = pairs['blocks'] * pairs['length']
+            sy, syy = sums[:, [0]], sums[:, [1]]
+            sx, sxx, sxy = sums[:, 2:2 + k], sums[:, 2 + k:2 + 2 * k], sums[:, 2 + 2 * k:]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pairs['boot'][start:start + size] = (
+                    (sxy - sx * sy / total)
+                    / np.sqrt((sxx - sx * sx / total) * (syy - sy * sy / total))
+                )
+
+    tail = (1 - confidence) / 2 * 100
+    for pairs in pair_sets:
+        cols, j = pairs['cols'], pairs['lag']
+        p_values = (pairs['exceed'] + 1) / (n_resamples + 1)
+        out[cols, j, 2] = np.where(np.isnan(pairs['corr']), np.nan, p_values)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            out[cols, j, 3:] = np.nanpercentile(pairs['boot'], [tail, 100 - tail], axis=0).T
+    return out
+
+
+def calculate_correlation_significance(merged_data: pd.DataFrame,
+                                       metrics: Optional[Iterable[str]] = None,
+                                       max_lag: int = 0,
+                                       lags: Optional[Sequence[int]] = None,
+                                       n_resamples: int = 10_000,
+                                       block_size: int = 5,
+                                       confidence: float = 0.95,
+                                       return_col: str = 'Daily_Return',
+                                       ticker_col: Optional[str] = 'Ticker',
+                                       date_col: Optional[str] = None,
+                                       workers: Optional[int] = None,
+                                       seed: Optional[int] = None,
+                                       batch_size: int = 1000) -> pd.DataFrame:
+    """
+    Permutation p-values and block-bootstrap confidence intervals for the
+    Pearson correlation of every ticker/metric/lag.
+
+    Resamples are generated as index arrays and evaluated in batches of
+    ``batch_size`` with NumPy gathers and matrix products; no DataFrame is
+    built per resample. Permutations shuffle the returns against the
+    sentiment series (two-sided test of zero correlation). The moving-block
+    bootstrap resamples runs of ``block_size`` consecutive complete pairs to
+    keep short-range autocorrelation in each resample.
+
+    Each ticker gets its own child of ``SeedSequence(seed)``, so results do
+    not depend on ``workers``.
+
+    Args:
+        merged_data: Sentiment/return data, one row per ticker per trading day
+        metrics: Sentiment columns (defaults to SENTIMENT_METRICS that are present)
+        max_lag: Test lags 0..max_lag
+        lags: Explicit lags, overriding max_lag
+        n_resamples: Permutations and bootstrap resamples per correlation
+        block_size: Bootstrap block length in rows
+        confidence: Confidence level of the bootstrap interval
+        return_col: Return column
+        ticker_col: Ticker column; None (or a missing column) treats the frame
+            as a single series
+        date_col: Optional column to order rows by within each ticker
+        workers: Process count for spreading tickers across a pool; None or 1
+            runs in-process, values below 1 use every CPU
+        seed: Seed for reproducible resamples
+        batch_size: Resamples evaluated per batch (bounds memory)
+
+    Returns:
+        Long-format DataFrame with Metric, Lag_Days, Correlation, N,
+        Perm_P_Value, CI_Lower and CI_Upper, prefixed by the ticker column
+        when grouping
+    """
+    if return_col not in merged_data.columns:
+        raise ValueError(f"Return column '{return_col}' not found")
+    if n_resamples < 1 or block_size < 1 or batch_size < 1:
+        raise ValueError("n_resamples, block_size and batch_size must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    metrics = _resolve_metrics(merged_data, metrics)
+    lags = list(range(0, max_lag + 1)) if lags is None else [int(lag) for lag in lags]
+
+    order, codes, tickers, grouped = _panel_order(merged_data, ticker_col, date_col)
+    columns = ['Metric', 'Lag_Days', 'Correlation', 'N', 'Perm_P_Value', 'CI_Lower', 'CI_Upper']
+    if grouped:
+        columns = [ticker_col] + columns
+    if not len(order) or not metrics or not lags:
+        return pd.DataFrame(columns=columns)
+
+    bounds = _group_bounds(codes)
+    present = codes[bounds[:-1]]
+    x = merged_data[metrics].to_numpy(dtype=float)[order]
+    lagged = _lag_matrix(merged_data[return_col].to_numpy(dtype=float)[order], bounds, lags)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(present))
+    tasks = [
+        (x[start:stop], lagged[start:stop], n_resamples, block_size, confidence, child, batch_size)
+        for start, stop, child in zip(bounds[:-1], bounds[1:], seeds)
+    ]
+
+    if workers is not None and workers < 1:
+        workers = os.cpu_count() or 1
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_resample_ticker, tasks, chunksize=chunksize))
+    else:
+        results = [_resample_ticker(task) for task in tasks]
+
+    stacked = np.stack(results).reshape(-1, 5)
+    n_groups, n_metrics, n_lags = len(present), len(metrics), len(lags)
+    result = pd.DataFrame({
+        'Metric': np.tile(np.repeat(metrics, n_lags), n_groups),
+        'Lag_Days': np.tile(lags, n_groups * n_metrics),
+        'Correlation': stacked[:, 0],
+        'N': stacked[:, 1].astype(np.int64),
+        'Perm_P_Value': stacked[:, 2],
+        'CI_Lower': stacked[:, 3],
+        'CI_Upper': stacked[:, 4],
+    })
+    if grouped:
+        result.insert(0, ticker_col, np.repeat(np.asarray(tickers)[present], n_metrics * n_lags))
+    return result
+
 
 def calculate_correlation(merged_data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,34 +712,14 @@ def calculate_correlation(merged_data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with correlation results for each metric
     """
-    sentiment_metrics = [
-        'vader_mean',
-        'vader_median',
-        'textblob_mean',
-        'positive_pct',
-        'negative_pct'
-    ]
+    metrics = [m for m in SENTIMENT_METRICS if m in merged_data.columns]
+    matrix = calculate_correlation_matrix(merged_data, metrics=metrics, lags=[0],
+                                          methods=['pearson'], ticker_col=None)
 
-    correlations = {}
-    for metric in sentiment_metrics:
-        if metric in merged_data.columns:
-            valid_data = merged_data[['Daily_Return', metric]].dropna()
-
-            if (
-                not valid_data.empty
-                and valid_data['Daily_Return'].std() != 0
-                and valid_data[metric].std() != 0
-            ):
-                corr = valid_data['Daily_Return'].corr(valid_data[metric], method='pearson')
-                correlations[metric] = corr
-            else:
-                correlations[metric] = float('nan')
-
-    results = pd.DataFrame.from_dict(correlations, orient='index', columns=['Pearson_Correlation'])
+    results = pd.DataFrame({'Pearson_Correlation': matrix['Correlation'].to_numpy()},
+                           index=pd.Index(matrix['Metric'].to_numpy()))
     results['Absolute_Correlation'] = results['Pearson_Correlation'].abs()
-    results['Strength'] = results['Absolute_Correlation'].apply(
-        lambda x: 'Strong' if x > 0.5 else ('Moderate' if x > 0.3 else 'Weak')
-    )
+    results['Strength'] = _strength_labels(results['Absolute_Correlation'])
 
     return results.sort_values('Absolute_Correlation', ascending=False)
 
@@ -46,28 +728,15 @@ def calculate_lagged_correlation(merged_data: pd.DataFrame, max_lag: int = 3) ->
     """
     Calculate correlations with various time lags between sentiment and returns.
     """
-    results = []
-
-    for lag in range(0, max_lag + 1):
-        temp_df = merged_data.copy()
-        if lag > 0:
-            temp_df['Daily_Return'] = temp_df['Daily_Return'].shift(-lag)
-
-        valid_data = temp_df[['Daily_Return', 'vader_mean']].dropna()
-        if (
-            not valid_data.empty
-            and valid_data['Daily_Return'].std() != 0
-            and valid_data['vader_mean'].std() != 0
-        ):
-            corr = valid_data['Daily_Return'].corr(valid_data['vader_mean'], method='pearson')
-        else:
-            corr = float('nan')
-
-        results.append({
-            'Lag_Days': lag,
-            'Pearson_Correlation': corr,
-            'Absolute_Correlation': abs(corr) if pd.notna(corr) else float('nan'),
-            'Direction': 'Positive' if pd.notna(corr) and corr > 0 else 'Negative'
-        })
-
-    return pd.DataFrame(results).sort_values('Absolute_Correlation', ascending=False)
+    matrix = calculate_correlation_matrix(merged_data, metrics=['vader_mean'], max_lag=max_lag,
+                                          methods=['pearson'], ticker_col=None)
+    corr = matrix['Correlation']
+
+    results = pd.DataFrame({
+        'Lag_Days': matrix['Lag_Days'],
+        'Pearson_Correlation': corr,
+        'Absolute_Correlation': matrix['Absolute_Correlation'],
+        'Direction': np.where(corr > 0, 'Positive', 'Negative')
+    })
+
+    return results.sort_values('Absolute_Correlation', ascending=False)
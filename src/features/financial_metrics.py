@@ -1,80 +1,56 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Sequence
 import warnings
 
+from .metrics_backends import NumpyBackend, TRADING_DAYS, _wealth_index, get_backend
+from .risk_streaming import StreamingRiskMetrics, rolling_risk_columns
+
 
 class FinancialMetrics:
-    """Financial metrics calculation with PyNance fallback to manual calculations"""
+    """Financial metrics calculation on a pluggable PyNance, NumPy or Numba backend"""
 
-    def __init__(self, risk_free_rate: float = 0.02):
+    def __init__(self, risk_free_rate: float = 0.02, backend: Optional[str] = None):
         """
         Initialize financial metrics calculator
 
         Args:
             risk_free_rate: Annual risk-free rate (default 2%)
+            backend: Metrics backend ('pynance', 'numpy', 'numba'); None picks
+                PyNance when installed and NumPy otherwise. Backends are
+                resolved once per process and shared between instances.
         """
         self.risk_free_rate = risk_free_rate
-        self._has_pynance = self._check_pynance_availability()
+        self.backend: NumpyBackend = get_backend(backend)
+        self._has_pynance = self.backend.name == 'pynance'
 
     def _check_pynance_availability(self) -> bool:
         """Check if PyNance is properly installed and available"""
         try:
-            import pynance as pn
-            # Test basic functionality
-            if hasattr(pn, 'returns') and hasattr(pn.returns, 'daily'):
-                return True
-            return False
+            get_backend('pynance')
+            return True
         except ImportError:
             return False
 
     def _pynance_daily_returns(self, prices: pd.Series) -> pd.Series:
-        """Calculate daily returns using PyNance if available"""
-        if self._has_pynance:
-            import pynance as pn
-            return pn.returns.daily(prices)
-        return prices.pct_change()
+        """Calculate daily returns with the selected backend"""
+        return self.backend.daily_returns(prices)
 
     def _pynance_log_returns(self, prices: pd.Series) -> pd.Series:
-        """Calculate log returns using PyNance if available"""
-        if self._has_pynance:
-            import pynance as pn
-            return pn.returns.log(prices)
-        return np.log(prices / prices.shift(1))
+        """Calculate log returns with the selected backend"""
+        return self.backend.log_returns(prices)
 
     def _pynance_sharpe_ratio(self, returns: pd.Series) -> float:
-        """Calculate Sharpe ratio using PyNance if available"""
-        if self._has_pynance:
-            import pynance as pn
-            return pn.stats.sharpe_ratio(returns, risk_free=self.risk_free_rate)
-
-        # Manual calculation
-        excess_returns = returns - (self.risk_free_rate / 252)
-        return np.sqrt(252) * excess_returns.mean() / returns.std()
+        """Calculate Sharpe ratio with the selected backend"""
+        return self.backend.sharpe_ratio(returns, self.risk_free_rate)
 
     def _pynance_max_drawdown(self, prices: pd.Series) -> float:
-        """Calculate max drawdown using PyNance if available"""
-        if self._has_pynance:
-            import pynance as pn
-            return pn.stats.max_drawdown(prices)
-
-        # Manual calculation
-        cumulative_max = prices.cummax()
-        drawdown = (prices - cumulative_max) / cumulative_max
-        return drawdown.min()
+        """Calculate max drawdown with the selected backend"""
+        return self.backend.max_drawdown(prices)
 
     def _pynance_sortino_ratio(self, returns: pd.Series) -> float:
-        """Calculate Sortino ratio using PyNance if available"""
-        if self._has_pynance:
-            import pynance as pn
-            return pn.stats.sortino_ratio(returns, risk_free=self.risk_free_rate)
-
-        # Manual calculation
-        excess_returns = returns - (self.risk_free_rate / 252)
-        downside_returns = returns.copy()
-        downside_returns[downside_returns > 0] = 0
-        downside_std = downside_returns.std()
-        return np.sqrt(252) * excess_returns.mean() / downside_std
+        """Calculate Sortino ratio with the selected backend"""
+        return self.backend.sortino_ratio(returns, self.risk_free_rate)
 
     def calculate_returns(self, df: pd.DataFrame, price_col: str = 'Close') -> pd.DataFrame:
         """Calculate return metrics with robust error handling
@@ -84,12 +60,14 @@ class FinancialMetrics:
             price_col: Name of column containing price data
 
         Returns:
-            DataFrame with additional return columns
+            DataFrame with additional return columns. It is a shallow copy:
+            the new columns are added without duplicating the input's data,
+            and the input frame itself is left unchanged.
         """
         if price_col not in df.columns:
             raise ValueError(f"Price column '{price_col}' not found in DataFrame")
 
-        result = df.copy()
+        result = df.copy(deep=False)
 
         try:
             result['Daily_Return'] = self._pynance_daily_returns(result[price_col])
@@ -145,6 +123,133 @@ class FinancialMetrics:
 
         return metrics
 
+    def calculate_risk_metrics_matrix(self, returns: pd.DataFrame,
+                                      prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Calculate risk metrics for every column of a returns matrix at once
+
+        Each metric is one reduction over the whole (dates x tickers) block
+        by the selected backend (PyNance works per series, so the PyNance
+        backend uses the NumPy kernels here). Missing values are skipped per
+        column, so tickers with different histories can share one matrix.
+
+        Args:
+            returns: Daily returns, one column per ticker
+            prices: Optional matching price matrix for max drawdown; without
+                it drawdowns are taken from the compounded returns
+
+        Returns:
+            DataFrame indexed by ticker with Sharpe_Ratio, Max_Drawdown,
+            Annualized_Volatility and Sortino_Ratio columns
+        """
+        values = returns.to_numpy(dtype=float)
+        if prices is not None:
+            if not prices.columns.equals(returns.columns):
+                prices = prices.reindex(columns=returns.columns)
+            drawdowns = self.backend.max_drawdowns(prices.to_numpy(dtype=float))
+        else:
+            drawdowns = self.backend.max_drawdowns(_wealth_index(values))
+
+        return pd.DataFrame({
+            'Sharpe_Ratio': self.backend.sharpe_ratios(values, self.risk_free_rate),
+            'Max_Drawdown': drawdowns,
+            'Annualized_Volatility': self.backend.volatilities(values),
+            'Sortino_Ratio': self.backend.sortino_ratios(values, self.risk_free_rate),
+        }, index=returns.columns)
+
+    def calculate_rolling_risk_metrics(self, df: pd.DataFrame,
+                                       windows: Sequence[int] = (63, 252),
+                                       returns_col: str = 'Daily_Return',
+                                       price_col: Optional[str] = 'Close',
+                                       min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Calculate rolling Sharpe, Sortino and volatility plus running drawdown
+
+        Full-history counterpart of the streaming estimators: pandas rolling
+        windows over the returns and the downside returns ``min(r, 0)``,
+        giving the same values as replaying the history through
+        init_streaming_risk.
+
+        Args:
+            df: DataFrame with return (and optionally price) data, oldest first
+            windows: Window lengths in bars (e.g. quarterly and yearly)
+            returns_col: Name of column containing return data
+            price_col: Price column for drawdowns; None (or missing) uses
+                the compounded returns
+            min_periods: Minimum returns in a window (defaults to the window)
+
+        Returns:
+            DataFrame aligned with df holding Rolling_Sharpe_<w>,
+            Rolling_Sortino_<w>, Rolling_Volatility_<w>, Drawdown and
+            Max_Drawdown
+        """
+        if returns_col not in df.columns:
+            raise ValueError(f"Returns column '{returns_col}' not found in DataFrame")
+
+        returns = df[returns_col].astype(float)
+        downside = returns.clip(upper=0)
+        excess = self.risk_free_rate / TRADING_DAYS
+        result = pd.DataFrame(index=df.index)
+
+        for w in windows:
+            required = w if min_periods is None else min_periods
+            window = returns.rolling(w, min_periods=max(required, 1))
+            mean, std = window.mean(), window.std()
+            down_std = downside.rolling(w, min_periods=max(required, 1)).std()
+            scale = np.sqrt(TRADING_DAYS)
+            result[f'Rolling_Sharpe_{w}'] = (scale * (mean - excess) / std).where(std > 0)
+            result[f'Rolling_Sortino_{w}'] = (scale * (mean - excess) / down_std).where(down_std > 0)
+            result[f'Rolling_Volatility_{w}'] = std * scale
+
+        if price_col is not None and price_col in df.columns:
+            prices = df[price_col].to_numpy(dtype=float)
+        else:
+            prices = _wealth_index(returns.to_numpy()[:, None])[1:, 0]
+        running_max = np.fmax.accumulate(prices)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdown = (prices - running_max) / running_max
+        result['Drawdown'] = drawdown
+        result['Max_Drawdown'] = np.fmin.accumulate(drawdown)
+        return result[rolling_risk_columns(windows)]
+
+    def init_streaming_risk(self, df: pd.DataFrame,
+                            windows: Sequence[int] = (63, 252),
+                            returns_col: str = 'Daily_Return',
+                            price_col: Optional[str] = 'Close',
+                            min_periods: Optional[int] = None) -> StreamingRiskMetrics:
+        """Build streaming rolling-risk state from a return history
+
+        The history is replayed once; afterwards update_streaming_risk costs
+        O(1) per new bar and window.
+
+        Args:
+            df: DataFrame with return (and optionally price) data, oldest first
+            windows: Window lengths in bars
+            returns_col: Name of column containing return data
+            price_col: Price column for drawdowns (None: compounded returns)
+            min_periods: Minimum returns in a window (defaults to the window)
+
+        Returns:
+            StreamingRiskMetrics state (picklable)
+        """
+        state = StreamingRiskMetrics(windows, self.risk_free_rate, min_periods)
+        state.update(df, returns_col, price_col)
+        return state
+
+    def update_streaming_risk(self, state: StreamingRiskMetrics, new_rows: pd.DataFrame,
+                              returns_col: str = 'Daily_Return',
+                              price_col: Optional[str] = 'Close') -> pd.DataFrame:
+        """Append new bars to streaming rolling-risk state
+
+        Args:
+            state: State from init_streaming_risk (updated in place)
+            new_rows: Rows after the last one already in the state
+            returns_col: Name of column containing return data
+            price_col: Price column for drawdowns (None: compounded returns)
+
+        Returns:
+            DataFrame of rolling risk values for the new rows
+        """
+        return state.update(new_rows, returns_col, price_col)
+
     def calculate_all_metrics(self, df: pd.DataFrame,
                               price_col: str = 'Close',
                               returns_col: str = 'Daily_Return') -> Tuple[pd.DataFrame, Dict[str, float]]:
@@ -0,0 +1,402 @@
+import bisect
+import talib
+import numpy as np
+from scipy.signal import lfilter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# An indicator request: 'RSI', 'SMA_50', 'MACD_Signal' or ('RSI', {'timeperiod': 21})
+IndicatorRequest = Union[str, Tuple[str, Dict[str, Any]]]
+
+# A planned computation: (indicator name, sorted parameter items)
+Node = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+Arrays = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    One registry entry
+
+    Attributes:
+        name: Indicator name as requested, e.g. 'ATR'
+        outputs: Column names produced with the default parameters
+        params: Default TA-Lib parameters
+        compute: Direct TA-Lib computation, compute(inputs, **params)
+        derive: Optional cheaper computation from already computed
+            dependencies, derive(inputs, deps, **params)
+        deps: Indicators ``derive`` needs, called with the same parameters
+        derive_min_bars: Shortest history on which ``derive`` beats the
+            direct call; shorter histories call TA-Lib instead
+        name_template: Column name pattern used instead of outputs+suffix
+    """
+    name: str
+    outputs: Tuple[str, ...]
+    params: Dict[str, Any] = field(default_factory=dict)
+    compute: Optional[Callable[..., Tuple[np.ndarray, ...]]] = None
+    derive: Optional[Callable[..., Tuple[np.ndarray, ...]]] = None
+    deps: Tuple[str, ...] = ()
+    derive_min_bars: int = 0
+    name_template: Optional[str] = None
+
+
+def _first_valid(values: np.ndarray) -> int:
+    """Index of the first non-NaN value (len(values) if there is none)"""
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if len(valid) else len(values)
+
+
+def _smooth_from(values: np.ndarray, seed_idx: int, seed: float, period: int) -> np.ndarray:
+    """Wilder recursion y = y + (x - y) / period, seeded with ``seed`` at ``seed_idx``"""
+    out = np.full(len(values), np.nan)
+    if seed_idx >= len(values):
+        return out
+    # y[n] = x[n] / period + (1 - 1 / period) * y[n - 1] as a first-order IIR
+    # filter, with the seed entering through the initial filter state
+    decay = 1.0 - 1.0 / period
+    out[seed_idx] = seed
+    out[seed_idx + 1:], _ = lfilter([1.0 / period], [1.0, -decay], values[seed_idx + 1:],
+                                    zi=[decay * seed])
+    return out
+
+
+def _wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """TA-Lib style Wilder average (ATR, ADX): seeded with the first period's mean"""
+    first = _first_valid(values)
+    seed_idx = first + period - 1
+    if seed_idx >= len(values):
+        return np.full(len(values), np.nan)
+    return _smooth_from(values, seed_idx, values[first:seed_idx + 1].mean(), period)
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator with TA-Lib's convention of 0 for a zero denominator"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = numerator / denominator
+    return np.where(denominator == 0, 0.0, ratio)
+
+
+# --- derivations sharing intermediate results --------------------------------
+# TA-Lib's own ATR, NATR and DI loops are cheaper than any NumPy derivation of
+# them; DX, ADX and ADXR each rerun the whole DM/TR chain and are derived.
+
+def _dx_from_di(inputs: Arrays, deps: Dict[str, Tuple[np.ndarray, ...]],
+                timeperiod: int) -> Tuple[np.ndarray]:
+    (plus_di,) = deps['PLUS_DI']
+    (minus_di,) = deps['MINUS_DI']
+    dx = 100 * _safe_ratio(np.abs(plus_di - minus_di), plus_di + minus_di)
+    dx[np.isnan(plus_di) | np.isnan(minus_di)] = np.nan
+    return (dx,)
+
+
+def _adx_from_dx(inputs: Arrays, deps, timeperiod: int) -> Tuple[np.ndarray]:
+    (dx,) = deps['DX']
+    return (_wilder_average(dx, timeperiod),)
+
+
+def _adxr_from_adx(inputs: Arrays, deps, timeperiod: int) -> Tuple[np.ndarray]:
+    (adx,) = deps['ADX']
+    lag = timeperiod - 1
+    lagged = np.full(len(adx), np.nan)
+    if lag < len(adx):
+        lagged[lag:] = adx[:len(adx) - lag]
+    return ((adx + lagged) / 2,)
+
+
+# --- direct TA-Lib calls -----------------------------------------------------
+
+def _hlc(func):
+    return lambda i, **p: func(i['high'], i['low'], i['close'], **p)
+
+
+def _hl(func):
+    return lambda i, **p: func(i['high'], i['low'], **p)
+
+
+def _c(func):
+    return lambda i, **p: func(i['close'], **p)
+
+
+def _first_output(func):
+    """MACDEXT/MACDFIX: keep only the MACD line, as calculate_all_indicators does"""
+    return lambda i, **p: (func(i['close'], **p)[0],)
+
+
+def _tuple(compute):
+    """Normalize single-array TA-Lib results to 1-tuples"""
+    def wrapped(inputs, **params):
+        result = compute(inputs, **params)
+        return result if isinstance(result, tuple) else (result,)
+    return wrapped
+
+
+_SPECS = [
+    # Volatility
+    IndicatorSpec('TRANGE', ('TRANGE',), {}, _hlc(talib.TRANGE)),
+    IndicatorSpec('ATR', ('ATR',), {'timeperiod': 14}, _hlc(talib.ATR)),
+    IndicatorSpec('NATR', ('NATR',), {'timeperiod': 14}, _hlc(talib.NATR)),
+    IndicatorSpec('BBANDS', ('BB_UPPER', 'BB_MIDDLE', 'BB_LOWER'),
+                  {'timeperiod': 20, 'nbdevup': 2, 'nbdevdn': 2, 'matype': 0}, _c(talib.BBANDS)),
+
+    # Directional movement chain: DI -> DX -> ADX -> ADXR. Crossover lengths
+    # measured against the direct calls (see scripts/bench_indicator_plan.py)
+    IndicatorSpec('PLUS_DM', ('PLUS_DM',), {'timeperiod': 14}, _hl(talib.PLUS_DM)),
+    IndicatorSpec('MINUS_DM', ('MINUS_DM',), {'timeperiod': 14}, _hl(talib.MINUS_DM)),
+    IndicatorSpec('PLUS_DI', ('PLUS_DI',), {'timeperiod': 14}, _hlc(talib.PLUS_DI)),
+    IndicatorSpec('MINUS_DI', ('MINUS_DI',), {'timeperiod': 14}, _hlc(talib.MINUS_DI)),
+    IndicatorSpec('DX', ('DX',), {'timeperiod': 14}, _hlc(talib.DX),
+                  derive=_dx_from_di, deps=('PLUS_DI', 'MINUS_DI'), derive_min_bars=2048),
+    IndicatorSpec('ADX', ('ADX',), {'timeperiod': 14}, _hlc(talib.ADX),
+                  derive=_adx_from_dx, deps=('DX',), derive_min_bars=8192),
+    IndicatorSpec('ADXR', ('ADXR',), {'timeperiod': 14}, _hlc(talib.ADXR),
+                  derive=_adxr_from_adx, deps=('ADX',)),
+
+    # Other trend indicators
+    IndicatorSpec('AROON', ('AROON_DOWN', 'AROON_UP'), {'timeperiod': 14}, _hl(talib.AROON)),
+    IndicatorSpec('AROONOSC', ('AROONOSC',), {'timeperiod': 14}, _hl(talib.AROONOSC)),
+    IndicatorSpec('TRIX', ('TRIX',), {'timeperiod': 30}, _c(talib.TRIX)),
+
+    # MACD family: one call yields line, signal and histogram
+    IndicatorSpec('MACD', ('MACD', 'MACD_Signal', 'MACD_Hist'),
+                  {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}, _c(talib.MACD)),
+    IndicatorSpec('MACDEXT', ('MACDEXT',),
+                  {'fastperiod': 12, 'fastmatype': 0, 'slowperiod': 26, 'slowmatype': 0,
+                   'signalperiod': 9, 'signalmatype': 0}, _first_output(talib.MACDEXT)),
+    IndicatorSpec('MACDFIX', ('MACDFIX',), {'signalperiod': 9}, _first_output(talib.MACDFIX)),
+
+    # Momentum
+    IndicatorSpec('APO', ('APO',), {'fastperiod': 12, 'slowperiod': 26}, _c(talib.APO)),
+    IndicatorSpec('PPO', ('PPO',), {'fastperiod': 12, 'slowperiod': 26}, _c(talib.PPO)),
+    IndicatorSpec('RSI', ('RSI',), {'timeperiod': 14}, _c(talib.RSI)),
+    IndicatorSpec('CCI', ('CCI',), {'timeperiod': 14}, _hlc(talib.CCI)),
+    IndicatorSpec('CMO', ('CMO',), {'timeperiod': 14}, _c(talib.CMO)),
+    IndicatorSpec('ULTOSC', ('ULTOSC',), {'timeperiod1': 7, 'timeperiod2': 14, 'timeperiod3': 28},
+                  _hlc(talib.ULTOSC)),
+    IndicatorSpec('WILLR', ('WILLR',), {'timeperiod': 14}, _hlc(talib.WILLR)),
+    IndicatorSpec('ROC', ('ROC',), {'timeperiod': 10}, _c(talib.ROC)),
+    IndicatorSpec('ROCP', ('ROCP',), {'timeperiod': 10}, _c(talib.ROCP)),
+    IndicatorSpec('ROCR', ('ROCR',), {'timeperiod': 10}, _c(talib.ROCR)),
+    IndicatorSpec('ROCR100', ('ROCR100',), {'timeperiod': 10}, _c(talib.ROCR100)),
+    IndicatorSpec('MOM', ('MOM',), {'timeperiod': 10}, _c(talib.MOM)),
+    IndicatorSpec('STOCH', ('STOCH_K', 'STOCH_D'),
+                  {'fastk_period': 5, 'slowk_period': 3, 'slowk_matype': 0,
+                   'slowd_period': 3, 'slowd_matype': 0}, _hlc(talib.STOCH)),
+    IndicatorSpec('STOCHF', ('STOCHF_K', 'STOCHF_D'),
+                  {'fastk_period': 5, 'fastd_period': 3, 'fastd_matype': 0}, _hlc(talib.STOCHF)),
+    IndicatorSpec('STOCHRSI', ('STOCHRSI_K', 'STOCHRSI_D'),
+                  {'timeperiod': 14, 'fastk_period': 5, 'fastd_period': 3, 'fastd_matype': 0},
+                  _c(talib.STOCHRSI)),
+
+    # Volume
+    IndicatorSpec('OBV', ('OBV',), {}, lambda i: talib.OBV(i['close'], i['volume'])),
+    IndicatorSpec('MFI', ('MFI',), {'timeperiod': 14},
+                  lambda i, **p: talib.MFI(i['high'], i['low'], i['close'], i['volume'], **p)),
+    IndicatorSpec('BOP', ('BOP',), {},
+                  lambda i: talib.BOP(i['open'], i['high'], i['low'], i['close'])),
+
+    # Baseline moving averages
+    IndicatorSpec('SMA', ('SMA_30',), {'timeperiod': 30}, _c(talib.SMA), name_template='SMA_{timeperiod}'),
+    IndicatorSpec('EMA', ('EMA_30',), {'timeperiod': 30}, _c(talib.EMA), name_template='EMA_{timeperiod}'),
+]
+
+# Ordered so every derivation's dependencies come before it
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {
+    spec.name: IndicatorSpec(spec.name, spec.outputs, spec.params, _tuple(spec.compute),
+                             spec.derive, spec.deps, spec.derive_min_bars, spec.name_template)
+    for spec in _SPECS
+}
+
+# Output column names that can be requested directly, e.g. 'MACD_Signal'
+OUTPUT_ALIASES: Dict[str, str] = {
+    output: spec.name
+    for spec in INDICATOR_REGISTRY.values() if spec.name_template is None
+    for output in spec.outputs
+}
+
+# Periods requested by a bare 'SMA'/'EMA', matching calculate_all_indicators
+DEFAULT_MA_PERIODS = [5, 10, 20, 50, 100, 200]
+
+
+def _node(name: str, params: Optional[Dict[str, Any]] = None) -> Node:
+    """Registry node for an indicator with its defaults overridden by params"""
+    spec = INDICATOR_REGISTRY[name]
+    unknown = set(params or {}) - set(spec.params)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {name}: {sorted(unknown)}")
+    merged = {**spec.params, **(params or {})}
+    return name, tuple(sorted(merged.items()))
+
+
+def resolve_requests(indicator_list: Sequence[IndicatorRequest]) -> List[Node]:
+    """
+    Turn indicator requests into registry nodes
+
+    Accepts indicator names ('RSI'), output column names ('MACD_Signal',
+    'BB_UPPER'), moving averages with a period ('SMA_50'), bare 'SMA'/'EMA'
+    for the baseline periods, and (name, params) tuples.
+    """
+    nodes: List[Node] = []
+    for request in indicator_list:
+        if isinstance(request, tuple):
+            name, params = request
+        else:
+            name, params = request, None
+
+        if name in ('SMA', 'EMA') and params is None:
+            candidates = [_node(name, {'timeperiod': p}) for p in DEFAULT_MA_PERIODS]
+        elif name.startswith(('SMA_', 'EMA_')) and name[4:].isdigit():
+            candidates = [_node(name[:3], {'timeperiod': int(name[4:]), **(params or {})})]
+        elif name in INDICATOR_REGISTRY:
+            candidates = [_node(name, params)]
+        elif name in OUTPUT_ALIASES:
+            candidates = [_node(OUTPUT_ALIASES[name], params)]
+        else:
+            raise ValueError(f"Unknown indicator '{name}'")
+
+        nodes.extend(node for node in candidates if node not in nodes)
+    return nodes
+
+
+def column_names(node: Node) -> Tuple[str, ...]:
+    """
+    Output columns for a node
+
+    Default parameters keep the canonical names (RSI, MACD_Signal); other
+    parameters are appended, e.g. RSI_21 for ('RSI', {'timeperiod': 21}).
+    """
+    name, items = node
+    spec = INDICATOR_REGISTRY[name]
+    params = dict(items)
+    if spec.name_template is not None:
+        return (spec.name_template.format(**params),)
+
+    overrides = [str(value) for key, value in items if spec.params[key] != value]
+    if not overrides:
+        return spec.outputs
+    suffix = '_'.join(overrides)
+    return tuple(f'{output}_{suffix}' for output in spec.outputs)
+
+
+def _dep_node(node: Node, dep_name: str) -> Node:
+    """Dependency node sharing the parameters both indicators accept"""
+    dep_spec = INDICATOR_REGISTRY[dep_name]
+    return dep_name, tuple((k, v) for k, v in node[1] if k in dep_spec.params)
+
+
+@dataclass
+class IndicatorPlan:
+    """
+    Ordered computation steps for a set of requested indicators
+
+    Attributes:
+        requested: Nodes whose outputs become columns
+        steps: (node, 'compute' | 'derive') pairs in execution order on
+            histories long enough for every derivation; non-requested nodes
+            are shared intermediates
+    """
+    requested: List[Node]
+    steps: List[Tuple[Node, str]]
+    _steps_by_length: Dict[int, List[Tuple[Node, str]]] = field(
+        default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Distinct history lengths at which some derivation starts to pay off
+        self._thresholds = sorted({INDICATOR_REGISTRY[node[0]].derive_min_bars
+                                   for node, method in self.steps if method == 'derive'})
+
+    def steps_for(self, length: int) -> List[Tuple[Node, str]]:
+        """
+        Steps for a history of ``length`` bars
+
+        Derivations not worth it at this length become TA-Lib calls, and
+        intermediates nothing derives from any more are dropped. Cached per
+        set of derivations in use.
+        """
+        key = bisect.bisect_right(self._thresholds, length)
+        steps = self._steps_by_length.get(key)
+        if steps is None:
+            methods = {node: 'compute' if method == 'derive'
+                       and length < INDICATOR_REGISTRY[node[0]].derive_min_bars else method
+                       for node, method in self.steps}
+            needed = set(self.requested)
+            # Steps are in dependency order, so dependents are visited first
+            for node, method in reversed(list(methods.items())):
+                if node in needed and method == 'derive':
+                    needed.update(_dep_node(node, dep) for dep in INDICATOR_REGISTRY[node[0]].deps)
+            steps = self._steps_by_length[key] = [(node, method) for node, method in methods.items()
+                                                  if node in needed]
+        return steps
+
+    @property
+    def talib_calls(self) -> int:
+        """Number of TA-Lib calls the plan makes on long histories"""
+        return sum(method == 'compute' for _, method in self.steps)
+
+    def columns(self) -> List[str]:
+        return [col for node in self.requested for col in column_names(node)]
+
+
+def plan_indicators(indicator_list: Sequence[IndicatorRequest]) -> IndicatorPlan:
+    """
+    Plan the computation of exactly the requested indicators
+
+    An indicator is derived from its dependencies (e.g. DX from the DIs, ADXR
+    from ADX) when all of them are already part of the plan or can in turn be
+    derived from it; otherwise it costs one direct TA-Lib call. execute_plan
+    only derives on histories of at least the spec's derive_min_bars.
+    """
+    requested = resolve_requests(indicator_list)
+    order = list(INDICATOR_REGISTRY)
+    planned: Dict[Node, str] = {}
+
+    def derivable(node: Node) -> bool:
+        spec = INDICATOR_REGISTRY[node[0]]
+        if spec.derive is None:
+            return False
+        return all(_dep_node(node, dep) in planned or derivable(_dep_node(node, dep))
+                   for dep in spec.deps)
+
+    def add(node: Node) -> None:
+        if node in planned:
+            return
+        spec = INDICATOR_REGISTRY[node[0]]
+        if derivable(node):
+            for dep in spec.deps:
+                add(_dep_node(node, dep))
+            planned[node] = 'derive'
+        else:
+            planned[node] = 'compute'
+
+    # Chain roots come first in the registry, so earlier requests can feed later ones
+    for node in sorted(requested, key=lambda n: order.index(n[0])):
+        add(node)
+
+    return IndicatorPlan(requested=requested, steps=list(planned.items()))
+
+
+def execute_plan(plan: IndicatorPlan, inputs: Arrays) -> Dict[str, np.ndarray]:
+    """
+    Run a plan on float64 OHLCV arrays
+
+    Derivations run only where the history has at least the spec's
+    derive_min_bars; shorter histories call TA-Lib for that indicator.
+    Args:
+        plan: Plan from plan_indicators
+        inputs: {'open', 'high', 'low', 'close', 'volume'} arrays
+    Returns:
+        Dictionary of {column name: array} for the requested indicators
+    """
+    results: Dict[Node, Tuple[np.ndarray, ...]] = {}
+    for node, method in plan.steps_for(len(inputs['close'])):
+        spec = INDICATOR_REGISTRY[node[0]]
+        params = dict(node[1])
+        if method == 'derive':
+            deps = {dep: results[_dep_node(node, dep)] for dep in spec.deps}
+            results[node] = spec.derive(inputs, deps, **params)
+        else:
+            results[node] = spec.compute(inputs, **params)
+
+    return {col: values
+            for node in plan.requested
+            for col, values in zip(column_names(node), results[node])}
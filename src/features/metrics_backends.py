@@ -0,0 +1,300 @@
+import warnings
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _column_stats(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NaN-aware count, mean and sample standard deviation of every column.
+
+    Reductions use ``where=`` masks instead of building NaN-free copies.
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.sum(values, axis=0, where=valid) / counts
+        centered = values - means
+        variance = np.sum(centered * centered, axis=0, where=valid) / (counts - 1)
+    return counts, means, np.sqrt(np.where(counts > 1, variance, np.nan))
+
+
+def _sharpe_ratios(values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+    """Annualized Sharpe ratio of each column of daily returns"""
+    _, means, stds = _column_stats(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(TRADING_DAYS) * (means - risk_free_rate / TRADING_DAYS) / stds
+
+
+def _sortino_ratios(values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+    """
+    Annualized Sortino ratio of each column of daily returns.
+
+    The downside deviation is the sample standard deviation of
+    ``min(r, 0)``, accumulated from masked sums over the negative returns
+    rather than from a zeroed copy of the data.
+    """
+    counts, means, _ = _column_stats(values)
+    negative = values < 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        down_sum = np.sum(values, axis=0, where=negative)
+        down_sq = np.sum(values * values, axis=0, where=negative)
+        down_var = (down_sq - down_sum * down_sum / counts) / (counts - 1)
+        down_std = np.sqrt(np.where(counts > 1, np.maximum(down_var, 0.0), np.nan))
+        return np.sqrt(TRADING_DAYS) * (means - risk_free_rate / TRADING_DAYS) / down_std
+
+
+def _max_drawdowns(prices: np.ndarray) -> np.ndarray:
+    """Deepest peak-to-trough decline of each price (or wealth) column"""
+    running_max = np.fmax.accumulate(prices, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdowns = (prices - running_max) / running_max
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmin(drawdowns, axis=0)
+
+
+def _wealth_index(values: np.ndarray) -> np.ndarray:
+    """Growth of 1 unit from daily returns, starting with the initial 1 (NaN = flat day)"""
+    wealth = np.ones((values.shape[0] + 1, values.shape[1]))
+    np.cumprod(1 + np.nan_to_num(values, nan=0.0), axis=0, out=wealth[1:])
+    return wealth
+
+
+class NumpyBackend:
+    """
+    Pure-NumPy metric kernels.
+
+    Every kernel works on a (rows x columns) float array, so a single Series
+    is just a one-column view and a returns matrix is reduced in one pass.
+    """
+
+    name = 'numpy'
+
+    def daily_returns(self, prices: pd.Series) -> pd.Series:
+        """Simple daily returns"""
+        return prices.pct_change()
+
+    def log_returns(self, prices: pd.Series) -> pd.Series:
+        """Daily log returns"""
+        return np.log(prices / prices.shift(1))
+
+    def sharpe_ratios(self, values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+        """Annualized Sharpe ratio per column"""
+        return _sharpe_ratios(values, risk_free_rate)
+
+    def sortino_ratios(self, values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+        """Annualized Sortino ratio per column"""
+        return _sortino_ratios(values, risk_free_rate)
+
+    def max_drawdowns(self, prices: np.ndarray) -> np.ndarray:
+        """Max drawdown per column of prices"""
+        return _max_drawdowns(prices)
+
+    def volatilities(self, values: np.ndarray) -> np.ndarray:
+        """Annualized volatility per column"""
+        return _column_stats(values)[2] * np.sqrt(TRADING_DAYS)
+
+    # Single-series entry points used by FinancialMetrics
+    def sharpe_ratio(self, returns: pd.Series, risk_free_rate: float) -> float:
+        return float(self.sharpe_ratios(returns.to_numpy(dtype=float)[:, None], risk_free_rate)[0])
+
+    def sortino_ratio(self, returns: pd.Series, risk_free_rate: float) -> float:
+        return float(self.sortino_ratios(returns.to_numpy(dtype=float)[:, None], risk_free_rate)[0])
+
+    def max_drawdown(self, prices: pd.Series) -> float:
+        return float(self.max_drawdowns(prices.to_numpy(dtype=float)[:, None])[0])
+
+
+class PyNanceBackend(NumpyBackend):
+    """
+    PyNance for single-series metrics, NumPy kernels for matrices.
+
+    The module is imported once when the backend is resolved and kept on the
+    instance, so hot calls never go through the import machinery.
+    """
+
+    name = 'pynance'
+
+    def __init__(self, module):
+        self.pn = module
+
+    def daily_returns(self, prices: pd.Series) -> pd.Series:
+        return self.pn.returns.daily(prices)
+
+    def log_returns(self, prices: pd.Series) -> pd.Series:
+        return self.pn.returns.log(prices)
+
+    def sharpe_ratio(self, returns: pd.Series, risk_free_rate: float) -> float:
+        return self.pn.stats.sharpe_ratio(returns, risk_free=risk_free_rate)
+
+    def sortino_ratio(self, returns: pd.Series, risk_free_rate: float) -> float:
+        return self.pn.stats.sortino_ratio(returns, risk_free=risk_free_rate)
+
+    def max_drawdown(self, prices: pd.Series) -> float:
+        return self.pn.stats.max_drawdown(prices)
+
+
+def _build_numba_kernels(numba) -> Dict[str, Callable]:
+    """Compile the per-column loops; called once per process"""
+
+    @numba.njit(cache=True)
+    def sharpe_ratios(values, daily_rf):
+        rows, cols = values.shape
+        out = np.full(cols, np.nan)
+        for j in range(cols):
+            n = 0
+            total = 0.0
+            for i in range(rows):
+                v = values[i, j]
+                if not np.isnan(v):
+                    n += 1
+                    total += v
+            if n < 2:
+                continue
+            mean = total / n
+            sq = 0.0
+            for i in range(rows):
+                v = values[i, j]
+                if not np.isnan(v):
+                    sq += (v - mean) * (v - mean)
+            out[j] = np.sqrt(252.0) * (mean - daily_rf) / np.sqrt(sq / (n - 1))
+        return out
+
+    @numba.njit(cache=True)
+    def sortino_ratios(values, daily_rf):
+        rows, cols = values.shape
+        out = np.full(cols, np.nan)
+        for j in range(cols):
+            n = 0
+            total = 0.0
+            down_total = 0.0
+            for i in range(rows):
+                v = values[i, j]
+                if not np.isnan(v):
+                    n += 1
+                    total += v
+                    if v < 0:
+                        down_total += v
+            if n < 2:
+                continue
+            down_mean = down_total / n
+            sq = 0.0
+            for i in range(rows):
+                v = values[i, j]
+                if not np.isnan(v):
+                    d = min(v, 0.0) - down_mean
+                    sq += d * d
+            out[j] = np.sqrt(252.0) * (total / n - daily_rf) / np.sqrt(sq / (n - 1))
+        return out
+
+    @numba.njit(cache=True)
+    def max_drawdowns(prices):
+        rows, cols = prices.shape
+        out = np.full(cols, np.nan)
+        for j in range(cols):
+            peak = np.nan
+            for i in range(rows):
+                p = prices[i, j]
+                if np.isnan(p):
+                    continue
+                if np.isnan(peak) or p > peak:
+                    peak = p
+                dd = (p - peak) / peak
+                if np.isnan(out[j]) or dd < out[j]:
+                    out[j] = dd
+        return out
+
+    return {'sharpe_ratios': sharpe_ratios, 'sortino_ratios': sortino_ratios,
+            'max_drawdowns': max_drawdowns}
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    Numba-compiled loops: one pass per column with no temporaries.
+
+    Compilation happens once per process when the backend is first resolved
+    (and is cached on disk by Numba between runs).
+    """
+
+    name = 'numba'
+
+    def __init__(self, kernels: Dict[str, Callable]):
+        self.kernels = kernels
+
+    def sharpe_ratios(self, values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+        return self.kernels['sharpe_ratios'](np.ascontiguousarray(values, dtype=np.float64),
+                                             risk_free_rate / TRADING_DAYS)
+
+    def sortino_ratios(self, values: np.ndarray, risk_free_rate: float) -> np.ndarray:
+        return self.kernels['sortino_ratios'](np.ascontiguousarray(values, dtype=np.float64),
+                                              risk_free_rate / TRADING_DAYS)
+
+    def max_drawdowns(self, prices: np.ndarray) -> np.ndarray:
+        return self.kernels['max_drawdowns'](np.ascontiguousarray(prices, dtype=np.float64))
+
+
+def _load_pynance() -> PyNanceBackend:
+    import pynance as pn
+    if not (hasattr(pn, 'returns') and hasattr(pn.returns, 'daily')):
+        raise ImportError("Installed pynance does not provide pynance.returns.daily")
+    return PyNanceBackend(pn)
+
+
+def _load_numba() -> NumbaBackend:
+    import numba
+    return NumbaBackend(_build_numba_kernels(numba))
+
+
+_BACKEND_LOADERS: Dict[str, Callable[[], NumpyBackend]] = {
+    'pynance': _load_pynance,
+    'numpy': NumpyBackend,
+    'numba': _load_numba,
+}
+
+# Order tried by backend='auto'; PyNance first keeps the historical behaviour
+AUTO_ORDER = ('pynance', 'numpy')
+
+
+@lru_cache(maxsize=None)
+def _resolve_backend(name: str) -> Optional[NumpyBackend]:
+    """Load a backend once per process; None when its dependency is missing"""
+    try:
+        return _BACKEND_LOADERS[name]()
+    except ImportError:
+        return None
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Names of the backends whose dependencies are installed"""
+    return tuple(name for name in _BACKEND_LOADERS if _resolve_backend(name) is not None)
+
+
+def get_backend(name: Optional[str] = None) -> NumpyBackend:
+    """
+    Return the metrics backend for ``name``, resolving it at most once per process
+
+    Args:
+        name: 'pynance', 'numpy', 'numba', or None/'auto' for the first
+            available of AUTO_ORDER
+
+    Returns:
+        Shared backend instance
+    """
+    if name is None or name == 'auto':
+        for candidate in AUTO_ORDER:
+            backend = _resolve_backend(candidate)
+            if backend is not None:
+                return backend
+        raise RuntimeError("No metrics backend available")
+
+    if name not in _BACKEND_LOADERS:
+        raise ValueError(f"Unknown metrics backend '{name}'; choose from {sorted(_BACKEND_LOADERS)}")
+    backend = _resolve_backend(name)
+    if backend is None:
+        raise ImportError(f"Metrics backend '{name}' is not installed")
+    return backend
@@ -0,0 +1,291 @@
+import warnings
+from typing import Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .sentiment_classification import aggregate_sentiment_by_ticker_and_date
+
+# US equity regular-session close, in exchange local time
+DEFAULT_MARKET_CLOSE = '16:00'
+DEFAULT_MARKET_TZ = 'America/New_York'
+# Longest roll-forward, in calendar days, from a headline to its session:
+# a Friday close plus a Monday holiday
+DEFAULT_MAX_LAG = 4
+
+PriceData = Union[Mapping[str, pd.DataFrame], pd.DataFrame]
+
+
+def _naive_timestamps(values, market_tz: Optional[str]) -> pd.DatetimeIndex:
+    """Timestamps as tz-naive exchange local time (tz-aware values are converted)"""
+    stamps = pd.DatetimeIndex(pd.to_datetime(values, errors='coerce'))
+    if stamps.tz is not None:
+        if market_tz is not None:
+            stamps = stamps.tz_convert(market_tz)
+        stamps = stamps.tz_localize(None)
+    return stamps
+
+
+def build_price_panel(prices: PriceData,
+                      ticker_col: str = 'Ticker',
+                      date_col: str = 'clean_date',
+                      price_col: str = 'Close',
+                      session_col: str = 'session_date',
+                      value_cols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Stack per-ticker price frames into one long panel sorted by ticker and session.
+
+    Args:
+        prices: {ticker: DataFrame} (e.g. DataLoader.load_multiple_stocks) or
+            a long DataFrame with a ticker column
+        ticker_col: Ticker column of the output (and of a long input)
+        date_col: Bar date column; the index is used when it is absent
+        price_col: Price column used to derive Daily_Return when missing
+        session_col: Name of the normalized session date column
+        value_cols: Columns to carry over (defaults to price_col plus
+            Daily_Return)
+
+    Returns:
+        DataFrame with ticker_col (categorical), session_col and value_cols,
+        sorted by ticker then session
+    """
+    if value_cols is None:
+        value_cols = [price_col, 'Daily_Return']
+    value_cols = list(value_cols)
+
+    if isinstance(prices, pd.DataFrame):
+        if ticker_col not in prices.columns:
+            raise ValueError(f"Ticker column '{ticker_col}' not found in price panel")
+        frames = {ticker: frame for ticker, frame in prices.groupby(ticker_col, sort=False, observed=True)}
+    else:
+        frames = dict(prices)
+
+    tickers, dates, derived = [], [], []
+    columns = {col: [] for col in value_cols}
+    for ticker, frame in frames.items():
+        bar_dates = frame[date_col] if date_col in frame.columns else frame.index
+        tickers.append(np.full(len(frame), ticker, dtype=object))
+        dates.append(_naive_timestamps(bar_dates, None).normalize().to_numpy())
+        derive = 'Daily_Return' in value_cols and 'Daily_Return' not in frame.columns
+        derived.append(np.full(len(frame), derive))
+        for col in value_cols:
+            if col in frame.columns:
+                columns[col].append(frame[col].to_numpy(dtype=float))
+            elif col == 'Daily_Return' and price_col in frame.columns:
+                columns[col].append(np.full(len(frame), np.nan))
+            else:
+                raise ValueError(f"Column '{col}' not found for {ticker}")
+
+    if not tickers:
+        return pd.DataFrame(columns=[ticker_col, session_col] + value_cols)
+
+    panel = pd.DataFrame({
+        ticker_col: pd.Categorical(np.concatenate(tickers)),
+        session_col: np.concatenate(dates),
+        **{col: np.concatenate(parts) for col, parts in columns.items()},
+    })
+    derived = np.concatenate(derived)
+    keep = panel[session_col].notna().to_numpy()
+    order = np.flatnonzero(keep)
+    order = order[np.lexsort((panel[session_col].to_numpy()[order],
+                              panel[ticker_col].cat.codes.to_numpy()[order]))]
+    panel = panel.take(order).reset_index(drop=True)
+    derived = derived[order]
+
+    if derived.any():
+        # Close-to-close return per ticker, restarted at each ticker boundary
+        close = panel[price_col].to_numpy(dtype=float)
+        codes = panel[ticker_col].cat.codes.to_numpy()
+        returns = np.full(len(panel), np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns[1:] = np.where(codes[1:] == codes[:-1], close[1:] / close[:-1] - 1, np.nan)
+        panel['Daily_Return'] = np.where(derived, returns, panel['Daily_Return'].to_numpy())
+    return panel
+
+
+def _session_keys(codes: np.ndarray, stamps: np.ndarray, base: int, span: int) -> np.ndarray:
+    """Single sortable int64 key per (ticker code, timestamp in seconds)"""
+    return codes.astype(np.int64) * span + (stamps - base)
+
+
+def align_news_to_sessions(news: pd.DataFrame,
+                           prices: PriceData,
+                           date_col: str = 'clean_date',
+                           ticker_col: str = 'Ticker',
+                           market_close: str = DEFAULT_MARKET_CLOSE,
+                           market_tz: Optional[str] = DEFAULT_MARKET_TZ,
+                           new_col: str = 'session_date',
+                           price_date_col: str = 'clean_date',
+                           max_lag: Optional[int] = DEFAULT_MAX_LAG) -> pd.DataFrame:
+    """
+    Map each headline to the trading session whose return it can move.
+
+    A headline published before a session's close belongs to that session;
+    one published at or after the close, or on a weekend or holiday, rolls
+    forward to the ticker's next session. The sessions come from each
+    ticker's own price bars, so halts and listing dates are respected:
+    headlines from before the day of a ticker's first bar, or more than
+    max_lag days before the next bar (a data gap), are left unaligned rather
+    than attributed to a much later session. The lookup is a single
+    ``np.searchsorted`` over (ticker, session close) keys for all tickers
+    at once.
+
+    Args:
+        news: Headlines with a timestamp column and a ticker column
+        prices: {ticker: DataFrame} or long price panel (see build_price_panel)
+        date_col: Headline timestamp column; naive values are taken as
+            exchange local time, tz-aware values are converted to market_tz
+        ticker_col: Ticker column
+        market_close: Close cutoff as 'HH:MM' in exchange local time
+        market_tz: Exchange time zone used for tz-aware timestamps
+        new_col: Output column holding the effective session date
+        price_date_col: Bar date column of the price frames
+        max_lag: Most calendar days a headline may roll forward to its
+            session; None disables the cap
+
+    Returns:
+        Copy of news with new_col added; NaT where the headline's ticker has
+        no price data, the headline falls before the day of the ticker's
+        first session, or the ticker has no session within max_lag days
+        from the headline's date
+    """
+    for col in (date_col, ticker_col):
+        if col not in news.columns:
+            raise ValueError(f"Column '{col}' not found in news")
+    if max_lag is not None and max_lag < 0:
+        raise ValueError("max_lag must be non-negative")
+
+    panel = build_price_panel(prices, ticker_col=ticker_col, date_col=price_date_col,
+                              session_col=new_col, value_cols=[])
+    close_offset = pd.Timedelta(market_close + ':00' if market_close.count(':') == 1 else market_close)
+
+    sessions = panel[new_col].to_numpy()
+    closes = (sessions + close_offset.to_timedelta64()).astype('datetime64[s]').astype(np.int64)
+    session_codes = panel[ticker_col].cat.codes.to_numpy()
+
+    stamps = _naive_timestamps(news[date_col], market_tz)
+    news_seconds = stamps.to_numpy().astype('datetime64[s]').astype(np.int64)
+    news_codes = pd.Categorical(news[ticker_col], categories=panel[ticker_col].cat.categories).codes
+    usable = (news_codes >= 0) & ~stamps.isna()
+
+    result = news.copy()
+    aligned = np.full(len(news), np.datetime64('NaT'), dtype='datetime64[ns]')
+    if len(closes) and usable.any():
+        base = min(closes.min(), news_seconds[usable].min())
+        span = max(closes.max(), news_seconds[usable].max()) - base + 1
+        if int(span) * (len(panel[ticker_col].cat.categories) + 1) >= np.iinfo(np.int64).max:
+            raise ValueError("Timestamp range too wide to build session keys")
+
+        session_keys = _session_keys(session_codes, closes, base, span)
+        news_keys = _session_keys(news_codes[usable], news_seconds[usable], base, span)
+
+        # First session of the same ticker whose close is strictly later
+        position = np.searchsorted(session_keys, news_keys, side='right')
+        found = position < len(session_keys)
+        found[found] = session_codes[position[found]] == news_codes[usable][found]
+
+        day = 24 * 3600
+        session_days = sessions[position[found]].astype('datetime64[D]').astype(np.int64)
+        news_days = news_seconds[usable][found] // day
+        # Sessions are sorted by ticker, so a ticker's first one follows another ticker's
+        first = position[found] == 0
+        first[~first] = session_codes[position[found][~first] - 1] != news_codes[usable][found][~first]
+        keep = ~(first & (news_days < session_days))
+        if max_lag is not None:
+            keep &= session_days - news_days <= max_lag
+        found[found] = keep
+
+        rows = np.flatnonzero(usable)
+        aligned[rows[found]] = sessions[position[found]]
+
+    missing = int(np.isnat(aligned).sum())
+    if missing:
+        warnings.warn(f"{missing} headlines have no matching trading session.")
+    result[new_col] = aligned
+    return result
+
+
+def merge_sentiment_with_returns(daily_sentiment: pd.DataFrame,
+                                 prices: PriceData,
+                                 date_col: str = 'session_date',
+                                 ticker_col: str = 'Ticker',
+                                 price_col: str = 'Close',
+                                 price_date_col: str = 'clean_date',
+                                 value_cols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Join daily sentiment to every ticker's price bars in one sorted merge.
+
+    Args:
+        daily_sentiment: Output of aggregate_sentiment_by_ticker_and_date keyed
+            by session date
+        prices: {ticker: DataFrame} or long price panel
+        date_col: Session date column of daily_sentiment (also the panel's)
+        ticker_col: Ticker column
+        price_col: Price column
+        price_date_col: Bar date column of the price frames
+        value_cols: Price columns to carry (defaults to price_col and Daily_Return)
+
+    Returns:
+        Long panel with one row per ticker per trading session (sessions
+        without news keep NaN sentiment), sorted by ticker and session
+    """
+    for col in (date_col, ticker_col):
+        if col not in daily_sentiment.columns:
+            raise ValueError(f"Column '{col}' not found in daily sentiment")
+
+    panel = build_price_panel(prices, ticker_col=ticker_col, date_col=price_date_col,
+                              price_col=price_col, session_col=date_col, value_cols=value_cols)
+
+    sentiment = daily_sentiment.drop(columns=[c for c in panel.columns
+                                              if c in daily_sentiment.columns
+                                              and c not in (ticker_col, date_col)])
+    sentiment = sentiment.assign(**{
+        ticker_col: pd.Categorical(sentiment[ticker_col],
+                                   categories=panel[ticker_col].cat.categories),
+        date_col: _naive_timestamps(sentiment[date_col], None).normalize(),
+    })
+
+    # The panel is already sorted, and a left merge keeps the left order
+    return panel.merge(sentiment, on=[ticker_col, date_col], how='left', sort=False)
+
+
+def build_sentiment_return_panel(news: pd.DataFrame,
+                                 prices: PriceData,
+                                 date_col: str = 'clean_date',
+                                 ticker_col: str = 'Ticker',
+                                 market_close: str = DEFAULT_MARKET_CLOSE,
+                                 market_tz: Optional[str] = DEFAULT_MARKET_TZ,
+                                 session_col: str = 'session_date',
+                                 price_date_col: str = 'clean_date',
+                                 max_lag: Optional[int] = DEFAULT_MAX_LAG) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Classified headlines and price bars to a merged sentiment/return panel.
+
+    Aligns headlines to sessions, aggregates them per ticker and session,
+    and merges the result onto the price panel.
+
+    Args:
+        news: Output of classify_sentiment with a timestamp column
+        prices: {ticker: DataFrame} or long price panel
+        date_col: Headline timestamp column
+        ticker_col: Ticker column
+        market_close: Close cutoff as 'HH:MM' in exchange local time
+        market_tz: Exchange time zone used for tz-aware timestamps
+        session_col: Name of the session date column
+        price_date_col: Bar date column of the price frames
+        max_lag: Most calendar days a headline may roll forward to its
+            session (see align_news_to_sessions)
+
+    Returns:
+        Tuple of (merged panel, daily sentiment per ticker and session)
+    """
+    aligned = align_news_to_sessions(news, prices, date_col=date_col, ticker_col=ticker_col,
+                                     market_close=market_close, market_tz=market_tz,
+                                     new_col=session_col, price_date_col=price_date_col,
+                                     max_lag=max_lag)
+    aligned = aligned[aligned[session_col].notna()]
+
+    daily = aggregate_sentiment_by_ticker_and_date(aligned, date_col=session_col, ticker_col=ticker_col)
+    panel = merge_sentiment_with_returns(daily, prices, date_col=session_col, ticker_col=ticker_col,
+                                         price_date_col=price_date_col)
+    return panel, daily
@@ -0,0 +1,189 @@
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .metrics_backends import TRADING_DAYS
+
+NAN = float('nan')
+
+
+class _RollingMoments:
+    """
+    Welford running mean and sum of squared deviations over the last
+    ``window`` bars.
+
+    Adding and removing a value are O(1). Missing values take a slot in the
+    window but are left out of the moments, like pandas rolling windows. The
+    moments are recomputed from the window once per ``window`` updates
+    (amortized O(1)) so add/remove rounding cannot drift over long feeds.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.count = 0
+
+    def _add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        if self.n == 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.n -= 1
+        self.mean = (old_mean * (self.n + 1) - x) / self.n
+        self.m2 -= (x - old_mean) * (x - self.mean)
+
+    def _resync(self) -> None:
+        present = [v for v in self.values if not math.isnan(v)]
+        self.n = len(present)
+        self.mean = math.fsum(present) / self.n if present else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in present)
+
+    def update(self, x: float) -> None:
+        self.values.append(x)
+        if not math.isnan(x):
+            self._add(x)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self._remove(old)
+        self.count += 1
+        if self.count % self.window == 0:
+            self._resync()
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)"""
+        if self.n < 2:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1))
+
+
+class _RunningDrawdown:
+    """Running peak of a price (or wealth) series and the drawdown from it"""
+
+    def __init__(self):
+        self.peak = NAN
+        self.max_drawdown = NAN
+
+    def update(self, price: float) -> float:
+        if math.isnan(price):
+            return NAN
+        if math.isnan(self.peak) or price > self.peak:
+            self.peak = price
+        drawdown = (price - self.peak) / self.peak
+        if math.isnan(self.max_drawdown) or drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+        return drawdown
+
+
+def rolling_risk_columns(windows: Sequence[int]) -> List[str]:
+    """Output columns of the rolling risk metrics, in order"""
+    columns = []
+    for w in windows:
+        columns += [f'Rolling_Sharpe_{w}', f'Rolling_Sortino_{w}', f'Rolling_Volatility_{w}']
+    return columns + ['Drawdown', 'Max_Drawdown']
+
+
+class StreamingRiskMetrics:
+    """
+    Append-only rolling risk state for one ticker.
+
+    For every window it keeps Welford moments of the returns and of the
+    downside returns ``min(r, 0)``; a running peak gives the drawdown. Each
+    new bar costs O(number of windows), however long the history. The state
+    is plain Python and can be pickled between daily runs.
+    """
+
+    def __init__(self, windows: Sequence[int] = (63, 252), risk_free_rate: float = 0.02,
+                 min_periods: Optional[int] = None):
+        self.windows = list(windows)
+        self.risk_free_rate = risk_free_rate
+        self.min_periods = min_periods
+        self.returns = {w: _RollingMoments(w) for w in self.windows}
+        self.downside = {w: _RollingMoments(w) for w in self.windows}
+        self.drawdown = _RunningDrawdown()
+        self.wealth = 1.0
+        self.last_index = None
+
+    @property
+    def columns(self) -> List[str]:
+        """Risk columns produced for each bar"""
+        return rolling_risk_columns(self.windows)
+
+    def update_bar(self, ret: float, price: Optional[float] = None) -> Dict[str, float]:
+        """
+        Fold one bar into the state and return its risk values
+
+        Args:
+            ret: The bar's daily return (NaN when unknown)
+            price: The bar's price; without it drawdowns follow the
+                compounded returns
+        """
+        row = {}
+        excess_daily = self.risk_free_rate / TRADING_DAYS
+        for w in self.windows:
+            moments, downside = self.returns[w], self.downside[w]
+            moments.update(ret)
+            downside.update(min(ret, 0.0) if not math.isnan(ret) else NAN)
+
+            required = w if self.min_periods is None else self.min_periods
+            if moments.n < max(required, 1):
+                sharpe = sortino = volatility = NAN
+            else:
+                std, down_std = moments.std(), downside.std()
+                excess = moments.mean - excess_daily
+                volatility = std * math.sqrt(TRADING_DAYS)
+                sharpe = math.sqrt(TRADING_DAYS) * excess / std if std > 0 else NAN
+                sortino = math.sqrt(TRADING_DAYS) * excess / down_std if down_std > 0 else NAN
+            row[f'Rolling_Sharpe_{w}'] = sharpe
+            row[f'Rolling_Sortino_{w}'] = sortino
+            row[f'Rolling_Volatility_{w}'] = volatility
+
+        if price is None:
+            if not math.isnan(ret):
+                self.wealth *= 1 + ret
+            price = self.wealth
+        row['Drawdown'] = self.drawdown.update(price)
+        row['Max_Drawdown'] = self.drawdown.max_drawdown
+        return row
+
+    def update(self, df: pd.DataFrame, returns_col: str = 'Daily_Return',
+               price_col: Optional[str] = 'Close') -> pd.DataFrame:
+        """
+        Append new rows
+
+        Args:
+            df: Rows newer than anything already folded in
+            returns_col: Return column
+            price_col: Price column for drawdowns (None or missing: use the
+                compounded returns)
+        Returns:
+            DataFrame of risk values for the new rows
+        """
+        if len(df) and self.last_index is not None and not df.index[0] > self.last_index:
+            raise ValueError(f"New rows must start after {self.last_index}; got {df.index[0]}")
+
+        returns = df[returns_col].to_numpy(dtype=np.float64)
+        prices = (df[price_col].to_numpy(dtype=np.float64)
+                  if price_col is not None and price_col in df.columns else None)
+
+        columns = self.columns
+        values = np.empty((len(df), len(columns)))
+        for i in range(len(df)):
+            row = self.update_bar(returns[i], None if prices is None else prices[i])
+            values[i] = [row[col] for col in columns]
+
+        if len(df):
+            self.last_index = df.index[-1]
+        return pd.DataFrame(values, index=df.index, columns=columns)
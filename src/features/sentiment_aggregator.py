@@ -0,0 +1,291 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sentiment_classification import _daily_sentiment_frame, _day_ordinals
+
+SENTIMENT_FLAGS = ('is_positive', 'is_negative', 'is_neutral')
+
+# (ticker id, day) pairs are packed as ticker_id << 32 | (day + _DAY_OFFSET)
+_DAY_OFFSET = 1 << 31
+_DAY_MASK = (1 << 32) - 1
+
+Histogram = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _empty_histogram() -> Histogram:
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+
+
+def _entry_runs(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Indices covered by the half-open runs [starts[i], stops[i]), in order"""
+    lengths = stops - starts
+    return np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+
+
+def _compact_histogram(parts: List[Histogram]) -> Histogram:
+    """Sort (row, value, count) entries by row then value and sum duplicates"""
+    rows = np.concatenate([part[0] for part in parts])
+    values = np.concatenate([part[1] for part in parts])
+    counts = np.concatenate([part[2] for part in parts])
+    if not len(rows):
+        return _empty_histogram()
+
+    order = np.lexsort((values, rows))
+    rows, values, counts = rows[order], values[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (values[1:] != values[:-1])])
+    return rows[starts], values[starts], np.add.reduceat(counts, starts)
+
+
+class SentimentAggregator:
+    """
+    Incremental, mergeable form of aggregate_sentiment_by_ticker_and_date.
+
+    The state holds one row per (ticker, day) with the article count, the
+    sums behind the means and the positive/negative/neutral tallies, plus a
+    sparse histogram of vader_compound values (value -> count) from which
+    the median is read exactly. VADER rounds compound scores to four
+    decimals, so a ticker-day has at most a few thousand distinct values
+    and usually only a handful.
+
+    ``update`` folds a batch in amortized time proportional to the batch:
+    its rows are bincounted onto the ticker-days it touches and its
+    histogram entries are sorted into a new level. A level is merged into
+    the one before it once it reaches half that level's size, so there are
+    O(log n) levels and each entry is re-sorted O(log n) times. Touched
+    ticker-days are flagged dirty, and ``result`` recomputes only their
+    medians, from their own entries found by binary search in each level.
+    ``merge`` adds another aggregator's state, so partial states built by
+    workers on separate slices of the feed combine into the state of one
+    aggregator that saw everything: counts, tallies and medians are exact,
+    and the means agree up to the rounding of the summation order.
+    """
+
+    def __init__(self, date_col: str = 'clean_date', ticker_col: str = 'Ticker'):
+        """
+        Create an empty aggregator
+
+        Args:
+            date_col: Name of the date column of the batches (and the output)
+            ticker_col: Name of the ticker column of the batches (and the output)
+        """
+        self.date_col = date_col
+        self.ticker_col = ticker_col
+        self.tz: Optional[str] = None
+
+        self._tickers: List[Hashable] = []
+        self._ticker_ids: Dict[Hashable, int] = {}
+        self._rows: Dict[int, int] = {}
+        self._size = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        # vader_compound and textblob_polarity sums
+        self._sums = np.zeros((0, 2))
+        # vader count, textblob count, positive, negative, neutral
+        self._tallies = np.zeros((0, 5), dtype=np.int64)
+        # Histogram levels, each sorted by row then value, largest first
+        self._levels: List[Histogram] = []
+        self._median_cache = np.empty(0)
+        # Rows whose median changed since the last _medians call
+        self._dirty = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        """Number of (ticker, day) groups seen so far"""
+        return self._size
+
+    def _ticker_id(self, ticker: Hashable) -> int:
+        ticker_id = self._ticker_ids.get(ticker)
+        if ticker_id is None:
+            ticker_id = self._ticker_ids[ticker] = len(self._tickers)
+            self._tickers.append(ticker)
+        return ticker_id
+
+    def _grow(self, size: int) -> None:
+        """Make room for ``size`` rows, doubling the capacity"""
+        capacity = len(self._keys)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        keys = np.empty(capacity, dtype=np.int64)
+        sums = np.zeros((capacity, self._sums.shape[1]))
+        tallies = np.zeros((capacity, self._tallies.shape[1]), dtype=np.int64)
+        medians = np.full(capacity, np.nan)
+        dirty = np.zeros(capacity, dtype=bool)
+        keys[:self._size] = self._keys[:self._size]
+        sums[:self._size] = self._sums[:self._size]
+        tallies[:self._size] = self._tallies[:self._size]
+        medians[:self._size] = self._median_cache[:self._size]
+        dirty[:self._size] = self._dirty[:self._size]
+        self._keys, self._sums, self._tallies = keys, sums, tallies
+        self._median_cache, self._dirty = medians, dirty
+
+    def _rows_for(self, keys: np.ndarray) -> np.ndarray:
+        """Row of each of the distinct ``keys``, adding rows for unseen ones"""
+        rows = np.fromiter((self._rows.get(key, -1) for key in keys.tolist()),
+                           dtype=np.int64, count=len(keys))
+        new = np.flatnonzero(rows < 0)
+        if len(new):
+            start = self._size
+            self._grow(start + len(new))
+            rows[new] = np.arange(start, start + len(new))
+            self._keys[start:start + len(new)] = keys[new]
+            self._rows.update(zip(keys[new].tolist(), range(start, start + len(new))))
+            self._size += len(new)
+        return rows
+
+    def _check_tz(self, tz: Optional[str]) -> None:
+        if not self._size:
+            self.tz = tz
+        elif str(tz) != str(self.tz):
+            raise ValueError(f"Dates in time zone {tz} cannot be combined with dates in {self.tz}")
+
+    def _add_histogram(self, part: Histogram) -> None:
+        """Sort (row, value, count) entries into a new level, merging smaller levels"""
+        if not len(part[0]):
+            return
+        self._levels.append(_compact_histogram([part]))
+        while len(self._levels) > 1 and 2 * len(self._levels[-1][0]) >= len(self._levels[-2][0]):
+            last = self._levels.pop()
+            self._levels[-1] = _compact_histogram([self._levels[-1], last])
+
+    def update(self, df: pd.DataFrame) -> 'SentimentAggregator':
+        """
+        Fold a batch of classified headlines into the state
+
+        Args:
+            df: New rows from classify_sentiment with the date and ticker columns
+
+        Returns:
+            self, so calls can be chained
+        """
+        required_cols = ['vader_compound', 'textblob_polarity', *SENTIMENT_FLAGS,
+                         self.date_col, self.ticker_col]
+        if not all(col in df.columns for col in required_cols):
+            missing = [col for col in required_cols if col not in df.columns]
+            raise ValueError(f"DataFrame missing required columns: {missing}")
+
+        codes, uniques = pd.factorize(df[self.ticker_col])
+        days, usable, tz = _day_ordinals(df[self.date_col])
+        usable &= codes >= 0
+        if not usable.any():
+            return self
+        self._check_tz(tz)
+
+        ids = np.array([self._ticker_id(ticker) for ticker in uniques], dtype=np.int64)
+        keys = (ids[codes[usable]] << 32) | (days[usable] + _DAY_OFFSET)
+        distinct, group = np.unique(keys, return_inverse=True)
+        group = group.ravel()
+        rows = self._rows_for(distinct)
+        self._dirty[rows] = True
+
+        def column(name: str) -> np.ndarray:
+            return df[name].to_numpy(dtype=np.float64)[usable]
+
+        def group_sum(values: np.ndarray) -> np.ndarray:
+            return np.bincount(group, weights=values, minlength=len(distinct))
+
+        vader, textblob = column('vader_compound'), column('textblob_polarity')
+        vader_valid, textblob_valid = ~np.isnan(vader), ~np.isnan(textblob)
+        self._sums[rows] += np.column_stack([
+            group_sum(np.where(vader_valid, vader, 0.0)),
+            group_sum(np.where(textblob_valid, textblob, 0.0)),
+        ])
+        tallies = [group_sum(vader_valid), group_sum(textblob_valid)]
+        tallies += [group_sum(np.nan_to_num(column(flag))) for flag in SENTIMENT_FLAGS]
+        self._tallies[rows] += np.rint(np.column_stack(tallies)).astype(np.int64)
+
+        self._add_histogram((rows[group[vader_valid]], vader[vader_valid],
+                             np.ones(int(vader_valid.sum()), dtype=np.int64)))
+        return self
+
+    def merge(self, other: 'SentimentAggregator') -> 'SentimentAggregator':
+        """
+        Add another aggregator's state (e.g. one built by a worker process)
+
+        Args:
+            other: Aggregator over a different slice of the feed
+
+        Returns:
+            self, so calls can be chained
+        """
+        if not len(other):
+            return self
+        self._check_tz(other.tz)
+
+        ids = np.array([self._ticker_id(ticker) for ticker in other._tickers], dtype=np.int64)
+        keys = other._keys[:other._size]
+        rows = self._rows_for((ids[keys >> 32] << 32) | (keys & _DAY_MASK))
+        self._dirty[rows] = True
+        self._sums[rows] += other._sums[:other._size]
+        self._tallies[rows] += other._tallies[:other._size]
+
+        # Row ids change order under the mapping, so each level is re-sorted
+        for part in other._levels:
+            self._add_histogram((rows[part[0]], part[1], part[2]))
+        return self
+
+    def _medians(self) -> np.ndarray:
+        """
+        Exact vader_compound median of every row from the histogram.
+
+        Medians are cached; only rows flagged dirty since the previous call
+        are recomputed, from their own entries in each level.
+        """
+        dirty = np.flatnonzero(self._dirty[:self._size])
+        if not len(dirty):
+            return self._median_cache[:self._size]
+        self._dirty[dirty] = False
+
+        # Entries of the dirty rows, renumbered by position in ``dirty``
+        parts = []
+        for rows, values, counts in self._levels:
+            starts = np.searchsorted(rows, dirty, side='left')
+            stops = np.searchsorted(rows, dirty, side='right')
+            entries = _entry_runs(starts, stops)
+            parts.append((np.repeat(np.arange(len(dirty)), stops - starts),
+                          values[entries], counts[entries]))
+        _, values, counts = _compact_histogram(parts) if parts else _empty_histogram()
+
+        # Entries are sorted by row, so each dirty row owns a contiguous run
+        totals = self._tallies[dirty, 0]
+        starts = np.cumsum(totals) - totals
+        cumulative = np.cumsum(counts)
+        present = totals > 0
+        lower = np.searchsorted(cumulative, starts[present] + (totals[present] - 1) // 2, side='right')
+        upper = np.searchsorted(cumulative, starts[present] + totals[present] // 2, side='right')
+        medians = np.full(len(dirty), np.nan)
+        medians[present] = (values[lower] + values[upper]) / 2
+        self._median_cache[dirty] = medians
+        return self._median_cache[:self._size]
+
+    def result(self) -> pd.DataFrame:
+        """
+        Daily sentiment for everything folded in so far
+
+        Returns:
+            DataFrame with the columns of aggregate_sentiment_by_ticker_and_date,
+            sorted by ticker then date
+        """
+        keys = self._keys[:self._size]
+        ticker_ids = keys >> 32
+        days = (keys & _DAY_MASK) - _DAY_OFFSET
+
+        tickers = np.empty(len(self._tickers), dtype=object)
+        tickers[:] = self._tickers
+        rank = np.empty(len(tickers), dtype=np.int64)
+        rank[np.argsort(tickers, kind='stable')] = np.arange(len(tickers))
+        order = np.argsort((rank[ticker_ids] << 32) | (keys & _DAY_MASK), kind='stable')
+
+        sums, tallies = self._sums[order], self._tallies[order]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats = {
+                'vader_mean': sums[:, 0] / tallies[:, 0],
+                'vader_median': self._medians()[order],
+                'textblob_mean': sums[:, 1] / tallies[:, 1],
+                'total_articles': tallies[:, 0],
+                'positive_articles': tallies[:, 2],
+                'negative_articles': tallies[:, 3],
+                'neutral_articles': tallies[:, 4],
+            }
+        return _daily_sentiment_frame(tickers[ticker_ids[order]], days[order], self.tz, stats,
+                                      self.date_col, self.ticker_col)
@@ -0,0 +1,220 @@
+import hashlib
+import sqlite3
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .sentiment_classification import SENTIMENT_SCORE_COLUMNS
+
+
+class SentimentCache:
+    """
+    Persistent on-disk cache of per-headline sentiment scores.
+
+    Scores are stored in a single SQLite table keyed by a hash of the
+    normalized headline text plus the NLTK/TextBlob versions, so upgrading an
+    analyzer never serves stale scores. Entries remember when they were last
+    used, which drives least-recently-used eviction once ``max_entries`` is
+    exceeded. The entry count is read once when the cache is opened and then
+    kept up to date by this instance, so writes never rescan the table.
+    """
+
+    # SQLite caps the number of bound parameters per statement
+    _BATCH_SIZE = 500
+
+    def __init__(self, path: Union[str, Path] = 'sentiment_cache.sqlite',
+                 max_entries: Optional[int] = None):
+        """
+        Open (or create) a sentiment cache
+
+        Args:
+            path: SQLite database file
+            max_entries: Optional upper bound on stored headlines; least
+                recently used entries are evicted beyond it
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.analyzer_version = self._analyzer_version()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(str(self.path))
+        score_cols = ', '.join(f'{col} REAL NOT NULL' for col in SENTIMENT_SCORE_COLUMNS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS sentiment_scores ("
+            f"key BLOB PRIMARY KEY, {score_cols}, last_used INTEGER NOT NULL"
+            f") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sentiment_last_used "
+            "ON sentiment_scores (last_used)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM sentiment_scores").fetchone()[0]
+
+    @staticmethod
+    def _analyzer_version() -> str:
+        """Installed versions of the packages that produce the scores"""
+        versions = []
+        for package in ('nltk', 'textblob'):
+            try:
+                versions.append(f"{package}={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                versions.append(f"{package}=unknown")
+        return ';'.join(versions)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize a headline for hashing.
+
+        Only whitespace is collapsed: VADER reads capitalization and
+        punctuation as intensity cues, so those must stay part of the key.
+        """
+        return ' '.join(str(text).split())
+
+    def _key(self, text: str) -> bytes:
+        """Hash of the analyzer versions plus the normalized text"""
+        payload = f"{self.analyzer_version}\x00{self.normalize(text)}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get_many(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up cached scores
+
+        Args:
+            texts: Headlines to look up
+
+        Returns:
+            Tuple of (scores array shaped (n, len(SENTIMENT_SCORE_COLUMNS)),
+            boolean mask of which rows were found). Missing rows are NaN.
+        """
+        keys = [self._key(text) for text in texts]
+        scores = np.full((len(keys), len(SENTIMENT_SCORE_COLUMNS)), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+
+        positions: Dict[bytes, list] = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+
+        unique_keys = list(positions)
+        cols = ', '.join(SENTIMENT_SCORE_COLUMNS)
+        for start in range(0, len(unique_keys), self._BATCH_SIZE):
+            batch = unique_keys[start:start + self._BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, {cols} FROM sentiment_scores WHERE key IN ({placeholders})",
+                batch
+            ).fetchall()
+            for key, *values in rows:
+                idx = positions[key]
+                scores[idx] = values
+                found[idx] = True
+
+        hit_keys = [key for key in unique_keys if found[positions[key][0]]]
+        if hit_keys:
+            now = time.time_ns()
+            self._conn.executemany(
+                "UPDATE sentiment_scores SET last_used = ? WHERE key = ?",
+                [(now, key) for key in hit_keys]
+            )
+            self._conn.commit()
+
+        self.hits += int(found.sum())
+        self.misses += int((~found).sum())
+        return scores, found
+
+    def put_many(self, texts: Iterable[str], scores: np.ndarray) -> None:
+        """
+        Store scores for headlines and evict if the cache is over capacity
+
+        Args:
+            texts: Headlines that were scored
+            scores: Matching rows of scores, in SENTIMENT_SCORE_COLUMNS order
+        """
+        now = time.time_ns()
+        rows = [(self._key(text), *map(float, row), now) for text, row in zip(texts, scores)]
+        cols = ', '.join(SENTIMENT_SCORE_COLUMNS)
+        placeholders = ', '.join('?' * (len(SENTIMENT_SCORE_COLUMNS) + 2))
+
+        # Only rows that were not cached yet change the entry count
+        changes = self._conn.total_changes
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO sentiment_scores (key, {cols}, last_used) "
+            f"VALUES ({placeholders})",
+            rows
+        )
+        inserted = self._conn.total_changes - changes
+        self._entries += inserted
+        if inserted < len(rows):
+            # Some headlines were already cached: overwrite their scores
+            assignments = ', '.join(f'{col} = ?' for col in SENTIMENT_SCORE_COLUMNS)
+            self._conn.executemany(
+                f"UPDATE sentiment_scores SET {assignments}, last_used = ? WHERE key = ?",
+                [(*row[1:], row[0]) for row in rows]
+            )
+        self._conn.commit()
+
+        if self.max_entries is not None:
+            self.evict()
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """
+        Drop least recently used entries beyond the size bound
+
+        Args:
+            max_entries: Bound to enforce (defaults to the cache's max_entries)
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_entries if max_entries is None else max_entries
+        if limit is None:
+            return 0
+
+        excess = self._entries - limit
+        if excess <= 0:
+            return 0
+
+        removed = self._conn.execute(
+            "DELETE FROM sentiment_scores WHERE key IN ("
+            "SELECT key FROM sentiment_scores ORDER BY last_used LIMIT ?)",
+            (excess,)
+        ).rowcount
+        self._conn.commit()
+        self._entries -= removed
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss statistics for lookups made through this instance"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else float('nan'),
+            'entries': len(self),
+        }
+
+    def clear(self) -> None:
+        """Remove every cached score and reset the statistics"""
+        self._conn.execute("DELETE FROM sentiment_scores")
+        self._conn.commit()
+        self._entries = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def __enter__(self) -> 'SentimentCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
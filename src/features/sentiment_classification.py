@@ -1,40 +1,145 @@
+import os
 import pandas as pd
 import numpy as np
-from nltk.sentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    from .sentiment_cache import SentimentCache
 
 
 
-def classify_sentiment(df: pd.DataFrame, text_column: str = 'headline') -> pd.DataFrame:
+
+# Per-text score columns, in the order they are stored in the score matrix
+SENTIMENT_SCORE_COLUMNS = [
+    'vader_compound', 'vader_neg', 'vader_neu', 'vader_pos',
+    'textblob_polarity', 'textblob_subjectivity'
+]
+
+
+def _score_texts(texts, sia: Optional['SentimentIntensityAnalyzer'] = None) -> np.ndarray:
+    """
+    Score texts with VADER and TextBlob in a single pass per text.
+
+    NLTK and TextBlob are imported here rather than at module level, so the
+    aggregation helpers can be used without loading them.
+
+    Args:
+        texts: Sequence of strings to score
+        sia: Optional analyzer to reuse (one is created if omitted)
+
+    Returns:
+        float64 array of shape (len(texts), len(SENTIMENT_SCORE_COLUMNS))
+    """
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    from textblob import TextBlob
+
+    if sia is None:
+        sia = SentimentIntensityAnalyzer()
+
+    scores = np.empty((len(texts), len(SENTIMENT_SCORE_COLUMNS)), dtype=np.float64)
+    for i, text in enumerate(texts):
+        vader = sia.polarity_scores(text)
+        blob = TextBlob(text).sentiment
+        scores[i, 0] = vader['compound']
+        scores[i, 1] = vader['neg']
+        scores[i, 2] = vader['neu']
+        scores[i, 3] = vader['pos']
+        scores[i, 4] = blob.polarity
+        scores[i, 5] = blob.subjectivity
+    return scores
+
+
+# Analyzer owned by each pool worker, created once by _init_sentiment_worker
+_worker_sia: Optional['SentimentIntensityAnalyzer'] = None
+
+
+def _init_sentiment_worker() -> None:
+    """Process pool initializer: build the worker's VADER analyzer once"""
+    global _worker_sia
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    _worker_sia = SentimentIntensityAnalyzer()
+
+
+def _score_texts_in_worker(texts) -> np.ndarray:
+    """Score one shard of texts with the worker's analyzer"""
+    return _score_texts(texts, _worker_sia)
+
+
+def _score_texts_parallel(texts, workers: int) -> np.ndarray:
+    """
+    Shard texts across a process pool and score them.
+
+    Shards are contiguous and ``Executor.map`` yields them in submission
+    order, so the stacked result lines up with ``texts``. A few shards per
+    worker keep the cores busy when some shards hold longer headlines.
+    """
+    shard_size = max(1, -(-len(texts) // (workers * 4)))
+    shards = [list(texts[i:i + shard_size]) for i in range(0, len(texts), shard_size)]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_sentiment_worker) as executor:
+        results = list(executor.map(_score_texts_in_worker, shards))
+
+    if not results:
+        return np.empty((0, len(SENTIMENT_SCORE_COLUMNS)), dtype=np.float64)
+    return np.concatenate(results)
+
+
+def _score_unique_texts(texts, workers: Optional[int] = None) -> np.ndarray:
+    """Score texts in-process or across a process pool"""
+    if workers is not None and workers < 1:
+        workers = os.cpu_count() or 1
+
+    if workers is not None and workers > 1 and len(texts) > workers:
+        return _score_texts_parallel(texts, workers)
+    return _score_texts(texts)
+
+
+def classify_sentiment(df: pd.DataFrame, text_column: str = 'headline',
+                       workers: Optional[int] = None,
+                       cache: Optional['SentimentCache'] = None) -> pd.DataFrame:
     """
     Classify sentiment of text using both VADER and TextBlob.
 
+    Each unique text is scored exactly once and the scores are broadcast back
+    to every row that shares it.
+
     Args:
         df: DataFrame containing text data.
         text_column: Name of the column with text to analyze.
+        workers: Number of worker processes to score with. None or 1 scores
+            in-process; 0 or a negative value uses every CPU core.
+        cache: Optional SentimentCache; only headlines missing from it are
+            scored, and their scores are written back.
 
     Returns:
         DataFrame with added sentiment columns:
         - VADER: compound, neg, neu, pos, sentiment_class (positive/negative/neutral)
         - TextBlob: polarity, subjectivity
     """
-    # Initialize analyzers
-    sia = SentimentIntensityAnalyzer()
-
     # Make a copy to avoid modifying original
     result_df = df.copy()
 
+    # Factorize so duplicated headlines are only scored once
+    codes, uniques = pd.factorize(result_df[text_column].astype(str))
+    if cache is None:
+        unique_scores = _score_unique_texts(uniques, workers)
+    else:
+        unique_scores, found = cache.get_many(uniques)
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            new_texts = uniques[missing]
+            unique_scores[missing] = _score_unique_texts(new_texts, workers)
+            cache.put_many(new_texts, unique_scores[missing])
+    scores = unique_scores[codes]
+
     # --- VADER Sentiment ---
-    result_df['vader_scores'] = result_df[text_column].apply(
-        lambda x: sia.polarity_scores(str(x))
-    )
-    # Extract VADER scores to separate columns
-    result_df['vader_compound'] = result_df['vader_scores'].apply(lambda x: x['compound'])
-    result_df['vader_neg'] = result_df['vader_scores'].apply(lambda x: x['neg'])
-    result_df['vader_neu'] = result_df['vader_scores'].apply(lambda x: x['neu'])
-    result_df['vader_pos'] = result_df['vader_scores'].apply(lambda x: x['pos'])
+    result_df['vader_compound'] = scores[:, 0]
+    result_df['vader_neg'] = scores[:, 1]
+    result_df['vader_neu'] = scores[:, 2]
+    result_df['vader_pos'] = scores[:, 3]
 
     # Classify sentiment based on VADER compound score
     conditions = [
@@ -45,12 +150,8 @@ def classify_sentiment(df: pd.DataFrame, text_column: str = 'headline') -> pd.Da
     result_df['vader_sentiment'] = np.select(conditions, choices, default='neutral')
 
     # --- TextBlob Sentiment ---
-    result_df['textblob_polarity'] = result_df[text_column].apply(
-        lambda x: TextBlob(str(x)).sentiment.polarity
-    )
-    result_df['textblob_subjectivity'] = result_df[text_column].apply(
-        lambda x: TextBlob(str(x)).sentiment.subjectivity
-    )
+    result_df['textblob_polarity'] = scores[:, 4]
+    result_df['textblob_subjectivity'] = scores[:, 5]
 
     # Optional: Add binary flags
     result_df['is_positive'] = (result_df['vader_sentiment'] == 'positive').astype(int)
@@ -60,19 +161,121 @@ def classify_sentiment(df: pd.DataFrame, text_column: str = 'headline') -> pd.Da
     return result_df
 
 
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+
+# Smallest (tickers x days) grid always grouped with a dense bincount; wider
+# grids are only grouped densely while they stay within 2x the row count
+_DENSE_GROUP_LIMIT = 1 << 22
+
+
+def _ticker_codes(tickers: pd.Series) -> Tuple[np.ndarray, pd.Index, Optional[pd.CategoricalDtype]]:
+    """
+    Integer ticker codes whose order is the output order (-1 = missing).
+
+    A categorical column keeps its own categories; anything else is
+    factorized with sorted uniques so codes follow the ticker order.
+    """
+    if isinstance(tickers.dtype, pd.CategoricalDtype):
+        return tickers.cat.codes.to_numpy(dtype=np.int64), tickers.cat.categories, tickers.dtype
+    codes, uniques = pd.factorize(tickers, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques), None
+
+
+def _day_ordinals(dates: pd.Series) -> Tuple[np.ndarray, np.ndarray, Optional[str]]:
+    """Days since the epoch in the dates' own wall time, a validity mask and the time zone"""
+    stamps = pd.DatetimeIndex(dates if pd.api.types.is_datetime64_any_dtype(dates)
+                              else pd.to_datetime(dates, errors='coerce'))
+    tz = stamps.tz
+    if tz is not None:
+        stamps = stamps.tz_localize(None)
+    valid = ~stamps.isna()
+    days = stamps.to_numpy().astype('datetime64[D]').astype(np.int64)
+    return days, valid, tz
+
+
+def _group_ids(keys: np.ndarray, span: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dense group id per row and the sorted distinct keys.
+
+    Keys inside a small grid are ranked with a bincount over the grid, which
+    is O(n) and yields groups already in key order; wider grids sort.
+    """
+    if span <= max(_DENSE_GROUP_LIMIT, 2 * len(keys)):
+        present = np.bincount(keys, minlength=span) > 0
+        rank = np.cumsum(present) - 1
+        return rank[keys], np.flatnonzero(present)
+    uniques, inverse = np.unique(keys, return_inverse=True)
+    return inverse.ravel(), uniques
+
+
+def _daily_sentiment_frame(tickers, days: np.ndarray, tz: Optional[str], stats: dict,
+                           date_col: str, ticker_col: str) -> pd.DataFrame:
+    """
+    Assemble the daily sentiment frame from per-group statistics.
+
+    Args:
+        tickers: Ticker of each group
+        days: Day ordinal (days since the epoch) of each group
+        tz: Time zone of the output dates, if any
+        stats: vader_mean, vader_median, textblob_mean, total_articles and
+            the positive/negative/neutral article tallies per group
+        date_col: Name of the output date column
+        ticker_col: Name of the output ticker column
+
+    Returns:
+        DataFrame with the percentage columns and the temporal labels added;
+        the labels are computed once per distinct day
+    """
+    total = stats['total_articles']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for label in ('positive', 'negative', 'neutral'):
+            stats[f'{label}_pct'] = stats[f'{label}_articles'] / total * 100
+
+    first_day = int(days.min()) if len(days) else 0
+    offsets = days - first_day
+    present = np.bincount(offsets) > 0
+    distinct = np.flatnonzero(present)
+    lookup = np.zeros(len(present), dtype=np.int64)
+    lookup[distinct] = np.arange(len(distinct))
+    calendar = pd.DatetimeIndex((distinct + first_day).astype('datetime64[D]'))
+    at = lookup[offsets]
+
+    dates = pd.DatetimeIndex(days.astype('datetime64[D]').astype('datetime64[ns]'))
+    if tz is not None:
+        dates = dates.tz_localize(tz)
+
+    agg_df = pd.DataFrame({ticker_col: tickers, date_col: dates, **stats})
+    agg_df['day_of_week'] = pd.Categorical.from_codes(
+        calendar.dayofweek.to_numpy()[at], categories=DAY_NAMES, ordered=True)
+    agg_df['week_number'] = pd.array(calendar.isocalendar()['week'].to_numpy()[at], dtype='UInt32')
+    agg_df['month'] = pd.Categorical.from_codes(
+        calendar.month.to_numpy()[at] - 1, categories=MONTH_NAMES, ordered=True)
+    return agg_df
+
+
 def aggregate_sentiment_by_ticker_and_date(df: pd.DataFrame,
                                            date_col: str = 'clean_date',
                                            ticker_col: str = 'Ticker') -> pd.DataFrame:
     """
     Aggregate sentiment metrics by both ticker and date using classified sentiment data.
 
+    Rows are grouped on (ticker code, calendar day) packed into one int64
+    key, so timestamps within a day fall in the same group. Counts, sums and
+    means are bincounts over the group ids; only the median goes through a
+    pandas groupby, on the ids as categorical codes. The temporal labels are
+    computed once per distinct day and the groups come out sorted by ticker
+    and date.
+
     Args:
         df: DataFrame containing classified sentiment data (from classify_sentiment)
         date_col: Name of the cleaned date column
         ticker_col: Name of the ticker column
 
     Returns:
-        DataFrame with aggregated sentiment metrics per ticker per day
+        DataFrame with aggregated sentiment metrics per ticker per day, sorted
+        by ticker then date; day_of_week and month are categoricals
     """
     required_cols = ['vader_compound', 'vader_sentiment', 'textblob_polarity',
                      'is_positive', 'is_negative', 'is_neutral',
@@ -82,28 +285,61 @@ def aggregate_sentiment_by_ticker_and_date(df: pd.DataFrame,
         missing = [col for col in required_cols if col not in df.columns]
         raise ValueError(f"DataFrame missing required columns: {missing}")
 
-    # Group by both ticker and date
-    agg_df = df.groupby([ticker_col, date_col]).agg(
-        vader_mean=('vader_compound', 'mean'),
-        vader_median=('vader_compound', 'median'),
-        textblob_mean=('textblob_polarity', 'mean'),
-        total_articles=('vader_compound', 'count'),
-        positive_articles=('is_positive', 'sum'),
-        negative_articles=('is_negative', 'sum'),
-        neutral_articles=('is_neutral', 'sum')
-    ).reset_index()
-
-    # Calculate percentages
-    agg_df['positive_pct'] = agg_df['positive_articles'] / agg_df['total_articles'] * 100
-    agg_df['negative_pct'] = agg_df['negative_articles'] / agg_df['total_articles'] * 100
-    agg_df['neutral_pct'] = agg_df['neutral_articles'] / agg_df['total_articles'] * 100
-
-    # Add temporal features
-    agg_df['day_of_week'] = agg_df[date_col].dt.day_name()
-    agg_df['week_number'] = agg_df[date_col].dt.isocalendar().week
-    agg_df['month'] = agg_df[date_col].dt.month_name()
-
-    # Sort by ticker and date for better readability
-    agg_df = agg_df.sort_values([ticker_col, date_col])
-
-    return agg_df
\ No newline at end of file
+    codes, tickers, ticker_dtype = _ticker_codes(df[ticker_col])
+    days, usable, tz = _day_ordinals(df[date_col])
+    usable &= codes >= 0
+    rows = None if usable.all() else np.flatnonzero(usable)
+
+    def column(name: str) -> np.ndarray:
+        values = df[name].to_numpy(dtype=np.float64)
+        return values if rows is None else values[rows]
+
+    if rows is not None:
+        codes, days = codes[rows], days[rows]
+
+    # One int64 key per (ticker, day); its order is the output order
+    first_day = int(days.min()) if len(days) else 0
+    n_days = int(days.max()) - first_day + 1 if len(days) else 0
+    span = len(tickers) * n_days
+    group, keys = _group_ids(codes * n_days + (days - first_day), span)
+    n_groups = len(keys)
+
+    def group_count(valid: np.ndarray) -> np.ndarray:
+        return np.bincount(group, weights=valid, minlength=n_groups)
+
+    def group_sum(values: np.ndarray) -> np.ndarray:
+        missing = np.isnan(values)
+        if missing.any():
+            values = np.where(missing, 0.0, values)
+        return np.bincount(group, weights=values, minlength=n_groups)
+
+    vader = column('vader_compound')
+    textblob = column('textblob_polarity')
+    vader_valid = ~np.isnan(vader)
+    total = group_count(vader_valid)
+
+    # Group ids are dense, so as categorical codes every category is
+    # observed and pandas can use them without factorizing again
+    groups = pd.Categorical.from_codes(group, categories=pd.RangeIndex(n_groups))
+    vader_median = pd.Series(vader).groupby(groups, observed=False).median().to_numpy()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = {
+            'vader_mean': group_sum(vader) / total,
+            'vader_median': vader_median,
+            'textblob_mean': group_sum(textblob) / group_count(~np.isnan(textblob)),
+            'total_articles': total.astype(np.int64),
+        }
+        for flag, label in (('is_positive', 'positive'), ('is_negative', 'negative'),
+                            ('is_neutral', 'neutral')):
+            counts = group_sum(column(flag))
+            integer = not pd.api.types.is_float_dtype(df[flag].dtype)
+            result[f'{label}_articles'] = counts.astype(np.int64) if integer else counts
+
+    group_codes = keys // max(n_days, 1)
+    group_days = keys % max(n_days, 1) + first_day
+    if ticker_dtype is not None:
+        ticker_values = pd.Categorical.from_codes(group_codes, dtype=ticker_dtype)
+    else:
+        ticker_values = tickers.take(group_codes)
+    return _daily_sentiment_frame(ticker_values, group_days, tz, result, date_col, ticker_col)
@@ -1,8 +1,12 @@
 import talib
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
 import warnings
 
+from .indicator_registry import IndicatorPlan, IndicatorRequest, execute_plan, plan_indicators
+from .ta_incremental import IncrementalIndicators
+
 
 class TechnicalAnalyzer:
     """
@@ -30,6 +34,11 @@ class TechnicalAnalyzer:
         'ATR', 'NATR', 'TRANGE', 'BBANDS'
     ]
 
+    # Baseline moving averages added by calculate_all_indicators
+    MA_PERIODS = [5, 10, 20, 50, 100, 200]
+
+    OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
     def __init__(self):
         self.available_indicators = self._get_available_indicators()
 
@@ -146,26 +155,225 @@ class TechnicalAnalyzer:
         return df
 
     def calculate_selected_indicators(self, df: pd.DataFrame,
-                                      indicator_list: List[str]) -> pd.DataFrame:
+                                      indicator_list: List[IndicatorRequest]) -> pd.DataFrame:
         """
         Calculate only specified indicators
+
+        Requests are planned against the indicator registry, so only the
+        requested indicators are computed; on long histories DX, ADX and ADXR
+        are derived from the DIs instead of rerunning the DM/TR chain.
         Args:
             df: Input DataFrame with OHLCV data
-            indicator_list: List of indicator names to calculate
+            indicator_list: Indicator names ('RSI', 'MACD', 'SMA_50'), output
+                columns ('MACD_Signal') or (name, params) tuples such as
+                ('RSI', {'timeperiod': 21})
         Returns:
             DataFrame with selected indicators added
         """
-        indicator_groups = {
-            'trend': self.calculate_trend_indicators,
-            'momentum': self.calculate_momentum_indicators,
-            'volume': self.calculate_volume_indicators,
-            'volatility': self.calculate_volatility_indicators
-        }
+        plan = self.plan_indicators(indicator_list)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            arrays = execute_plan(plan, self._input_arrays(df))
+
+        for col, values in arrays.items():
+            df[col] = values
+        return df
+
+    def init_incremental(self, df: pd.DataFrame) -> IncrementalIndicators:
+        """
+        Build append-only indicator state from a price history
+
+        The history is replayed once (O(history)); afterwards each call to
+        update_incremental costs O(new bars). Covers the SMA/EMA baseline,
+        RSI, ATR, the DI/DX/ADX/ADXR chain, BBANDS, STOCH, OBV, TRIX and MACD.
+        Args:
+            df: DataFrame with OHLCV data, oldest bar first
+        Returns:
+            IncrementalIndicators state (picklable)
+        """
+        state = IncrementalIndicators(self.MA_PERIODS)
+        state.update(df)
+        return state
+
+    def update_incremental(self, state: IncrementalIndicators,
+                           new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append new daily bars to incremental state
+        Args:
+            state: State from init_incremental (updated in place)
+            new_bars: OHLCV rows after the last bar already in the state
+        Returns:
+            DataFrame of indicator values for the new bars
+        """
+        return state.update(new_bars)
+
+    def verify_incremental(self, df: pd.DataFrame, n_new: int = 1,
+                           rtol: float = 1e-8, atol: float = 1e-8) -> pd.DataFrame:
+        """
+        Check incremental updates against a full TA-Lib recompute
+
+        State is built from all but the last ``n_new`` bars, the remaining bars
+        are appended incrementally, and every value produced along the way is
+        compared with calculate_selected_indicators on the full history.
+        Args:
+            df: DataFrame with OHLCV data
+            n_new: Number of trailing bars to append incrementally
+            rtol, atol: Tolerances passed to numpy.isclose
+        Returns:
+            DataFrame indexed by indicator with max_abs_diff and matches columns
+        """
+        history, new_bars = df.iloc[:len(df) - n_new], df.iloc[len(df) - n_new:]
+        state = IncrementalIndicators(self.MA_PERIODS)
+        incremental = pd.concat([state.update(history),
+                                 self.update_incremental(state, new_bars)])
+
+        # Recompute over the full history with TA-Lib
+        full = self.calculate_selected_indicators(df[self.OHLCV_COLUMNS].copy(), state.columns)
+
+        report = {}
+        for col in state.columns:
+            expected = full[col].to_numpy()
+            actual = incremental[col].to_numpy()
+            close = np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+            diff = np.abs(actual - expected)
+            report[col] = {
+                'max_abs_diff': float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0,
+                'matches': bool(close.all()),
+            }
+        return pd.DataFrame.from_dict(report, orient='index')
+
+    def plan_indicators(self, indicator_list: List[IndicatorRequest]) -> IndicatorPlan:
+        """
+        Build the computation plan for a list of indicator requests
+        Returns:
+            IndicatorPlan; its talib_calls property gives the TA-Lib call count
+        """
+        return plan_indicators(indicator_list)
+
+    def _input_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Contiguous float64 arrays for the OHLCV columns present in df"""
+        return {col.lower(): np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+                for col in self.OHLCV_COLUMNS if col in df.columns}
+
+    def _full_plan(self) -> IndicatorPlan:
+        """Plan reproducing the calculate_all_indicators column set and order"""
+        if not hasattr(self, '_all_indicators_plan'):
+            requests = [
+                'ADX', 'ADXR', 'DX', 'MINUS_DI', 'PLUS_DI', 'MINUS_DM', 'PLUS_DM',
+                'AROON', 'AROONOSC', 'TRIX',
+                'MACD', 'MACDEXT', 'MACDFIX', 'APO', 'PPO', 'RSI', 'CCI', 'CMO',
+                'ULTOSC', 'WILLR', 'ROC', 'ROCP', 'ROCR', 'ROCR100', 'MOM',
+                'STOCH', 'STOCHF', 'STOCHRSI',
+                'OBV', 'MFI', 'BOP',
+                'ATR', 'NATR', 'TRANGE', 'BBANDS',
+            ] + [f'{ma}_{period}' for period in self.MA_PERIODS for ma in ('SMA', 'EMA')]
+            self._all_indicators_plan = plan_indicators(requests)
+        return self._all_indicators_plan
+
+    def _indicator_arrays(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                          close: np.ndarray, volume: np.ndarray,
+                          plan: Optional[IndicatorPlan] = None) -> Dict[str, np.ndarray]:
+        """
+        Compute an indicator plan (default: the calculate_all_indicators set)
+        on float64 arrays
+        Returns:
+            Dictionary of {column name: array}, in plan order
+        """
+        inputs = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+        return execute_plan(plan or self._full_plan(), inputs)
+
+    def _ohlcv_arrays(self, frame: pd.DataFrame) -> List[np.ndarray]:
+        """Contiguous float64 OHLCV arrays, as TA-Lib expects"""
+        return [np.ascontiguousarray(frame[col].to_numpy(dtype=np.float64))
+                for col in self.OHLCV_COLUMNS]
+
+    def calculate_panel_indicators(self, panel: pd.DataFrame, layout: str = 'long',
+                                   ticker_col: str = 'Ticker',
+                                   date_col: Optional[str] = None,
+                                   indicator_list: Optional[List[IndicatorRequest]] = None) -> pd.DataFrame:
+        """
+        Calculate indicators for every ticker in a multi-ticker panel
+        Args:
+            panel: OHLCV panel. 'long' has one row per (ticker, date) with a
+                ticker column; 'wide' has (field, ticker) MultiIndex columns
+                such as ('Close', 'AAPL') and one row per date
+            layout: 'long' or 'wide'
+            ticker_col: Ticker column of a long panel
+            date_col: Date column of a long panel (defaults to the index)
+            indicator_list: Indicators to compute, as for
+                calculate_selected_indicators (default: the full
+                calculate_all_indicators set)
+        Returns:
+            Long layout: the panel sorted by ticker and date with indicator
+            columns added. Wide layout: a frame of (indicator, ticker) columns
+            on the panel's index.
+        """
+        plan = self._full_plan() if indicator_list is None else plan_indicators(indicator_list)
+        if layout == 'long':
+            return self._calculate_long_panel(panel, ticker_col, date_col, plan)
+        if layout == 'wide':
+            return self._calculate_wide_panel(panel, plan)
+        raise ValueError(f"Unsupported layout '{layout}'; use 'long' or 'wide'")
+
+    def _calculate_long_panel(self, panel: pd.DataFrame, ticker_col: str,
+                              date_col: Optional[str], plan: IndicatorPlan) -> pd.DataFrame:
+        """Long panel: sort once, then fill one preallocated block by group offsets"""
+        if ticker_col not in panel.columns:
+            raise ValueError(f"Ticker column '{ticker_col}' not found in panel")
+
+        dates = panel.index if date_col is None else panel[date_col]
+        codes, _ = pd.factorize(panel[ticker_col], sort=True)
+        order = np.lexsort((np.asarray(dates), codes))
+        panel = panel.take(order)
+        codes = codes[order]
+
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]))
+        ohlcv = self._ohlcv_arrays(panel)
+
+        block = None
+        names = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                arrays = self._indicator_arrays(*(values[start:stop] for values in ohlcv), plan=plan)
+                if block is None:
+                    names = list(arrays)
+                    block = np.full((len(panel), len(names)), np.nan)
+                for k, name in enumerate(names):
+                    block[start:stop, k] = arrays[name]
+
+        if block is None:
+            return panel
+
+        indicators = pd.DataFrame(block, columns=names, index=panel.index)
+        return pd.concat([panel.drop(columns=[c for c in names if c in panel.columns]),
+                          indicators], axis=1)
+
+    def _calculate_wide_panel(self, panel: pd.DataFrame, plan: IndicatorPlan) -> pd.DataFrame:
+        """Wide panel: one (dates x tickers) block per indicator, one frame at the end"""
+        if not isinstance(panel.columns, pd.MultiIndex):
+            raise ValueError("Wide panel needs (field, ticker) MultiIndex columns")
+
+        tickers = panel['Close'].columns
+        block = None
+        names = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for j, ticker in enumerate(tickers):
+                frame = panel.xs(ticker, axis=1, level=1)[self.OHLCV_COLUMNS]
+                # Dates before listing/after delisting are NaN in a wide panel;
+                # compute on the ticker's own bars so gaps don't poison TA-Lib
+                rows = np.flatnonzero(frame['Close'].notna().to_numpy())
+                arrays = self._indicator_arrays(*(values[rows] for values in self._ohlcv_arrays(frame)),
+                                                plan=plan)
+                if block is None:
+                    names = list(arrays)
+                    block = np.full((len(panel), len(names), len(tickers)), np.nan)
+                for k, name in enumerate(names):
+                    block[rows, k, j] = arrays[name]
 
-        # Calculate all indicators in each group that has at least one requested indicator
-        for group_name, group_function in indicator_groups.items():
-            group_indicators = getattr(self, f"{group_name.upper()}_INDICATORS")
-            if any(indicator in indicator_list for indicator in group_indicators):
-                df = group_function(df)
+        if block is None:
+            return pd.DataFrame(index=panel.index)
 
-        return df
\ No newline at end of file
+        columns = pd.MultiIndex.from_product([names, tickers], names=['Indicator', 'Ticker'])
+        return pd.DataFrame(block.reshape(len(panel), -1), index=panel.index, columns=columns)
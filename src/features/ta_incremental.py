@@ -0,0 +1,381 @@
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    """TA-Lib's TA_IS_ZERO tolerance"""
+    return -1e-8 < value < 1e-8
+
+
+class _SMA:
+    """
+    Rolling simple moving average over a fixed window.
+
+    The running total is re-summed from the window once per ``period``
+    updates (amortized O(1)) so rounding drift cannot build up over years of
+    appends.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        self.total += x
+        self.count += 1
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        if self.count % self.period == 0:
+            self.total = math.fsum(self.window)
+        if len(self.window) < self.period:
+            return NAN
+        return self.total / self.period
+
+
+class _EMA:
+    """TA-Lib EMA: seeded with the SMA of the first ``period`` values"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.seed_total = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count < self.period:
+            self.seed_total += x
+            return NAN
+        if self.count == self.period:
+            self.value = (self.seed_total + x) / self.period
+        else:
+            self.value = (x - self.value) * self.k + self.value
+        return self.value
+
+
+class _WilderAverage:
+    """Wilder smoothing seeded with the mean of the first ``period`` values (ATR, ADX)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.value = 0.0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count <= self.period:
+            self.value += x
+            if self.count < self.period:
+                return NAN
+            self.value /= self.period
+            return self.value
+        self.value = (self.value * (self.period - 1) + x) / self.period
+        return self.value
+
+
+class _RSI:
+    """Wilder RSI keeping the smoothed average gain and loss"""
+
+    def __init__(self, period: int = 14):
+        self.gain = _WilderAverage(period)
+        self.loss = _WilderAverage(period)
+        self.prev_close = NAN
+
+    def update(self, close: float) -> float:
+        prev, self.prev_close = self.prev_close, close
+        if math.isnan(prev):
+            return NAN
+        diff = close - prev
+        gain = self.gain.update(diff if diff > 0 else 0.0)
+        loss = self.loss.update(-diff if diff < 0 else 0.0)
+        if math.isnan(gain):
+            return NAN
+        total = gain + loss
+        return 0.0 if _is_zero(total) else 100.0 * gain / total
+
+
+class _DirectionalMovement:
+    """
+    ATR plus the DM/DI -> DX -> ADX -> ADXR chain, sharing one true range.
+
+    +DM, -DM and TR use Wilder running sums seeded over ``period - 1`` bars,
+    DI starts one bar later, ADX is the Wilder average of DX and ADXR averages
+    ADX with its value ``period - 1`` bars earlier.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.bars = 0
+        self.sum_plus_dm = 0.0
+        self.sum_minus_dm = 0.0
+        self.sum_tr = 0.0
+        self.atr = _WilderAverage(period)
+        self.adx = _WilderAverage(period)
+        self.adx_history = deque(maxlen=period)
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        out = dict.fromkeys(('ATR', 'PLUS_DI', 'MINUS_DI', 'DX', 'ADX', 'ADXR'), NAN)
+        prev, self.prev = self.prev, (high, low, close)
+        self.bars += 1
+        if prev is None:
+            return out
+
+        prev_high, prev_low, prev_close = prev
+        true_range = max(high, prev_close) - min(low, prev_close)
+        diff_plus, diff_minus = high - prev_high, prev_low - low
+        plus_dm = diff_plus if diff_plus > 0 and diff_plus > diff_minus else 0.0
+        minus_dm = diff_minus if diff_minus > 0 and diff_minus > diff_plus else 0.0
+
+        out['ATR'] = self.atr.update(true_range)
+
+        n = self.period
+        # Seed the sums with the first n - 1 one-bar values (bars 2..n)
+        if self.bars <= n:
+            self.sum_plus_dm += plus_dm
+            self.sum_minus_dm += minus_dm
+            self.sum_tr += true_range
+            return out
+
+        self.sum_plus_dm += plus_dm - self.sum_plus_dm / n
+        self.sum_minus_dm += minus_dm - self.sum_minus_dm / n
+        self.sum_tr += true_range - self.sum_tr / n
+        if _is_zero(self.sum_tr):
+            plus_di = minus_di = 0.0
+        else:
+            plus_di = 100.0 * self.sum_plus_dm / self.sum_tr
+            minus_di = 100.0 * self.sum_minus_dm / self.sum_tr
+        di_total = plus_di + minus_di
+        dx = 0.0 if _is_zero(di_total) else 100.0 * abs(plus_di - minus_di) / di_total
+
+        out['PLUS_DI'], out['MINUS_DI'], out['DX'] = plus_di, minus_di, dx
+        adx = self.adx.update(dx)
+        out['ADX'] = adx
+        if not math.isnan(adx):
+            self.adx_history.append(adx)
+            if len(self.adx_history) == n:
+                out['ADXR'] = (adx + self.adx_history[0]) / 2.0
+        return out
+
+
+class _BBands:
+    """
+    Bollinger Bands from a rolling sum and sum of squares (population stdev),
+    re-summed once per ``period`` updates like _SMA
+    """
+
+    def __init__(self, period: int = 20, nbdev: float = 2.0):
+        self.period = period
+        self.nbdev = nbdev
+        self.window = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> Dict[str, float]:
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+        self.count += 1
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+        if self.count % self.period == 0:
+            self.total = math.fsum(self.window)
+            self.total_sq = math.fsum(v * v for v in self.window)
+        if len(self.window) < self.period:
+            return {'BB_UPPER': NAN, 'BB_MIDDLE': NAN, 'BB_LOWER': NAN}
+
+        mean = self.total / self.period
+        variance = self.total_sq / self.period - mean * mean
+        width = self.nbdev * math.sqrt(variance) if variance > 0 else 0.0
+        return {'BB_UPPER': mean + width, 'BB_MIDDLE': mean, 'BB_LOWER': mean - width}
+
+
+class _Stochastic:
+    """Slow stochastic: fast %K over a rolling high/low window, then two SMAs"""
+
+    def __init__(self, fastk_period: int = 5, slowk_period: int = 3, slowd_period: int = 3):
+        self.highs = deque(maxlen=fastk_period)
+        self.lows = deque(maxlen=fastk_period)
+        self.slowk = _SMA(slowk_period)
+        self.slowd = _SMA(slowd_period)
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        self.highs.append(high)
+        self.lows.append(low)
+        out = {'STOCH_K': NAN, 'STOCH_D': NAN}
+        if len(self.highs) < self.highs.maxlen:
+            return out
+
+        highest, lowest = max(self.highs), min(self.lows)
+        diff = highest - lowest
+        fastk = (close - lowest) / diff * 100.0 if diff != 0 else 0.0
+        slowk = self.slowk.update(fastk)
+        if math.isnan(slowk):
+            return out
+        slowd = self.slowd.update(slowk)
+        # TA-Lib only starts both lines once %D is available
+        if not math.isnan(slowd):
+            out['STOCH_K'], out['STOCH_D'] = slowk, slowd
+        return out
+
+
+class _OBV:
+    """Running on-balance volume"""
+
+    def __init__(self):
+        self.value = NAN
+        self.prev_close = NAN
+
+    def update(self, close: float, volume: float) -> float:
+        if math.isnan(self.value):
+            self.value = volume
+        elif close > self.prev_close:
+            self.value += volume
+        elif close < self.prev_close:
+            self.value -= volume
+        self.prev_close = close
+        return self.value
+
+
+class _TRIX:
+    """One-bar rate of change of a triple EMA"""
+
+    def __init__(self, period: int = 30):
+        self.emas = [_EMA(period) for _ in range(3)]
+        self.prev = NAN
+
+    def update(self, close: float) -> float:
+        value = close
+        for ema in self.emas:
+            value = ema.update(value)
+            if math.isnan(value):
+                return NAN
+        prev, self.prev = self.prev, value
+        if math.isnan(prev):
+            return NAN
+        return (value - prev) / prev * 100.0
+
+
+class _MACD:
+    """
+    TA-Lib MACD: both EMAs are seeded on the bar where the slow EMA starts,
+    the fast one with the mean of the last ``fastperiod`` closes.
+    """
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        self.fast_k = 2.0 / (fastperiod + 1)
+        self.slow_k = 2.0 / (slowperiod + 1)
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self.seed_closes: Optional[deque] = deque(maxlen=slowperiod)
+        self.fast = NAN
+        self.slow = NAN
+        self.signal = _EMA(signalperiod)
+
+    def update(self, close: float) -> Dict[str, float]:
+        out = {'MACD': NAN, 'MACD_Signal': NAN, 'MACD_Hist': NAN}
+        if self.seed_closes is not None:
+            self.seed_closes.append(close)
+            if len(self.seed_closes) < self.slowperiod:
+                return out
+            closes = list(self.seed_closes)
+            self.slow = sum(closes) / self.slowperiod
+            self.fast = sum(closes[-self.fastperiod:]) / self.fastperiod
+            self.seed_closes = None
+        else:
+            self.fast = (close - self.fast) * self.fast_k + self.fast
+            self.slow = (close - self.slow) * self.slow_k + self.slow
+
+        line = self.fast - self.slow
+        signal = self.signal.update(line)
+        if not math.isnan(signal):
+            out['MACD'], out['MACD_Signal'], out['MACD_Hist'] = line, signal, line - signal
+        return out
+
+
+class IncrementalIndicators:
+    """
+    Append-only indicator state for one ticker.
+
+    Keeps per-indicator state (EMA seeds, Wilder accumulators for RSI/ATR/ADX,
+    rolling windows for SMA/BBANDS/STOCH, running OBV) so appending N bars
+    costs O(N) regardless of the history length. The state is plain Python
+    and can be pickled between daily runs.
+    """
+
+    def __init__(self, ma_periods: Sequence[int] = (5, 10, 20, 50, 100, 200)):
+        self.ma_periods = list(ma_periods)
+        self.sma = {p: _SMA(p) for p in self.ma_periods}
+        self.ema = {p: _EMA(p) for p in self.ma_periods}
+        self.rsi = _RSI(14)
+        self.dm = _DirectionalMovement(14)
+        self.bbands = _BBands(20, 2.0)
+        self.stoch = _Stochastic(5, 3, 3)
+        self.obv = _OBV()
+        self.trix = _TRIX(30)
+        self.macd = _MACD(12, 26, 9)
+        self.last_index = None
+        self.bars = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """Indicator columns produced for each bar"""
+        return (['ADX', 'ADXR', 'DX', 'MINUS_DI', 'PLUS_DI', 'TRIX',
+                 'MACD', 'MACD_Signal', 'MACD_Hist', 'RSI', 'STOCH_K', 'STOCH_D',
+                 'OBV', 'ATR', 'BB_UPPER', 'BB_MIDDLE', 'BB_LOWER'] +
+                [f'{ma}_{p}' for p in self.ma_periods for ma in ('SMA', 'EMA')])
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Fold one bar into the state and return its indicator values"""
+        row = self.dm.update(high, low, close)
+        row['TRIX'] = self.trix.update(close)
+        row.update(self.macd.update(close))
+        row['RSI'] = self.rsi.update(close)
+        row.update(self.stoch.update(high, low, close))
+        row['OBV'] = self.obv.update(close, volume)
+        row.update(self.bbands.update(close))
+        for p in self.ma_periods:
+            row[f'SMA_{p}'] = self.sma[p].update(close)
+            row[f'EMA_{p}'] = self.ema[p].update(close)
+        self.bars += 1
+        return row
+
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append new bars
+
+        Args:
+            bars: OHLCV rows newer than anything already folded in
+        Returns:
+            DataFrame of indicator values for the new bars
+        """
+        if len(bars) and self.last_index is not None and not bars.index[0] > self.last_index:
+            raise ValueError(f"New bars must start after {self.last_index}; got {bars.index[0]}")
+
+        highs = bars['High'].to_numpy(dtype=np.float64)
+        lows = bars['Low'].to_numpy(dtype=np.float64)
+        closes = bars['Close'].to_numpy(dtype=np.float64)
+        volumes = bars['Volume'].to_numpy(dtype=np.float64)
+
+        columns = self.columns
+        values = np.empty((len(bars), len(columns)))
+        for i in range(len(bars)):
+            row = self.update_bar(highs[i], lows[i], closes[i], volumes[i])
+            values[i] = [row[col] for col in columns]
+
+        if len(bars):
+            self.last_index = bars.index[-1]
+        return pd.DataFrame(values, index=bars.index, columns=columns)
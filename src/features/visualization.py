@@ -1,20 +1,207 @@
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from typing import Dict, List, Optional
-import seaborn as sns
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Dashboard width in inches, and the axes margins used in batch mode
+FIGURE_WIDTH = 14
+_BATCH_LEFT, _BATCH_RIGHT = 0.06, 0.98
+
+
+@lru_cache(maxsize=None)
+def _dashboard_style() -> List:
+    """
+    Style sheet plus the husl color cycle applied to every figure.
+
+    Resolved on the first figure, so importing this module (or building a
+    TechnicalVisualizer) loads neither matplotlib nor seaborn.
+    """
+    import seaborn as sns
+    from cycler import cycler
+    return ['seaborn-v0_8', {'axes.prop_cycle': cycler(color=sns.color_palette('husl'))}]
+
+
+@contextmanager
+def _dashboard_style_context():
+    """Dashboard style for the figures built inside, leaving global rcParams untouched"""
+    import matplotlib.style
+    with matplotlib.style.context(_dashboard_style()):
+        yield
+
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    """Float x coordinates of an index (matplotlib date numbers for datetimes)"""
+    if isinstance(index, pd.DatetimeIndex):
+        import matplotlib.dates as mdates
+        return mdates.date2num(index.tz_localize(None) if index.tz is not None else index)
+    return np.asarray(index, dtype=np.float64)
+
+
+def _bucket_edges(n: int, buckets: int, first: int = 0) -> np.ndarray:
+    """Edges splitting [first, n) into ``buckets`` non-empty contiguous buckets"""
+    return np.linspace(first, n, buckets + 1).astype(np.int64)
+
+
+def _first_max_per_bucket(scores: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Position of the first highest score in every bucket"""
+    starts = edges[:-1]
+    best = np.maximum.reduceat(scores, starts)
+    bucket = np.repeat(np.arange(len(starts)), np.diff(edges))
+    candidates = np.flatnonzero(scores == best[bucket])
+    first = np.r_[True, bucket[candidates[1:]] != bucket[candidates[:-1]]]
+    return candidates[first]
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of at most ``n_out`` points that keep the visual shape of (x, y).
+
+    Largest-Triangle-Three-Buckets style: the end points are kept and the
+    rest are split into ``n_out - 2`` buckets, each contributing the point
+    that forms the largest triangle with its neighbours. Classic LTTB
+    anchors the triangle on the point picked in the previous bucket, which
+    is sequential; here both anchors are the neighbouring bucket means, so
+    all buckets are resolved in one vectorized pass.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = _bucket_edges(n - 1, n_out - 2, first=1)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+
+    left_x, left_y = np.r_[x[0], mean_x[:-1]], np.r_[y[0], mean_y[:-1]]
+    right_x, right_y = np.r_[mean_x[1:], x[-1]], np.r_[mean_y[1:], y[-1]]
+    bucket = np.repeat(np.arange(len(sizes)), sizes)
+    xs, ys = x[1:n - 1], y[1:n - 1]
+    area = np.abs((left_x[bucket] - right_x[bucket]) * (ys - left_y[bucket])
+                  - (left_x[bucket] - xs) * (right_y[bucket] - left_y[bucket]))
+
+    picked = _first_max_per_bucket(area, edges - 1) + 1
+    return np.r_[0, picked, n - 1]
+
+
+def _peak_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """Index of the largest absolute value in each of ``n_out`` buckets, so spikes survive"""
+    if len(values) <= n_out:
+        return np.arange(len(values))
+    return _first_max_per_bucket(np.abs(values), _bucket_edges(len(values), n_out))
+
 
 class TechnicalVisualizer:
     """Enhanced visualization for all technical indicators"""
 
-    def __init__(self):
-        plt.style.use('seaborn-v0_8')  # or try 'seaborn-darkgrid', etc.
-        sns.set_palette("husl")
+    def __init__(self, batch: bool = False, dpi: int = 100):
+        """
+        Args:
+            batch: Headless batch rendering. Figures are built on the Agg
+                canvas without pyplot, so nothing is kept in pyplot's figure
+                registry. Lines are downsampled to the axes' pixel width,
+                MACD_Hist and Volume bars are drawn as one collection each,
+                and a fixed layout replaces tight_layout.
+            dpi: Resolution of batch figures; sets the downsampling target
+                and the resolution of save_indicators
+        """
+        self.batch = batch
+        self.dpi = dpi
+        # Points per series worth drawing: one per pixel column of the axes
+        self.max_points = int(FIGURE_WIDTH * dpi * (_BATCH_RIGHT - _BATCH_LEFT))
+
+    def _subplots(self, rows: int, figsize: Tuple[float, float], sharex: bool = False):
+        """Figure and a flat array of axes, from pyplot or (batch mode) the Agg canvas"""
+        if self.batch:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=figsize, dpi=self.dpi)
+            FigureCanvasAgg(fig)
+        else:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=figsize)
+        return fig, fig.subplots(rows, 1, sharex=sharex, squeeze=False)[:, 0]
+
+    def _line(self, ax, x: pd.Index, y, **kwargs):
+        """ax.plot, downsampled to the pixel width in batch mode"""
+        if self.batch and len(x) > self.max_points:
+            y = np.asarray(y, dtype=np.float64)
+            finite = np.flatnonzero(np.isfinite(y))
+            keep = finite[_lttb_indices(_x_values(x)[finite], y[finite], self.max_points)]
+            x, y = x[keep], y[keep]
+        return ax.plot(x, y, **kwargs)
+
+    def _band(self, ax, x: pd.Index, lower, upper, **kwargs):
+        """ax.fill_between, thinned to the pixel width in batch mode"""
+        if self.batch and len(x) > self.max_points:
+            keep = np.unique(np.r_[np.arange(0, len(x), -(-len(x) // self.max_points)), len(x) - 1])
+            x, lower, upper = x[keep], np.asarray(lower)[keep], np.asarray(upper)[keep]
+        return ax.fill_between(x, lower, upper, **kwargs)
+
+    def _bars(self, ax, x: pd.Index, heights, **kwargs):
+        """
+        ax.bar, or in batch mode a single PolyCollection of rectangles.
+
+        ax.bar creates one Rectangle artist per bar; a collection is one
+        artist whatever the bar count. Bars beyond the pixel width are
+        reduced to the tallest bar of each bucket.
+        """
+        if not self.batch:
+            return ax.bar(x, heights, **kwargs)
+
+        from matplotlib.collections import PolyCollection
+        heights = np.nan_to_num(np.asarray(heights, dtype=np.float64))
+        positions = _x_values(x)
+        if not len(positions):
+            return None
+        keep = _peak_indices(heights, self.max_points)
+        span = (positions[-1] - positions[0]) / max(len(keep) - 1, 1) if len(keep) > 1 else 1.0
+        half = 0.4 * span
+        left, right, top = positions[keep] - half, positions[keep] + half, heights[keep]
+        bottom = np.zeros_like(top)
+        verts = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                          np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+
+        bars = PolyCollection(verts, linewidths=0, **kwargs)
+        ax.add_collection(bars)
+        if isinstance(x, pd.DatetimeIndex):
+            ax.xaxis_date()
+        ax.autoscale_view()
+        return bars
+
+    def _legend(self, ax, **kwargs):
+        """
+        ax.legend; batch mode pins it to the upper left, because loc='best'
+        tests every candidate position against every plotted vertex
+        """
+        if self.batch:
+            kwargs.setdefault('loc', 'upper left')
+        return ax.legend(**kwargs)
+
+    def _finish(self, fig: 'Figure', rows: int) -> None:
+        """Lay the dashboard out: tight_layout interactively, fixed margins in batch mode"""
+        if self.batch:
+            height = 4 * rows
+            fig.subplots_adjust(left=_BATCH_LEFT, right=_BATCH_RIGHT, bottom=0.5 / height,
+                                top=1 - 0.6 / height, hspace=0.12)
+        else:
+            fig.tight_layout()
+
+    @staticmethod
+    def close(fig: 'Figure') -> None:
+        """Release a figure from either mode (pyplot figures are closed too)"""
+        import sys
+        pyplot = sys.modules.get('matplotlib.pyplot')
+        if pyplot is not None:
+            pyplot.close(fig)
+        fig.clear()
 
     def plot_indicators(self, df: pd.DataFrame, ticker: str,
-                        indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility']) -> plt.Figure:
+                        indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility']) -> 'Figure':
         """
         Create comprehensive technical analysis dashboard
         Args:
@@ -24,38 +211,60 @@ class TechnicalVisualizer:
         Returns:
             matplotlib Figure object
         """
-        num_plots = len(indicator_groups) + 1  # +1 for price chart
-        fig, axes = plt.subplots(num_plots, 1, figsize=(14, 4 * num_plots), sharex=True)
-        fig.suptitle(f'Technical Analysis Dashboard - {ticker}', y=1.02)
+        with _dashboard_style_context():
+            num_plots = len(indicator_groups) + 1  # +1 for price chart
+            fig, axes = self._subplots(num_plots, (FIGURE_WIDTH, 4 * num_plots), sharex=True)
+            fig.suptitle(f'Technical Analysis Dashboard - {ticker}',
+                         y=1 - 0.15 / (4 * num_plots) if self.batch else 1.02)
 
-        if num_plots == 1:
-            axes = [axes]  # Ensure axes is always a list
+            # Price and Volume (always shown)
+            ax = axes[0]
+            self._line(ax, df.index, df['Close'], label='Close', color='black', linewidth=2)
 
-        # Price and Volume (always shown)
-        ax = axes[0]
-        ax.plot(df.index, df['Close'], label='Close', color='black', linewidth=2)
+            # Plot moving averages
+            for ma in [col for col in df.columns if 'SMA_' in col or 'EMA_' in col]:
+                self._line(ax, df.index, df[ma], label=ma, alpha=0.7)
 
-        # Plot moving averages
-        for ma in [col for col in df.columns if 'SMA_' in col or 'EMA_' in col]:
-            ax.plot(df.index, df[ma], label=ma, alpha=0.7)
+            ax.set_ylabel('Price')
+            ax.legend(loc='upper left')
+            ax.grid(True, linestyle='--', alpha=0.7)
 
-        ax.set_ylabel('Price')
-        ax.legend(loc='upper left')
-        ax.grid(True, linestyle='--', alpha=0.7)
+            # Add Bollinger Bands if available
+            if all(col in df.columns for col in ['BB_UPPER', 'BB_MIDDLE', 'BB_LOWER']):
+                self._band(ax, df.index, df['BB_LOWER'], df['BB_UPPER'],
+                           color='blue', alpha=0.1, label='Bollinger Bands')
+                self._line(ax, df.index, df['BB_MIDDLE'], color='blue', alpha=0.5, linestyle='--')
 
-        # Add Bollinger Bands if available
-        if all(col in df.columns for col in ['BB_UPPER', 'BB_MIDDLE', 'BB_LOWER']):
-            ax.fill_between(df.index, df['BB_LOWER'], df['BB_UPPER'],
-                            color='blue', alpha=0.1, label='Bollinger Bands')
-            ax.plot(df.index, df['BB_MIDDLE'], color='blue', alpha=0.5, linestyle='--')
+            # Plot each indicator group
+            for i, group in enumerate(indicator_groups, start=1):
+                ax = axes[i]
+                self._plot_indicator_group(ax, df, group)
 
-        # Plot each indicator group
-        for i, group in enumerate(indicator_groups, start=1):
-            ax = axes[i]
-            self._plot_indicator_group(ax, df, group)
+            self._finish(fig, num_plots)
+            return fig
 
-        plt.tight_layout()
-        return fig
+    def save_indicators(self, df: pd.DataFrame, ticker: str, path: Union[str, Path],
+                        indicator_groups: List[str] = ['trend', 'momentum', 'volume', 'volatility'],
+                        format: Optional[str] = None) -> str:
+        """
+        Render the dashboard straight to a file and release the figure
+        Args:
+            df: DataFrame with calculated indicators
+            ticker: Stock ticker symbol
+            path: Output file; missing parent directories are created
+            indicator_groups: Which indicator groups to include
+            format: Image format (defaults to the path's suffix, e.g. png or svg)
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig = self.plot_indicators(df, ticker, indicator_groups)
+        try:
+            fig.savefig(path, dpi=self.dpi, format=format)
+        finally:
+            self.close(fig)
+        return str(path)
 
     def _plot_indicator_group(self, ax, df, group):
         """Plot indicators for a specific group"""
@@ -71,78 +280,78 @@ class TechnicalVisualizer:
     def _plot_trend_indicators(self, ax, df):
         """Plot trend indicators"""
         if 'ADX' in df.columns:
-            ax.plot(df.index, df['ADX'], label='ADX (14)', color='purple')
+            self._line(ax, df.index, df['ADX'], label='ADX (14)', color='purple')
             ax.axhline(25, color='gray', linestyle='--', alpha=0.5)
 
         if 'AROON_UP' in df.columns and 'AROON_DOWN' in df.columns:
-            ax.plot(df.index, df['AROON_UP'], label='Aroon Up', color='green')
-            ax.plot(df.index, df['AROON_DOWN'], label='Aroon Down', color='red')
+            self._line(ax, df.index, df['AROON_UP'], label='Aroon Up', color='green')
+            self._line(ax, df.index, df['AROON_DOWN'], label='Aroon Down', color='red')
 
         if 'TRIX' in df.columns:
-            ax.plot(df.index, df['TRIX'], label='TRIX', color='blue')
+            self._line(ax, df.index, df['TRIX'], label='TRIX', color='blue')
 
         ax.set_ylabel('Trend Strength')
-        ax.legend()
+        self._legend(ax)
         ax.grid(True, linestyle='--', alpha=0.5)
 
     def _plot_momentum_indicators(self, ax, df):
         """Plot momentum indicators"""
         if 'RSI' in df.columns:
-            ax.plot(df.index, df['RSI'], label='RSI (14)', color='purple')
+            self._line(ax, df.index, df['RSI'], label='RSI (14)', color='purple')
             ax.axhline(70, color='red', linestyle='--', alpha=0.5)
             ax.axhline(30, color='green', linestyle='--', alpha=0.5)
 
         if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            ax.plot(df.index, df['MACD'], label='MACD', color='blue')
-            ax.plot(df.index, df['MACD_Signal'], label='Signal', color='orange')
-            ax.bar(df.index, df['MACD_Hist'], label='Histogram', color='gray', alpha=0.5)
+            self._line(ax, df.index, df['MACD'], label='MACD', color='blue')
+            self._line(ax, df.index, df['MACD_Signal'], label='Signal', color='orange')
+            self._bars(ax, df.index, df['MACD_Hist'], label='Histogram', color='gray', alpha=0.5)
 
         if 'CCI' in df.columns:
-            ax.plot(df.index, df['CCI'], label='CCI', color='green')
+            self._line(ax, df.index, df['CCI'], label='CCI', color='green')
             ax.axhline(100, color='red', linestyle='--', alpha=0.5)
             ax.axhline(-100, color='green', linestyle='--', alpha=0.5)
 
         ax.set_ylabel('Momentum')
-        ax.legend()
+        self._legend(ax)
         ax.grid(True, linestyle='--', alpha=0.5)
 
     def _plot_volume_indicators(self, ax, df):
         """Plot volume indicators"""
         if 'Volume' in df.columns:
-            ax.bar(df.index, df['Volume'], label='Volume', color='lightblue', alpha=0.7)
+            self._bars(ax, df.index, df['Volume'], label='Volume', color='lightblue', alpha=0.7)
 
         if 'OBV' in df.columns:
-            ax.plot(df.index, df['OBV'], label='OBV', color='darkblue')
+            self._line(ax, df.index, df['OBV'], label='OBV', color='darkblue')
 
         if 'MFI' in df.columns:
-            ax.plot(df.index, df['MFI'], label='MFI', color='purple', alpha=0.7)
+            self._line(ax, df.index, df['MFI'], label='MFI', color='purple', alpha=0.7)
             ax.axhline(80, color='red', linestyle='--', alpha=0.5)
             ax.axhline(20, color='green', linestyle='--', alpha=0.5)
 
         ax.set_ylabel('Volume')
-        ax.legend()
+        self._legend(ax)
         ax.grid(True, linestyle='--', alpha=0.5)
 
     def _plot_volatility_indicators(self, ax, df):
         """Plot volatility indicators"""
         if 'ATR' in df.columns:
-            ax.plot(df.index, df['ATR'], label='ATR (14)', color='red')
+            self._line(ax, df.index, df['ATR'], label='ATR (14)', color='red')
 
         if 'BB_UPPER' in df.columns and 'BB_LOWER' in df.columns:
-            ax.plot(df.index, (df['Close'] - df['BB_LOWER']) /
-                    (df['BB_UPPER'] - df['BB_LOWER']),
-                    label='BB %B', color='blue')
+            self._line(ax, df.index, (df['Close'] - df['BB_LOWER']) /
+                       (df['BB_UPPER'] - df['BB_LOWER']),
+                       label='BB %B', color='blue')
             ax.axhline(0.8, color='red', linestyle='--', alpha=0.5)
             ax.axhline(0.2, color='green', linestyle='--', alpha=0.5)
 
         ax.set_ylabel('Volatility')
-        ax.legend()
+        self._legend(ax)
         ax.grid(True, linestyle='--', alpha=0.5)
 
-    def plot_correlation_heatmap(self, indicator_df: pd.DataFrame) -> plt.Figure:
+    def plot_correlation_heatmap(self, indicator_df: pd.DataFrame) -> 'Figure':
         """Plot correlation heatmap of technical indicators"""
-        # Select only indicator columns (exclude OHLCV)
-        indicator_cols = [col for col in indicator_df.columns
+        # Select only numeric indicator columns (exclude OHLCV, tickers and dates)
+        indicator_cols = [col for col in indicator_df.select_dtypes('number').columns
                           if col not in ['Open', 'High', 'Low', 'Close', 'Volume']]
 
         if not indicator_cols:
@@ -150,9 +359,11 @@ class TechnicalVisualizer:
 
         corr = indicator_df[indicator_cols].corr()
 
-        fig, ax = plt.subplots(figsize=(12, 10))
-        sns.heatmap(corr, annot=False, cmap='coolwarm', center=0,
-                    square=True, linewidths=0.5, ax=ax)
-        ax.set_title('Technical Indicator Correlation Matrix')
-        plt.tight_layout()
-        return fig
\ No newline at end of file
+        with _dashboard_style_context():
+            import seaborn as sns
+            fig, (ax,) = self._subplots(1, (12, 10))
+            sns.heatmap(corr, annot=False, cmap='coolwarm', center=0,
+                        square=True, linewidths=0.5, ax=ax)
+            ax.set_title('Technical Indicator Correlation Matrix')
+            fig.tight_layout()
+            return fig
\ No newline at end of file
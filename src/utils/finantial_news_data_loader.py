@@ -2,9 +2,20 @@ import os
 import pandas as pd
 import warnings
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, Iterator, List
 from typing import Optional
 from pandas.api.types import is_datetime64_any_dtype as is_datetime
+from pandas.api.types import union_categoricals
+
+
+# Explicit dtypes for the analyst-ratings file: the low-cardinality text
+# columns are read straight into categoricals instead of object columns.
+NEWS_CSV_DTYPES: Dict[str, str] = {
+    'headline': 'object',
+    'url': 'object',
+    'publisher': 'category',
+    'stock': 'category',
+}
 
 
 def load_csv_finantial_news_data(file_path: str) -> pd.DataFrame:
@@ -32,6 +43,134 @@ def load_csv_finantial_news_data(file_path: str) -> pd.DataFrame:
         raise RuntimeError(f"Failed to load and process news data: {e}")
 
 
+def _parse_news_dates(dates: pd.Series) -> pd.Series:
+    """
+    Coerce a chunk's date column to timezone-naive datetime64[ns].
+
+    The C engine only parses ``date`` during the read when every value in a
+    chunk shares the same UTC offset. Mixed-offset chunks come back as object
+    strings; for those the offset is dropped so the local publication time is
+    kept, matching ``clean_news_dates``.
+    """
+    if is_datetime(dates):
+        if getattr(dates.dt, 'tz', None) is not None:
+            return dates.dt.tz_localize(None)
+        return dates
+    return pd.to_datetime(dates.astype('string').str.slice(0, 19),
+                          errors='coerce', format='ISO8601')
+
+
+def _prepare_news_chunk(chunk: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    """Parse dates and add the upper-cased categorical Ticker to one chunk"""
+    if date_col in chunk.columns:
+        chunk[date_col] = _parse_news_dates(chunk[date_col])
+
+    if 'stock' in chunk.columns:
+        # Upper-casing a categorical only touches its categories, not every row
+        chunk['Ticker'] = chunk['stock'].map(str.upper).astype('category')
+    return chunk
+
+
+def _stream_csv_pyarrow(file_path: str, chunksize: int, date_col: str,
+                        usecols: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    """Stream record batches through pyarrow's incremental CSV reader"""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        raise ImportError("engine='pyarrow' requires the pyarrow package")
+
+    dictionary_type = pa.dictionary(pa.int32(), pa.string())
+    column_types = {col: dictionary_type for col, dtype in NEWS_CSV_DTYPES.items()
+                    if dtype == 'category'}
+    column_types[date_col] = pa.string()
+
+    reader = pa_csv.open_csv(
+        file_path,
+        # block_size is in bytes; ~128 bytes per analyst-ratings row
+        read_options=pa_csv.ReadOptions(block_size=max(chunksize * 128, 1 << 20)),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types,
+                                              include_columns=usecols),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def stream_csv_finantial_news_data(file_path: str,
+                                   chunksize: int = 250_000,
+                                   engine: str = 'c',
+                                   date_col: str = 'date',
+                                   usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream financial news data from a CSV file in chunks.
+
+    Unlike ``load_csv_finantial_news_data`` the file is never materialized:
+    each chunk is read by the C (or pyarrow) parser with ``stock`` and
+    ``publisher`` as categoricals and ``date`` parsed to datetime64[ns].
+    Chunks can be piped through ``stream_clean_news_dates`` and
+    ``stream_filter_news_by_ticker`` and combined with ``concat_news_chunks``.
+
+    Args:
+        file_path: Path to the news CSV file
+        chunksize: Approximate number of rows per chunk
+        engine: 'c' (pandas chunked reader) or 'pyarrow' (incremental reader)
+        date_col: Name of the publication date column
+        usecols: Optional subset of columns to read
+
+    Yields:
+        DataFrame chunks with a categorical 'Ticker' column added
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File {file_path} does not exist")
+    if engine not in ('c', 'pyarrow'):
+        raise ValueError(f"Unsupported engine '{engine}'; use 'c' or 'pyarrow'")
+
+    try:
+        if engine == 'pyarrow':
+            chunks = _stream_csv_pyarrow(file_path, chunksize, date_col, usecols)
+        else:
+            header = pd.read_csv(file_path, nrows=0, usecols=usecols).columns
+            chunks = pd.read_csv(
+                file_path,
+                engine='c',
+                chunksize=chunksize,
+                usecols=usecols,
+                dtype={col: dtype for col, dtype in NEWS_CSV_DTYPES.items() if col in header},
+                parse_dates=[date_col] if date_col in header else None,
+            )
+
+        for chunk in chunks:
+            yield _prepare_news_chunk(chunk, date_col)
+
+    except (ImportError, ValueError):
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to stream news data: {e}")
+
+
+def concat_news_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate streamed news chunks, keeping categorical columns categorical.
+
+    Each chunk carries its own categories, so a plain ``pd.concat`` would fall
+    back to object dtype; the categories are unioned instead.
+    """
+    chunks = [chunk for chunk in chunks if not chunk.empty]
+    if not chunks:
+        return pd.DataFrame()
+
+    categorical_cols = [col for col, dtype in chunks[0].dtypes.items()
+                        if isinstance(dtype, pd.CategoricalDtype)]
+    combined = {col: union_categoricals([chunk[col] for chunk in chunks])
+                for col in categorical_cols}
+
+    df = pd.concat([chunk.drop(columns=categorical_cols) for chunk in chunks],
+                   ignore_index=True)
+    for col in categorical_cols:
+        df[col] = combined[col]
+    return df[chunks[0].columns]
+
+
 
 
 
@@ -88,3 +227,26 @@ def filter_news_by_ticker(df: pd.DataFrame, tickers: List[str], ticker_col: str
     if ticker_col not in df.columns:
         raise KeyError(f"Column '{ticker_col}' not found in DataFrame")
     return df[df[ticker_col].isin(tickers)].copy()
+
+
+def stream_clean_news_dates(chunks: Iterable[pd.DataFrame],
+                            date_col: str = 'date',
+                            new_col: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Generator stage applying ``clean_news_dates`` to each streamed chunk.
+    """
+    for chunk in chunks:
+        yield clean_news_dates(chunk, date_col=date_col, new_col=new_col)
+
+
+def stream_filter_news_by_ticker(chunks: Iterable[pd.DataFrame], tickers: List[str],
+                                 ticker_col: str = 'Ticker') -> Iterator[pd.DataFrame]:
+    """
+    Generator stage applying ``filter_news_by_ticker`` to each streamed chunk.
+
+    Chunks with no matching rows are dropped from the stream.
+    """
+    for chunk in chunks:
+        filtered = filter_news_by_ticker(chunk, tickers, ticker_col=ticker_col)
+        if not filtered.empty:
+            yield filtered
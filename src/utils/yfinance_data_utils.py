@@ -1,11 +1,65 @@
+import os
 import pandas as pd
+from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
-from datetime import datetime
 import warnings
 
 
+@dataclass
+class ValidationReport:
+    """Outcome of validating one ticker's price history"""
+    ticker: str
+    rows_read: int = 0
+    rows_loaded: int = 0
+    invalid_dates: int = 0
+    future_dates: int = 0
+    zero_volume: int = 0
+    missing_values_filled: int = 0
+    duplicates_removed: int = 0
+    inconsistent_bars: int = 0
+    was_sorted: bool = True
+
+    @property
+    def issues(self) -> Dict[str, int]:
+        """Non-zero issue counts, e.g. {'future_dates': 2}"""
+        counts = asdict(self)
+        for key in ('ticker', 'rows_read', 'rows_loaded', 'was_sorted'):
+            counts.pop(key)
+        return {key: value for key, value in counts.items() if value}
+
+    def to_dict(self) -> Dict[str, Union[str, int, bool]]:
+        return asdict(self)
+
+
+class StockLoadResult(dict):
+    """
+    {ticker: DataFrame} mapping returned by DataLoader.load_multiple_stocks
+
+    Tickers that could not be loaded are left out of the mapping and recorded
+    in ``failures`` as {ticker: error message}. ``reports`` holds the
+    ValidationReport of every ticker validated from CSV.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures: Dict[str, str] = {}
+        self.reports: Dict[str, ValidationReport] = {}
+
+
+def _load_ticker(loader: 'DataLoader', ticker: str) -> Tuple[str, Optional[pd.DataFrame],
+                                                             Optional[ValidationReport], Optional[str]]:
+    """Pool task: load one ticker, returning the error instead of raising"""
+    try:
+        df, report = loader._load_validated(ticker)
+        return ticker, df, report, None
+    except Exception as e:
+        return ticker, None, None, str(e)
+
+
 class DataLoader:
     """
     A robust stock data loader with comprehensive data validation and cleaning
@@ -19,10 +73,31 @@ class DataLoader:
     - Price/volume validation
     - Data cleaning
     - Duplicate handling
+    - Optional Parquet/Feather cache of the cleaned data
+
+    Validation runs as a single pass over NumPy arrays and records what it
+    found in a ValidationReport (see ``validation_reports``) rather than
+    emitting warnings.
     """
 
-    def __init__(self, data_dir: str = '../../data/yfinance_data'):
+    CACHE_FORMATS = ('parquet', 'feather')
+
+    def __init__(self, data_dir: str = '../../data/yfinance_data',
+                 cache_format: Optional[str] = None, verbose: bool = True):
+        """
+        Args:
+            data_dir: Directory holding the {ticker}_historical_data.csv files
+            cache_format: 'parquet' or 'feather' to cache validated frames next
+                to their CSV files; None disables the cache
+            verbose: Print a one-line summary per loaded ticker
+        """
+        if cache_format is not None and cache_format not in self.CACHE_FORMATS:
+            raise ValueError(f"Unsupported cache format '{cache_format}'; "
+                             f"use one of {self.CACHE_FORMATS}")
         self.data_dir = Path(data_dir)
+        self.cache_format = cache_format
+        self.verbose = verbose
+        self.validation_reports: Dict[str, ValidationReport] = {}
         self.required_cols = {'Date', 'Open', 'High', 'Low', 'Close', 'Volume'}
         self.valid_dtypes = {
             'Open': 'float64',
@@ -60,172 +135,269 @@ class DataLoader:
                     raise ValueError(f"Failed to convert {col} to {dtype}: {str(e)}")
         return df
 
-    import pandas as pd
-    import warnings
-    from datetime import datetime
-
-    def _validate_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _date_masks(date_values: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
         """
-        Validate and normalize the 'Date' column in the DataFrame.
-
-        - Converts 'Date' to datetime.
-        - Removes rows with invalid or future dates.
-        - Adds a normalized 'stock_date' column (date only).
-
-        Parameters:
-            df (pd.DataFrame): Input DataFrame with a 'Date' column.
+        Parse dates and flag invalid/future rows, staying in datetime64[ns].
 
         Returns:
-            pd.DataFrame: Cleaned DataFrame with valid, past/present dates.
+            Tuple of (parsed dates, normalized clean dates, invalid mask,
+            future mask). NaT compares False, so the masks never overlap.
         """
-        if 'Date' not in df.columns:
-            return df
-
-        try:
-            # Convert to datetime, coercing errors
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df['clean_date'] = df['Date']
-
-            # Remove rows with invalid dates (NaT)
-            invalid_dates = df['clean_date'].isna()
-            if invalid_dates.any():
-                warnings.warn(f"Removed {invalid_dates.sum()} rows with invalid dates.")
-                df = df[~invalid_dates]
-
-            # Normalize to date only (remove time component)
-            df['clean_date'] = df['clean_date'].dt.date
-
-            # Remove rows with future dates
-            current_date = datetime.now().date()
-            future_dates = df['clean_date'] > current_date
-            if future_dates.any():
-                warnings.warn(f"Removed {future_dates.sum()} rows with future dates.")
-                df = df[~future_dates]
-
-            # Convert back to datetime64[ns] for consistency
-            df['Date'] = pd.to_datetime(df['Date'])
-            df['clean_date'] = pd.to_datetime(df['clean_date'])
-
-        except Exception as e:
-            raise ValueError(f"Date normalization failed: {str(e)}")
-
-        return df
-
-
-    def _validate_volume(self, df: pd.DataFrame, ticker: str) -> None:
-        """Validate volume column"""
-        if 'Volume' in df.columns:
-            # Check for negative volume
-            if (df['Volume'] < 0).any():
-                raise ValueError(f"Negative volume found for {ticker}")
+        # Convert to datetime, coercing errors
+        dates = pd.to_datetime(date_values, errors='coerce')
+        if dates.dt.tz is not None:
+            # Keep the exchange-local calendar date, as .dt.date would
+            clean_dates = dates.dt.tz_localize(None).dt.normalize()
+        else:
+            clean_dates = dates.dt.normalize()
+
+        invalid_dates = clean_dates.isna()
+        future_dates = clean_dates > pd.Timestamp.now().normalize()
+        return dates, clean_dates, invalid_dates, future_dates
+
+    @staticmethod
+    def _ffill(values: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Forward fill NaNs in a float array, returning (filled, number filled)"""
+        missing = np.isnan(values)
+        if not missing.any():
+            return values, 0
+        last_valid = np.where(missing, 0, np.arange(len(values)))
+        np.maximum.accumulate(last_valid, out=last_valid)
+        filled = values[last_valid]
+        return filled, int(missing.sum() - np.isnan(filled).sum())
+
+    def _validate_frame(self, df: pd.DataFrame, ticker: str) -> Tuple[pd.DataFrame, ValidationReport]:
+        """
+        Validate and clean a freshly parsed price history in one pass.
 
-            # Check for zero volume on trading days
-            if (df['Volume'] == 0).any():
-                warnings.warn(f"Zero volume entries found for {ticker}")
+        Every check works on NumPy arrays and the surviving rows are gathered
+        with a single ``take``. Duplicate detection and sorting are skipped
+        when the dates are already strictly increasing, which is the normal
+        layout of the CSV files.
 
-    def _handle_missing_values(self, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
-        """Handle missing values with appropriate strategy"""
-        # Count missing values before handling
-        missing_before = df.isnull().sum().sum()
+        Args:
+            df: Raw DataFrame as read from CSV
+            ticker: Stock ticker symbol, used in messages
 
-        # Forward fill for OHLC prices (assuming markets were closed)
-        price_cols = ['Open', 'High', 'Low', 'Close']
-        for col in price_cols:
-            if col in df.columns:
-                df[col] = df[col].ffill()
+        Returns:
+            Tuple of (cleaned DataFrame indexed by Date, ValidationReport)
+        """
+        report = ValidationReport(ticker=ticker, rows_read=len(df))
+        self._validate_columns(df, ticker)
+        df = self._convert_dtypes(df)
+
+        dates, clean_dates, invalid_dates, future_dates = self._date_masks(df['Date'])
+        report.invalid_dates = int(invalid_dates.sum())
+        report.future_dates = int(future_dates.sum())
+        df['Date'] = dates
+        df['clean_date'] = clean_dates
+
+        keep = np.flatnonzero(~(invalid_dates.to_numpy() | future_dates.to_numpy()))
+        result = df.take(keep)
+
+        volume = result['Volume'].to_numpy()
+        if (volume < 0).any():
+            raise ValueError(f"Negative volume found for {ticker}")
+        report.zero_volume = int((volume == 0).sum())
+
+        # Forward fill OHLC prices (assuming markets were closed)
+        prices = {}
+        for col in ('Open', 'High', 'Low', 'Close'):
+            prices[col], filled = self._ffill(result[col].to_numpy(dtype=np.float64))
+            if filled:
+                result[col] = prices[col]
+                report.missing_values_filled += filled
 
         # Set volume to 0 if missing (assuming no trading)
-        if 'Volume' in df.columns:
-            df['Volume'] = df['Volume'].fillna(0)
+        if volume.dtype.kind == 'f':
+            missing_volume = np.isnan(volume)
+            if missing_volume.any():
+                result['Volume'] = np.where(missing_volume, 0, volume)
+                report.missing_values_filled += int(missing_volume.sum())
+
+        date_ns = result['Date'].array.asi8
+        steps = np.diff(date_ns)
+        report.was_sorted = bool((steps >= 0).all())
+        if not (steps > 0).all():
+            # Only histories with repeated or out-of-order dates need the
+            # full-row duplicate hash and a sort
+            duplicated = result.duplicated().to_numpy()
+            report.duplicates_removed = int(duplicated.sum())
+            order = np.flatnonzero(~duplicated)
+            if not report.was_sorted:
+                order = order[np.argsort(date_ns[order], kind='stable')]
+            result = result.take(order)
+            prices = {col: values[order] for col, values in prices.items()}
 
-        # Count missing values after handling
-        missing_after = df.isnull().sum().sum()
-
-        if missing_before > 0:
-            print(f"Handled {missing_before - missing_after} missing values for {ticker}")
-
-        return df
+        # Validate price consistency
+        high, low = prices['High'], prices['Low']
+        report.inconsistent_bars = int((
+            (high < low) |
+            (high < prices['Open']) |
+            (high < prices['Close']) |
+            (low > prices['Open']) |
+            (low > prices['Close'])
+        ).sum())
+
+        result = result.set_index('Date')
+        report.rows_loaded = len(result)
+        return result, report
+
+    def _cache_path(self, file_path: Path) -> Path:
+        """Cache file stored next to the source CSV"""
+        return file_path.with_suffix(f'.{self.cache_format}')
+
+    @staticmethod
+    def _source_signature(file_path: Path) -> Dict[bytes, bytes]:
+        """Source CSV mtime and size, stored in the cache's schema metadata"""
+        stat = file_path.stat()
+        return {
+            b'source_mtime_ns': str(stat.st_mtime_ns).encode(),
+            b'source_size': str(stat.st_size).encode(),
+        }
 
-    def _clean_data(self, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
-        """Perform final data cleaning steps"""
-        # Remove duplicates while keeping first occurrence
-        duplicates = df.duplicated().sum()
-        if duplicates > 0:
-            print(f"Removed {duplicates} duplicate rows for {ticker}")
-            df = df.drop_duplicates()
+    def _read_cache(self, file_path: Path) -> Optional[pd.DataFrame]:
+        """Return the cached frame if it is still valid for the source CSV"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
 
-        # Ensure proper sorting by date
-        if 'Date' in df.columns:
-            df = df.sort_values('Date')
-            df = df.set_index('Date')
+        cache_path = self._cache_path(file_path)
+        if not cache_path.exists():
+            return None
 
-        # Validate price consistency
-        if all(col in df.columns for col in ['High', 'Low', 'Open', 'Close']):
-            inconsistent = (
-                    (df['High'] < df['Low']) |
-                    (df['High'] < df['Open']) |
-                    (df['High'] < df['Close']) |
-                    (df['Low'] > df['Open']) |
-                    (df['Low'] > df['Close'])
-            ).sum()
-
-            if inconsistent > 0:
-                warnings.warn(f"{inconsistent} inconsistent price bars found for {ticker}")
+        try:
+            if self.cache_format == 'parquet':
+                metadata = pq.read_schema(cache_path).metadata or {}
+                if not self._signature_matches(metadata, file_path):
+                    return None
+                table = pq.read_table(cache_path, memory_map=True)
+            else:
+                reader = pa.ipc.open_file(pa.memory_map(str(cache_path), 'r'))
+                if not self._signature_matches(reader.schema.metadata or {}, file_path):
+                    return None
+                table = reader.read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            warnings.warn(f"Ignoring unreadable cache {cache_path}: {str(e)}")
+            return None
+
+        return table.to_pandas()
+
+    def _signature_matches(self, metadata: Dict[bytes, bytes], file_path: Path) -> bool:
+        """Check a cache's recorded source signature against the current CSV"""
+        signature = self._source_signature(file_path)
+        return all(metadata.get(key) == value for key, value in signature.items())
+
+    def _write_cache(self, file_path: Path, df: pd.DataFrame) -> None:
+        """Write the cleaned frame atomically, tagged with the source signature"""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        cache_path = self._cache_path(file_path)
+        tmp_path = cache_path.with_name(f'.{cache_path.name}.{os.getpid()}.tmp')
 
-        return df
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            metadata = dict(table.schema.metadata or {})
+            metadata.update(self._source_signature(file_path))
+            table = table.replace_schema_metadata(metadata)
+
+            if self.cache_format == 'parquet':
+                pq.write_table(table, tmp_path)
+            else:
+                # Uncompressed so warm loads can be memory-mapped
+                feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"Could not write cache {cache_path}: {str(e)}")
 
     def load_single_stock(self, ticker: str) -> pd.DataFrame:
         """
         Load and validate data for a single stock.
 
+        When a cache format is configured, a cache written for the current
+        version of the CSV (same mtime and size) is read instead of
+        re-validating the file. Otherwise the ticker's ValidationReport is
+        stored in ``validation_reports``.
+
         Args:
             ticker (str): Stock ticker symbol.
 
         Returns:
             pd.DataFrame: Cleaned and validated DataFrame.
         """
+        df, report = self._load_validated(ticker)
+        if report is not None:
+            self.validation_reports[ticker] = report
+        return df
+
+    def _load_validated(self, ticker: str) -> Tuple[pd.DataFrame, Optional[ValidationReport]]:
+        """Load one ticker, returning its ValidationReport (None on a cache hit)"""
         file_path = self._validate_file(ticker)
 
+        if self.cache_format is not None:
+            cached = self._read_cache(file_path)
+            if cached is not None:
+                return cached, None
+
         try:
             # Load data with error handling for malformed CSV
             df = pd.read_csv(file_path, na_values=['', 'NA', 'N/A', 'NaN', 'null'])
+            df, report = self._validate_frame(df, ticker)
 
-            # Validate and clean data
-            self._validate_columns(df, ticker)
-            df = self._convert_dtypes(df)
-            df = self._validate_dates(df)
-
-            self._validate_volume(df, ticker)
-            df = self._handle_missing_values(df, ticker)
-            df = self._clean_data(df, ticker)
+            if self.cache_format is not None:
+                self._write_cache(file_path, df)
 
-            print(f"Successfully loaded and cleaned {len(df)} rows for {ticker}")
-            return df
+            if self.verbose:
+                issues = f" ({report.issues})" if report.issues else ""
+                print(f"Successfully loaded and cleaned {len(df)} rows for {ticker}{issues}")
+            return df, report
 
         except Exception as e:
             raise ValueError(f"Error processing {ticker} data: {str(e)}")
 
-    def load_multiple_stocks(self, tickers: list) -> Dict[str, pd.DataFrame]:
+    def load_multiple_stocks(self, tickers: List[str], workers: Optional[int] = None,
+                             executor: str = 'thread') -> StockLoadResult:
         """
         Load data for multiple stocks
         Args:
             tickers: List of stock ticker symbols
+            workers: Number of parallel workers; None or 1 loads serially
+            executor: 'thread' or 'process' pool used when workers > 1
         Returns:
-            Dictionary of {ticker: DataFrame}
+            StockLoadResult mapping of {ticker: DataFrame}, with per-ticker
+            errors collected in its ``failures`` attribute
         """
-        stock_data = {}
-        failed_tickers = []
-
-        for ticker in tickers:
-            try:
-                stock_data[ticker] = self.load_single_stock(ticker)
-            except Exception as e:
-                print(f"Failed to load {ticker}: {str(e)}")
-                failed_tickers.append(ticker)
-
-        if failed_tickers:
-            print(f"\nFailed to load {len(failed_tickers)}/{len(tickers)} tickers: {failed_tickers}")
-
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unsupported executor '{executor}'; use 'thread' or 'process'")
+
+        load = partial(_load_ticker, self)
+        if workers is None or workers <= 1 or len(tickers) <= 1:
+            outcomes = map(load, tickers)
+            return self._collect_loads(outcomes)
+
+        if executor == 'process':
+            # Batch tickers per task so pickling overhead stays small
+            chunksize = max(1, len(tickers) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return self._collect_loads(pool.map(load, tickers, chunksize=chunksize))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return self._collect_loads(pool.map(load, tickers))
+
+    def _collect_loads(self, outcomes) -> StockLoadResult:
+        """Gather (ticker, frame, report, error) tuples into a StockLoadResult"""
+        stock_data = StockLoadResult()
+        for ticker, df, report, error in outcomes:
+            if error is not None:
+                stock_data.failures[ticker] = error
+                continue
+            stock_data[ticker] = df
+            if report is not None:
+                stock_data.reports[ticker] = report
+                self.validation_reports[ticker] = report
         return stock_data
 
 
@@ -238,6 +410,8 @@ if __name__ == "__main__":
         # Load multiple stocks
         tickers = ['AAPL', 'MSFT', 'GOOG', 'AMZN', 'NVDA', 'TSLA', 'META']
         stock_data = loader.load_multiple_stocks(tickers)
+        if stock_data.failures:
+            print(f"Failed to load {len(stock_data.failures)}/{len(tickers)} tickers: {stock_data.failures}")
 
         # Display sample of loaded data
         if 'AAPL' in stock_data: